@@ -0,0 +1,64 @@
+"""Throughput of the NumPy batch solver against the per-puzzle loop.
+
+    python -m benchmarks.batch_throughput --count 3000
+"""
+
+import argparse
+import random
+import time
+
+from sudoku_explainer.batch import solve_many
+from sudoku_explainer.puzzles import (
+    BASE_EASY,
+    BASE_HARD,
+    BASE_MEDIUM,
+    generate_variations,
+)
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import (
+    board_to_string,
+    parse_puzzle,
+    solve_sudoku_backtracking,
+)
+
+
+def solve_one(puzzle_str: str) -> str:
+    board = parse_puzzle(puzzle_str)
+    for _ in SudokuSolver(board).solve():
+        pass
+    solve_sudoku_backtracking(board)
+    return board_to_string(board)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument(
+        "--bases", default="easy,medium", help="Comma-separated: easy,medium,hard"
+    )
+    args = parser.parse_args()
+
+    bases = {"easy": BASE_EASY, "medium": BASE_MEDIUM, "hard": BASE_HARD}
+    chosen = [bases[b] for b in args.bases.split(",")]
+    rng = random.Random(1)
+    per_base = args.count // len(chosen) + 1
+    puzzles = [p for b in chosen for p in generate_variations(b, per_base, rng)]
+    puzzles = puzzles[: args.count]
+
+    start = time.perf_counter()
+    batch = solve_many(puzzles)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop = [solve_one(p) for p in puzzles]
+    loop_time = time.perf_counter() - start
+
+    assert batch == loop, "batch and scalar solutions differ"
+    print(f"puzzles:   {len(puzzles)}")
+    print(f"loop:      {loop_time:8.3f} s  {len(puzzles) / loop_time:10.0f} puzzles/s")
+    print(f"solve_many:{batch_time:8.3f} s  {len(puzzles) / batch_time:10.0f} puzzles/s")
+    print(f"speedup:   {loop_time / batch_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
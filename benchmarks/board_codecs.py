@@ -0,0 +1,66 @@
+"""Board parse/serialize throughput, legacy implementations versus current.
+
+The legacy versions are the per-cell loops parse_puzzle and board_to_string
+used before the table-driven codecs: int() per character and set_value per
+clue on the way in, str() per cell on the way out.
+
+    python -m benchmarks.board_codecs --count 20000
+"""
+
+import argparse
+import time
+
+from benchmarks.run import load_corpus
+from sudoku_explainer.board import Board
+from sudoku_explainer.utils import board_to_string, parse_puzzle
+
+
+def legacy_parse(puzzle_str: str) -> Board:
+    grid = []
+    for i in range(0, 81, 9):
+        grid.append([int(c) if c.isdigit() else 0 for c in puzzle_str[i : i + 9]])
+    board = Board()
+    for r in range(9):
+        for c in range(9):
+            if grid[r][c] != 0:
+                board.set_value(r, c, grid[r][c])
+    return board
+
+
+def legacy_format(board: Board) -> str:
+    chars = []
+    for r in range(9):
+        for c in range(9):
+            chars.append(str(board.get_value(r, c)))
+    return "".join(chars)
+
+
+def timed(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    corpus = [p for tier in ("easy", "medium", "hard", "extreme") for p in load_corpus(tier)]
+    puzzles = (corpus * (args.count // len(corpus) + 1))[: args.count]
+    boards = [parse_puzzle(p) for p in puzzles]
+
+    for label, old, new, items in (
+        ("parse", legacy_parse, parse_puzzle, puzzles),
+        ("format", legacy_format, board_to_string, boards),
+    ):
+        t_old, t_new = timed(old, items), timed(new, items)
+        print(
+            f"{label:<7} legacy {t_old / len(items) * 1e6:7.1f} us  "
+            f"current {t_new / len(items) * 1e6:7.1f} us  ({t_old / t_new:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Synthetic fixture images for the OCR benchmarks.
+
+Images are drawn from corpus puzzles at run time so no binary files need
+to be bundled; the same puzzle always yields the same PNG bytes.
+"""
+
+import cv2
+import numpy as np
+
+CELL = 50
+MARGIN = 20
+
+
+def render_puzzle_image(puzzle_str: str) -> bytes:
+    """Draws a printed-style Sudoku grid and returns it PNG-encoded."""
+    size = CELL * 9 + 2 * MARGIN
+    img = np.full((size, size, 3), 255, dtype=np.uint8)
+
+    for i in range(10):
+        thickness = 4 if i % 3 == 0 else 1
+        pos = MARGIN + i * CELL
+        cv2.line(img, (MARGIN, pos), (size - MARGIN, pos), (0, 0, 0), thickness)
+        cv2.line(img, (pos, MARGIN), (pos, size - MARGIN), (0, 0, 0), thickness)
+
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    for idx, ch in enumerate(puzzle_str):
+        if ch in "0.":
+            continue
+        r, c = divmod(idx, 9)
+        (w, h), _ = cv2.getTextSize(ch, font, 1.2, 2)
+        x = MARGIN + c * CELL + (CELL - w) // 2
+        y = MARGIN + r * CELL + (CELL + h) // 2
+        cv2.putText(img, ch, (x, y), font, 1.2, (0, 0, 0), 2)
+
+    ok, encoded = cv2.imencode(".png", img)
+    if not ok:
+        raise RuntimeError("Could not encode fixture image.")
+    return encoded.tobytes()
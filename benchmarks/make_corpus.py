@@ -0,0 +1,104 @@
+"""Regenerates the bundled easy/medium/hard benchmark corpora.
+
+Puzzles are dug out of random solved grids (keeping a unique solution) and
+filed by rating.rate_board. The extreme corpus is a hand-picked list of
+well-known hardest puzzles and is not regenerated.
+
+    python -m benchmarks.make_corpus --per-tier 25
+"""
+
+import argparse
+import random
+from pathlib import Path
+from typing import List
+
+from sudoku_explainer.rating import rate_board
+from sudoku_explainer.utils import count_solutions, parse_puzzle
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def random_solution(rng: random.Random) -> List[int]:
+    cells = [0] * 81
+
+    def ok(idx: int, d: int) -> bool:
+        r, c = divmod(idx, 9)
+        br, bc = r - r % 3, c - c % 3
+        for k in range(9):
+            if cells[r * 9 + k] == d or cells[k * 9 + c] == d:
+                return False
+            if cells[(br + k // 3) * 9 + bc + k % 3] == d:
+                return False
+        return True
+
+    def fill(idx: int) -> bool:
+        if idx == 81:
+            return True
+        digits = list(range(1, 10))
+        rng.shuffle(digits)
+        for d in digits:
+            if ok(idx, d):
+                cells[idx] = d
+                if fill(idx + 1):
+                    return True
+        cells[idx] = 0
+        return False
+
+    fill(0)
+    return cells
+
+
+def dig(solution: List[int], rng: random.Random) -> str:
+    cells = solution[:]
+    order = list(range(81))
+    rng.shuffle(order)
+    for idx in order:
+        kept = cells[idx]
+        cells[idx] = 0
+        puzzle = "".join(map(str, cells))
+        if count_solutions(parse_puzzle(puzzle), 2) != 1:
+            cells[idx] = kept
+    return "".join(map(str, cells))
+
+
+def tier_for(puzzle: str) -> str:
+    score = rate_board(parse_puzzle(puzzle))["score"]
+    if score <= 1:
+        return "easy"
+    if score <= 2:
+        return "medium"
+    return "hard"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-tier", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=81)
+    parser.add_argument("--max-attempts", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tiers = {"easy": [], "medium": [], "hard": []}
+    for _ in range(args.max_attempts):
+        if all(len(v) >= args.per_tier for v in tiers.values()):
+            break
+        solution = random_solution(rng)
+        # Put some clues back so the easier tiers fill up too
+        puzzle = dig(solution, rng)
+        if rng.random() < 0.4:
+            givens = [i for i, ch in enumerate(puzzle) if ch == "0"]
+            chars = list(puzzle)
+            for idx in rng.sample(givens, k=min(len(givens), 12)):
+                chars[idx] = str(solution[idx])
+            puzzle = "".join(chars)
+        tier = tier_for(puzzle)
+        if len(tiers[tier]) < args.per_tier:
+            tiers[tier].append(puzzle)
+
+    for tier, puzzles in tiers.items():
+        (CORPUS_DIR / f"{tier}.txt").write_text("\n".join(puzzles) + "\n")
+        print(f"{tier}: {len(puzzles)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""A burst of concurrent image uploads against the OCR job queue.
+
+Sends --clients uploads at once to /api/v1/ocr/jobs through the ASGI app,
+polls every accepted job to completion, and reports how many were
+accepted or refused with 429, the wall time and the queue's metrics
+(depth, wait and processing times).
+
+    python -m benchmarks.ocr_burst --clients 40
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+import httpx
+
+from benchmarks.fixtures import render_puzzle_image
+from benchmarks.run import load_corpus
+from web.app import app
+from web.ocr_jobs import OCR_JOBS
+
+
+async def upload(client: httpx.AsyncClient, image: bytes):
+    r = await client.post(
+        "/api/v1/ocr/jobs", files=[("files", ("burst.png", image, "image/png"))]
+    )
+    if r.status_code != 202:
+        return r.status_code, None
+    (job,) = r.json()["jobs"]
+    while job["status"] not in ("done", "failed"):
+        poll = await client.get(f"/api/v1/ocr/jobs/{job['id']}", params={"wait": 5})
+        job = poll.json()
+    return r.status_code, job
+
+
+async def burst(clients: int):
+    image = render_puzzle_image(load_corpus("easy")[0])
+    await OCR_JOBS.start()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            start = time.perf_counter()
+            uploads = [upload(client, image) for _ in range(clients)]
+            results = await asyncio.gather(*uploads)
+            wall = time.perf_counter() - start
+    finally:
+        await OCR_JOBS.stop()
+    return wall, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=40)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):  # OCR progress lines
+        wall, results = asyncio.run(burst(args.clients))
+    accepted = sum(status == 202 for status, _ in results)
+    refused = sum(status == 429 for status, _ in results)
+    done = sum(job is not None and job["status"] == "done" for _, job in results)
+    print(
+        f"{args.clients} uploads: {accepted} accepted ({done} recognized), "
+        f"{refused} refused with 429, {wall * 1000:.0f} ms wall"
+    )
+    print(json.dumps(OCR_JOBS.metrics(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Logical solve time under the "human" and "fast" strategy orderings.
+
+The fast policy is trained on one pass over the corpus first (its learned
+statistics persist across solves), then both policies are timed, with the
+strategies in their usual order and then listed dearest first, as a
+poorly ordered plugin list would be.
+
+    python -m benchmarks.ordering_policies --repeat 3
+"""
+
+import argparse
+import time
+
+from benchmarks.run import TIERS, load_corpus
+from sudoku_explainer.policy import FAST_STATS, FastPolicy, StrategyStats
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import parse_puzzle
+
+
+def solve_all(puzzles, policy, reverse: bool = False):
+    steps = solved = 0
+    for puzzle in puzzles:
+        solver = SudokuSolver(parse_puzzle(puzzle), policy=policy)
+        if reverse:
+            solver.strategies.reverse()
+        for _ in solver.solve():
+            steps += 1
+        solved += solver.board.is_solved()
+    return steps, solved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = {tier: load_corpus(tier) for tier in TIERS}
+    reversed_stats = StrategyStats()
+    for puzzles in corpus.values():  # training passes
+        solve_all(puzzles, "fast")
+        solve_all(puzzles, FastPolicy(reversed_stats), reverse=True)
+
+    for reverse in (False, True):
+        print("strategies dearest first:" if reverse else "strategies in listed order:")
+        for tier, puzzles in corpus.items():
+            for name in ("human", "fast"):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    policy = FastPolicy(reversed_stats) if reverse and name == "fast" else name
+                    start = time.perf_counter()
+                    steps, solved = solve_all(puzzles, policy, reverse)
+                    best = min(best, time.perf_counter() - start)
+                print(
+                    f"  {tier:<8} {name:<6} {best * 1000 / len(puzzles):7.2f} ms/puzzle  "
+                    f"{steps / len(puzzles):6.1f} steps  {solved}/{len(puzzles)} solved"
+                )
+
+    print("\nlearned cost (ms per placement/elimination):")
+    for name, stat in sorted(FAST_STATS.as_dict().items()):
+        per = stat["seconds"] * 1000 / max(stat["progress"], 1)
+        print(f"  {name:<13} {per:8.4f}")
+
+
+if __name__ == "__main__":
+    main()
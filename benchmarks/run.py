@@ -0,0 +1,319 @@
+"""Benchmark harness with regression budgets.
+
+Times each registered case over the bundled corpora (benchmarks/corpus),
+reports percentiles, can save the results as a JSON baseline, and exits
+non-zero when a case regresses past its budget or the saved baseline by
+more than the threshold. Each puzzle gets untimed warmup calls first.
+
+The absolute budgets in budgets.json are coarse ceilings, set about three
+times above a typical developer machine so they only catch gross
+regressions anywhere; for a 25% gate, compare against a baseline saved
+on the same machine.
+
+    python -m benchmarks.run                            # run everything
+    python -m benchmarks.run --cases solver --repeat 5  # name substring filter
+    python -m benchmarks.run --save baseline.json
+    python -m benchmarks.run --baseline baseline.json --budgets benchmarks/budgets.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sudoku_explainer.board import Board
+from sudoku_explainer.dlx import solve_dlx
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import (
+    board_to_string,
+    parse_puzzle,
+    solve_sudoku_backtracking,
+)
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+TIERS = ("easy", "medium", "hard", "extreme")
+DEFAULT_BUDGETS = Path(__file__).parent / "budgets.json"
+
+# A case maps a puzzle to a zero-argument callable; only the call is timed
+CaseFn = Callable[[str], Callable[[], Any]]
+CASES: Dict[str, Tuple[CaseFn, Tuple[str, ...]]] = {}
+
+
+def case(name: str, tiers: Tuple[str, ...] = TIERS):
+    def register(fn: CaseFn) -> CaseFn:
+        CASES[name] = (fn, tiers)
+        return fn
+
+    return register
+
+
+def load_corpus(tier: str) -> List[str]:
+    path = CORPUS_DIR / f"{tier}.txt"
+    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+
+
+@case("parse_puzzle")
+def _parse(puzzle: str):
+    return lambda: parse_puzzle(puzzle)
+
+
+@case("board_to_string")
+def _format(puzzle: str):
+    board = parse_puzzle(puzzle)
+    return lambda: board_to_string(board)
+
+
+@case("board.set_value")
+def _set_value(puzzle: str):
+    board = parse_puzzle(puzzle)
+    r, c = next((r, c) for r in range(9) for c in range(9) if board.grid[r][c] == 0)
+    value = min(board.candidates[r][c] or {1})
+    return lambda: board.set_value(r, c, value)
+
+
+@case("board.is_valid")
+def _is_valid(puzzle: str):
+    board = parse_puzzle(puzzle)
+    return lambda: board.is_valid()
+
+
+def _strategy_case(index: int) -> CaseFn:
+    def make(puzzle: str):
+        strategy = SudokuSolver(Board()).strategies[index]
+        board = parse_puzzle(puzzle)
+        return lambda: strategy.apply(board)
+
+    return make
+
+
+for _i, _strategy in enumerate(SudokuSolver(Board()).strategies):
+    case(f"strategy.{type(_strategy).__name__}")(_strategy_case(_i))
+
+
+@case("solver.solve")
+def _solve(puzzle: str):
+    board = parse_puzzle(puzzle)
+    return lambda: list(SudokuSolver(board).solve())
+
+
+@case("solver.solve_sweep")
+def _solve_sweep(puzzle: str):
+    board = parse_puzzle(puzzle)
+    return lambda: list(SudokuSolver(board, sweep=True).solve())
+
+
+@case("solve_sudoku_backtracking")
+def _backtracking(puzzle: str):
+    board = parse_puzzle(puzzle)
+    return lambda: solve_sudoku_backtracking(board)
+
+
+@case("dlx.solve")
+def _dlx(puzzle: str):
+    board = parse_puzzle(puzzle)
+    return lambda: solve_dlx(board)
+
+
+@case("ocr.process_sudoku_image", tiers=("easy",))
+def _ocr(puzzle: str):
+    from benchmarks.fixtures import render_puzzle_image
+    from sudoku_explainer.ocr import process_sudoku_image
+
+    image = render_puzzle_image(puzzle)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return process_sudoku_image(image)
+
+    return run
+
+
+_client = None
+
+
+def _web_client():
+    global _client
+    if _client is None:
+        from fastapi.testclient import TestClient
+
+        from web.app import app
+
+        _client = TestClient(app)
+        _client.__enter__()
+    return _client
+
+
+@case("web.index", tiers=("easy",))
+def _web_index(puzzle: str):
+    client = _web_client()
+    return lambda: client.get("/")
+
+
+@case("web.step", tiers=("easy", "hard"))
+def _web_step(puzzle: str):
+    client = _web_client()
+    data = {"puzzle_str": puzzle, "original_puzzle_str": puzzle, "history": "[]"}
+    return lambda: client.post("/step", data=data)
+
+
+@case("web.update", tiers=("easy",))
+def _web_update(puzzle: str):
+    client = _web_client()
+    idx = puzzle.index("0")
+    data = {
+        "puzzle_str": puzzle,
+        "original_puzzle_str": puzzle,
+        "history": "[]",
+        "row": idx // 9,
+        "col": idx % 9,
+        "value": 1,
+        "mode": "note",
+    }
+    return lambda: client.post("/update", data=data)
+
+
+@case("web.api_solve", tiers=("easy", "hard"))
+def _web_api_solve(puzzle: str):
+    client = _web_client()
+    return lambda: client.post("/api/v1/solve", json={"puzzles": [puzzle]})
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_case(
+    fn: CaseFn, puzzles: List[str], repeat: int, warmup: int = 1
+) -> Dict[str, float]:
+    """Times repeat calls per puzzle after warmup untimed ones.
+
+    The warmup calls fill per-puzzle caches (the web handlers memoize
+    solutions and traces), so every sample measures the steady state
+    whatever repeat is.
+    """
+    samples = []
+    for puzzle in puzzles:
+        for _ in range(warmup):
+            fn(puzzle)()
+        for _ in range(repeat):
+            thunk = fn(puzzle)
+            start = time.perf_counter()
+            thunk()
+            samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "n": len(samples),
+        "p50_ms": percentile(samples, 50),
+        "p90_ms": percentile(samples, 90),
+        "p99_ms": percentile(samples, 99),
+        "mean_ms": statistics.mean(samples),
+    }
+
+
+def run(
+    pattern: str, tiers: Tuple[str, ...], repeat: int, warmup: int = 1
+) -> Dict[str, Dict]:
+    corpora = {tier: load_corpus(tier) for tier in tiers}
+    results = {}
+    for name, (fn, case_tiers) in CASES.items():
+        if pattern not in name:
+            continue
+        for tier in case_tiers:
+            if tier not in corpora:
+                continue
+            key = f"{name}/{tier}"
+            try:
+                results[key] = run_case(fn, corpora[tier], repeat, warmup)
+            except ImportError as e:
+                print(f"{key:<45} skipped ({e})")
+                break
+            r = results[key]
+            print(
+                f"{key:<45} n={r['n']:<5} p50 {r['p50_ms']:9.3f}  "
+                f"p90 {r['p90_ms']:9.3f}  p99 {r['p99_ms']:9.3f}  "
+                f"mean {r['mean_ms']:9.3f} ms"
+            )
+    return results
+
+
+def check(
+    results: Dict[str, Dict],
+    limits: Dict[str, float],
+    metric: str,
+    threshold: float,
+    label: str,
+) -> List[str]:
+    """Returns a message for every case over limit * (1 + threshold)."""
+    failures = []
+    for key, limit in limits.items():
+        if key not in results:
+            continue
+        value = results[key][metric]
+        if value > limit * (1 + threshold):
+            failures.append(
+                f"{key}: {metric} {value:.3f} ms exceeds {label} {limit:.3f} ms "
+                f"by more than {threshold:.0%}"
+            )
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sudoku Explainer benchmarks")
+    parser.add_argument("--cases", default="", help="Only run cases containing this")
+    parser.add_argument("--tiers", default=",".join(TIERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--warmup", type=int, default=1, help="Untimed calls per puzzle first"
+    )
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a saved JSON baseline")
+    parser.add_argument(
+        "--budgets",
+        default=str(DEFAULT_BUDGETS),
+        help="JSON file with absolute budgets ('' to disable)",
+    )
+    parser.add_argument("--threshold", type=float, help="Allowed regression (0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, tuple(args.tiers.split(",")), args.repeat, args.warmup)
+
+    if args.save:
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "repeat": args.repeat,
+                "warmup": args.warmup,
+            },
+            "results": results,
+        }
+        Path(args.save).write_text(json.dumps(payload, indent=2) + "\n")
+
+    failures = []
+    if args.budgets and Path(args.budgets).exists():
+        config = json.loads(Path(args.budgets).read_text())
+        threshold = config["threshold"] if args.threshold is None else args.threshold
+        failures += check(
+            results, config["budgets"], config["metric"], threshold, "budget"
+        )
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        threshold = args.threshold if args.threshold is not None else 0.25
+        for metric in ("p50_ms", "p90_ms"):
+            limits = {k: v[metric] for k, v in baseline.items()}
+            failures += check(results, limits, metric, threshold, "baseline")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
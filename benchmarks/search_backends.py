@@ -0,0 +1,62 @@
+"""Search backends (MRV backtracking, Dancing Links) on the hardest puzzles.
+
+Times solving and uniqueness checks (counting to 2) over the extreme
+corpus tier, plus puzzles built to defeat naive backtracking, and reports
+the search nodes each backend visits.
+
+    python -m benchmarks.search_backends --tiers hard,extreme
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.run import load_corpus
+from sudoku_explainer.budget import Budget
+from sudoku_explainer.search import BACKENDS
+from sudoku_explainer.utils import parse_puzzle
+
+# 17-clue puzzles: the anti-brute-force one (its first row solves to
+# 987654321) and two more with the fewest possible clues.
+ADVERSARIAL = [
+    "000000000000003085001020000000507000004000100090000000500000073002010000000040009",
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+]
+
+
+def measure(backend, puzzles, count: bool):
+    times, nodes = [], []
+    for puzzle in puzzles:
+        board = parse_puzzle(puzzle)
+        budget = Budget()
+        start = time.perf_counter()
+        if count:
+            backend.count(board, 2, budget)
+        else:
+            backend.solve(board, budget)
+        times.append((time.perf_counter() - start) * 1000)
+        nodes.append(budget.nodes)
+    return times, nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiers", default="extreme")
+    args = parser.parse_args()
+
+    sets = [(tier, load_corpus(tier)) for tier in args.tiers.split(",")]
+    sets.append(("adversarial", ADVERSARIAL))
+    for label, puzzles in sets:
+        for name, backend in BACKENDS.items():
+            for task, count in (("solve", False), ("count<=2", True)):
+                times, nodes = measure(backend, puzzles, count)
+                print(
+                    f"{label:<12} {name:<13} {task:<9} "
+                    f"p50 {statistics.median(times):8.2f} ms  max {max(times):8.2f} ms  "
+                    f"nodes p50 {statistics.median(nodes):8.0f} max {max(nodes):8d}"
+                )
+
+
+if __name__ == "__main__":
+    main()
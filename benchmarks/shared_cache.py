@@ -0,0 +1,93 @@
+"""Web service caches across worker processes, with and without the shared file.
+
+Starts N worker processes that each look up the solution, trace and rating
+of every corpus puzzle through web.services, as N uvicorn workers serving
+the same puzzles would. Without the shared cache every worker solves every
+puzzle; with it, each puzzle is solved about once per host. Reports wall
+time, the shared cache's hit rate and occupancy, and each worker's peak RSS.
+
+    python -m benchmarks.shared_cache --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks.run import TIERS, load_corpus
+
+
+def worker(path, puzzles, offset, start_event, results):
+    if path:
+        os.environ["SUDOKU_SHARED_CACHE"] = path
+    from web import services
+
+    start_event.wait()
+    start = time.perf_counter()
+    # Each worker starts at a different puzzle, as requests would arrive
+    for puzzle in puzzles[offset:] + puzzles[:offset]:
+        services.get_solution_str(puzzle)
+        services.get_trace(puzzle)
+        services.get_rating(puzzle)
+    seconds = time.perf_counter() - start
+    shared = services.get_shared_cache()
+    results.put(
+        (
+            seconds,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            shared.stats() if shared is not None else None,
+        )
+    )
+
+
+def run(workers: int, puzzles, path):
+    ctx = multiprocessing.get_context("spawn")
+    start_event, results = ctx.Event(), ctx.Queue()
+    procs = [
+        ctx.Process(
+            target=worker,
+            args=(path, puzzles, i * len(puzzles) // workers, start_event, results),
+        )
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    time.sleep(1.0)  # let every worker finish importing
+    start = time.perf_counter()
+    start_event.set()
+    reports = [results.get() for _ in procs]
+    wall = time.perf_counter() - start
+    for proc in procs:
+        proc.join()
+    return wall, reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    puzzles = [p for tier in TIERS for p in load_corpus(tier)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in (None, os.path.join(tmp, "results.cache")):
+            wall, reports = run(args.workers, puzzles, path)
+            rss = [r[1] // 1024 for r in reports]  # ru_maxrss is in KiB on Linux
+            print(
+                f"{'shared' if path else 'per-worker':<11} {args.workers} workers  "
+                f"{wall * 1000:8.1f} ms wall  peak RSS {min(rss)}-{max(rss)} MiB"
+            )
+            if path:
+                stats = max(reports, key=lambda r: r[2]["hits"] + r[2]["misses"])[2]
+                print(
+                    f"            hit rate {stats['hit_rate']:.1%} "
+                    f"({stats['hits']} hits, {stats['misses']} misses), "
+                    f"{stats['used_slots']}/{stats['slots']} slots, "
+                    f"{stats['used_bytes'] / 1024:.0f} KiB of "
+                    f"{stats['mapped_bytes'] / 2**20:.0f} MiB mapped once per host"
+                )
+
+
+if __name__ == "__main__":
+    main()
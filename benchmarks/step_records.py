@@ -0,0 +1,61 @@
+"""Cost of eager step dicts versus lazily rendered Step records.
+
+Solves a batch of puzzles keeping every step (as SudokuSolver.steps does),
+once with the Step records as returned and once converting each step to
+the legacy dict with its formatted explanation, as strategies used to.
+
+    python -m benchmarks.step_records --count 300
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from sudoku_explainer.puzzles import BASE_EASY, BASE_MEDIUM, generate_variations
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import parse_puzzle
+
+
+def solve_all(puzzles, eager: bool):
+    kept = []
+    for p in puzzles:
+        solver = SudokuSolver(parse_puzzle(p))
+        for step in solver.solve():
+            kept.append(step.to_dict() if eager else step)
+    return kept
+
+
+def measure(puzzles, eager: bool):
+    start = time.perf_counter()
+    solve_all(puzzles, eager)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    kept = solve_all(puzzles, eager)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, retained, peak, len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    half = args.count // 2
+    puzzles = generate_variations(BASE_EASY, half, rng) + generate_variations(
+        BASE_MEDIUM, args.count - half, rng
+    )
+
+    for label, eager in (("dict (eager)", True), ("Step (lazy)", False)):
+        elapsed, retained, peak, steps = measure(puzzles, eager)
+        print(
+            f"{label:<13} {steps:>7} steps  {elapsed:7.3f} s  "
+            f"retained {retained / 1024:9.1f} KiB  peak {peak / 1024:9.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Logical solve passes and time, one step per scan versus sweep mode.
+
+A step-by-step solve rescans from the first strategy after every
+deduction; a sweep applies everything a strategy finds in one pass. Both
+leave the same grid and rating score (see test_policies.py).
+
+    python -m benchmarks.sweep_passes --repeat 3
+"""
+
+import argparse
+import time
+
+from benchmarks.run import TIERS, load_corpus
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import parse_puzzle
+
+
+def solve_all(puzzles, sweep: bool) -> int:
+    passes = 0
+    for puzzle in puzzles:
+        solver = SudokuSolver(parse_puzzle(puzzle), sweep=sweep)
+        for _ in solver.solve():
+            pass
+        passes += solver.passes
+    return passes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for tier in TIERS:
+        puzzles = load_corpus(tier)
+        for sweep in (False, True):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                passes = solve_all(puzzles, sweep)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{tier:<8} {'sweep' if sweep else 'step':<6} "
+                f"{best * 1000 / len(puzzles):7.2f} ms/puzzle  "
+                f"{passes / len(puzzles):6.1f} passes"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Hints for a selected cell, row, column or box, searched in the region's
+units versus over the whole board.
+
+Walks each corpus puzzle step by step and, at every position, asks for a
+hint on a random cell and on the row, column and box through it, twice:
+with hints.find_hint, whose strategies only look at the units involving
+the region, and with every strategy searching the whole board and its
+step kept only if it touches the region (Strategy's default apply_in).
+Also times the next step anywhere, as the "/step" route computes it.
+Reports the mean and 95th percentile latency of each and how often a
+hint was found, and checks the targeted search finds a hint wherever the
+whole-board one does.
+
+    python -m benchmarks.targeted_hints --tiers medium,hard,extreme
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.run import load_corpus
+from sudoku_explainer.hints import find_hint, parse_region
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.strategies.base import Strategy
+from sudoku_explainer.utils import parse_puzzle
+
+SCOPES = ("cell", "row", "col", "box")
+
+
+def positions(puzzles):
+    """Every board reached while solving the puzzles step by step."""
+    for puzzle in puzzles:
+        board = parse_puzzle(puzzle)
+        solver = SudokuSolver(board)
+        while not board.is_solved():
+            yield board
+            if solver.solve_step() is None:
+                break
+
+
+def whole_board_hint(board, region):
+    """The first strategy's step touching region, searching the whole board."""
+    for strategy in SudokuSolver(board).strategies:
+        step = Strategy.apply_in(strategy, board.clone(), region)
+        if step is not None:
+            return step
+    return None
+
+
+def summary(samples):
+    ordered = sorted(samples)
+    mean = sum(ordered) / len(ordered)
+    p95 = ordered[min(len(ordered) - 1, len(ordered) * 95 // 100)]
+    return f"mean {mean * 1e6:8.1f} us  p95 {p95 * 1e6:8.1f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiers", default="medium,hard,extreme")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clock = time.perf_counter
+    for tier in args.tiers.split(","):
+        anywhere = []
+        targeted = {scope: [] for scope in SCOPES}
+        whole = {scope: [] for scope in SCOPES}
+        found = {scope: 0 for scope in SCOPES}
+        found_whole = {scope: 0 for scope in SCOPES}
+        for board in positions(load_corpus(tier)):
+            start = clock()
+            SudokuSolver(board.clone()).solve_step()
+            anywhere.append(clock() - start)
+            row, col = rng.randrange(board.size), rng.randrange(board.size)
+            for scope in SCOPES:
+                region = parse_region(board, scope, row, col)
+                start = clock()
+                step = find_hint(board, region)
+                targeted[scope].append(clock() - start)
+                start = clock()
+                reference = whole_board_hint(board, region)
+                whole[scope].append(clock() - start)
+                # The whole-board search only sees each strategy's first step,
+                # so it can miss deductions in the region, never the reverse
+                if step is None and reference is not None:
+                    raise SystemExit(f"{tier}: targeted search missed a {scope} hint")
+                found[scope] += step is not None
+                found_whole[scope] += reference is not None
+        print(f"{tier}: {len(anywhere)} positions")
+        print(f"  {'anywhere':<8} {'':<10} {summary(anywhere)}")
+        for scope in SCOPES:
+            for label, times, hits in (
+                ("targeted", targeted[scope], found[scope]),
+                ("board", whole[scope], found_whole[scope]),
+            ):
+                print(
+                    f"  {scope if label == 'targeted' else '':<8} {label:<10} "
+                    f"{summary(times)}  found {hits / len(anywhere):6.1%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
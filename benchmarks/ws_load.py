@@ -0,0 +1,72 @@
+"""Load generator for the /ws game channel.
+
+Opens N concurrent connections against a running server, sends a stream of
+step/move messages on each and reports per-message round-trip latency.
+
+    python -m uvicorn web.app:app &
+    python benchmarks/ws_load.py --connections 1,10,100 --messages 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+import websockets
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def run_client(url: str, messages: int, latencies: List[float]) -> None:
+    async with websockets.connect(url) as ws:
+        await ws.recv()  # initial state
+        for i in range(messages):
+            if i % 2:
+                msg = {"type": "step"}
+            else:
+                msg = {"type": "hint"}
+            start = time.perf_counter()
+            await ws.send(json.dumps(msg))
+            await ws.recv()
+            latencies.append(time.perf_counter() - start)
+
+
+async def run_level(url: str, connections: int, messages: int) -> None:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(run_client(url, messages, latencies) for _ in range(connections))
+    )
+    elapsed = time.perf_counter() - start
+    ms = [x * 1000 for x in latencies]
+    print(
+        f"{connections:>5} conns  {len(ms):>7} msgs  "
+        f"{len(ms) / elapsed:>9.0f} msg/s  "
+        f"p50 {percentile(ms, 50):7.2f} ms  "
+        f"p95 {percentile(ms, 95):7.2f} ms  "
+        f"p99 {percentile(ms, 99):7.2f} ms  "
+        f"mean {statistics.mean(ms):7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket channel load test")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws")
+    parser.add_argument(
+        "--connections", default="1,10,50", help="Comma-separated levels to run"
+    )
+    parser.add_argument("--messages", type=int, default=40, help="Per connection")
+    args = parser.parse_args()
+
+    for level in args.connections.split(","):
+        asyncio.run(run_level(args.url, int(level), args.messages))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,61 @@
 import argparse
+import signal
 import sys
 from sudoku_explainer.board import Board
+from sudoku_explainer.budget import Budget, BudgetExceeded
+from sudoku_explainer.geometry import geometry_for_length, get_geometry
+from sudoku_explainer.policy import DEFAULT_POLICY, POLICIES
 from sudoku_explainer.utils import parse_puzzle, format_board_simple
-from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.solver import SudokuSolver, replay_steps
+from sudoku_explainer.store import SolutionStore
 
 def main():
     parser = argparse.ArgumentParser(description="Sudoku Explainer CLI")
-    parser.add_argument("--puzzle", type=str, help="81-character puzzle string", required=False)
+    parser.add_argument(
+        "--puzzle",
+        type=str,
+        help="81-character puzzle string (or 16/36/256/625 for other sizes)",
+        required=False,
+    )
+    parser.add_argument(
+        "--box",
+        type=str,
+        help=(
+            "Box shape ROWSxCOLS, e.g. 2x3; "
+            "inferred from the puzzle length if omitted"
+        ),
+        required=False,
+    )
+    parser.add_argument(
+        "--store",
+        type=str,
+        help=(
+            "SQLite solved-puzzle store to read through; its traces use the "
+            "human policy, so it is skipped for other policies"
+        ),
+        required=False,
+    )
+    parser.add_argument(
+        "--policy",
+        choices=sorted(POLICIES),
+        default=DEFAULT_POLICY,
+        help=(
+            "Strategy ordering: human (simplest step first) "
+            "or fast (cheapest learned first)"
+        ),
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="Stop solving after this many seconds",
+        required=False,
+    )
+    parser.add_argument(
+        "--node-limit",
+        type=int,
+        help="Stop solving after this many steps/search nodes",
+        required=False,
+    )
     args = parser.parse_args()
 
     puzzle_str = args.puzzle
@@ -14,10 +63,21 @@ def main():
         # Default hard puzzle if none provided
         # This is just a placeholder for now
         print("No puzzle provided. Using a default sample.")
-        puzzle_str = "000000010400000000020000000000050407008000300001090000300400200050100000000806000"
+        puzzle_str = (
+            "000000010400000000020000000"
+            "000050407008000300001090000"
+            "300400200050100000000806000"
+        )
 
     try:
-        board = parse_puzzle(puzzle_str)
+        if args.box:
+            box_rows, box_cols = (int(n) for n in args.box.lower().split("x"))
+            geometry = get_geometry(box_rows, box_cols)
+        else:
+            geometry = geometry_for_length(len(puzzle_str))
+        if args.store and not geometry.standard:
+            raise ValueError("The solved-puzzle store only holds 9x9 puzzles.")
+        board = parse_puzzle(puzzle_str, geometry)
     except ValueError as e:
         print(f"Error parsing puzzle: {e}")
         sys.exit(1)
@@ -26,19 +86,40 @@ def main():
     print(format_board_simple(board))
     print("\nSolving...\n")
 
-    solver = SudokuSolver(board)
-    solved = False
-    
-    # Iterate through the generator to get steps
-    for step in solver.solve():
-        print(f"Strategy: {step['type']}")
-        print(f"Explanation: {step['explanation']}")
+    budget = Budget(time_limit=args.time_limit, node_limit=args.node_limit)
+    # Ctrl-C stops the solve and still shows the progress made
+    signal.signal(signal.SIGINT, lambda *_: budget.cancel())
+
+    solver = SudokuSolver(board, budget, args.policy)
+    steps = solver.solve()
+    if args.store and args.policy == DEFAULT_POLICY:
+        try:
+            with SolutionStore(args.store) as store:
+                entry = store.lookup_or_solve(puzzle_str, budget)
+        except BudgetExceeded as e:
+            print(f"Store lookup: {e}")
+            entry = None
+        if entry is not None and entry.steps is not None:
+            replay_steps(board, entry.steps)
+            steps = entry.steps
+
+    # Iterate through the steps
+    for step in steps:
+        print(f"Strategy: {step.type}")
+        print(f"Explanation: {step.explanation}")
         print("-" * 20)
     
     if board.is_solved():
         print("\nSolved Board:")
         print(format_board_simple(board))
         print("\nPuzzle Solved Successfully!")
+    elif solver.stopped:
+        print(
+            f"\nStopped ({solver.stopped}) after {budget.nodes} nodes, "
+            f"{budget.elapsed():.2f} s."
+        )
+        print("Current Board State:")
+        print(format_board_simple(board))
     else:
         print("\nStuck! Could not solve further with implemented strategies.")
         print("Current Board State:")
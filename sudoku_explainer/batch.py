@@ -0,0 +1,179 @@
+"""Vectorized batch solver.
+
+Holds N boards as an (N, 81) uint8 value array and an (N, 81) uint16
+candidate-mask array (bit d set when digit d is possible) and applies
+basic eliminations, naked singles and hidden singles to every board at
+once with NumPy over precomputed unit index arrays. Boards that stall are
+handed to the scalar SudokuSolver and backtracking search.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .solver import SudokuSolver
+from .utils import board_to_string, parse_puzzle, solve_sudoku_backtracking
+
+ALL_DIGITS = 0x3FE  # bits 1..9
+
+# (27, 9) cell indices of every row, column and box
+UNITS = np.array(
+    [[r * 9 + c for c in range(9)] for r in range(9)]
+    + [[r * 9 + c for r in range(9)] for c in range(9)]
+    + [
+        [r * 9 + c for r in range(br, br + 3) for c in range(bc, bc + 3)]
+        for br in range(0, 9, 3)
+        for bc in range(0, 9, 3)
+    ],
+    dtype=np.intp,
+)
+# (81, 3) unit ids (row, column, box) of every cell
+CELL_UNITS = np.array(
+    [[i // 9, 9 + i % 9, 18 + (i // 27) * 3 + (i % 9) // 3] for i in range(81)],
+    dtype=np.intp,
+)
+DIGITS = np.arange(1, 10, dtype=np.uint16)
+DIGIT_BITS = (1 << DIGITS).astype(np.uint16)
+
+POPCOUNT = np.array([bin(m).count("1") for m in range(1 << 10)], dtype=np.uint8)
+# Digit of a single-bit mask, 0 otherwise
+SINGLE_DIGIT = np.zeros(1 << 10, dtype=np.uint8)
+for _d in range(1, 10):
+    SINGLE_DIGIT[1 << _d] = _d
+
+# Byte value -> digit, for parsing ('.' and anything else non-digit is empty)
+_PARSE_TABLE = np.zeros(256, dtype=np.uint8)
+_PARSE_TABLE[ord("1") : ord("9") + 1] = np.arange(1, 10, dtype=np.uint8)
+
+
+def parse_many(puzzles: List[str]) -> np.ndarray:
+    """Parses 81-char puzzle strings into an (N, 81) uint8 value array."""
+    for p in puzzles:
+        if len(p) != 81:
+            raise ValueError("Puzzle string must be exactly 81 characters long.")
+    raw = np.frombuffer("".join(puzzles).encode("ascii"), dtype=np.uint8)
+    return _PARSE_TABLE[raw].reshape(len(puzzles), 81)
+
+
+def format_many(values: np.ndarray) -> List[str]:
+    """Inverse of parse_many."""
+    text = (values + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+    return [text[i : i + 81] for i in range(0, len(text), 81)]
+
+
+def initial_masks(values: np.ndarray) -> np.ndarray:
+    """Candidate masks with peers of every given eliminated."""
+    masks = np.where(values == 0, ALL_DIGITS, 0).astype(np.uint16)
+    eliminate(values, masks)
+    return masks
+
+
+def eliminate(values: np.ndarray, masks: np.ndarray) -> None:
+    """Removes every placed digit from the candidates of its peers, in place."""
+    bits = np.where(values == 0, 0, np.left_shift(1, values, dtype=np.uint16))
+    bits = bits.astype(np.uint16)
+    unit_used = np.bitwise_or.reduce(bits[:, UNITS], axis=2)  # (N, 27)
+    forbidden = np.bitwise_or.reduce(unit_used[:, CELL_UNITS], axis=2)  # (N, 81)
+    masks &= ~forbidden
+    masks[values != 0] = 0
+
+
+def contradictions(values: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Boards with an empty cell that has no candidates or a repeated digit."""
+    dead_cell = ((values == 0) & (masks == 0)).any(axis=1)
+    onehot = values[:, :, None] == DIGITS[None, None, :].astype(np.uint8)
+    per_unit = onehot[:, UNITS].sum(axis=2)  # (N, 27, 9)
+    return dead_cell | (per_unit > 1).any(axis=(1, 2))
+
+
+def place_naked_singles(values: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Fills every cell with exactly one candidate. Returns per-board progress."""
+    singles = SINGLE_DIGIT[masks]
+    hit = (values == 0) & (singles != 0)
+    values[hit] = singles[hit]
+    masks[hit] = 0
+    return hit.any(axis=1)
+
+
+def place_hidden_singles(values: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Fills every digit that has one place left in a unit. Returns progress."""
+    unit_masks = masks[:, UNITS]  # (N, 27, 9)
+    has = (unit_masks[:, :, :, None] & DIGIT_BITS) != 0  # (N, 27, 9 cells, 9 digits)
+    lone = has.sum(axis=2) == 1  # (N, 27, 9 digits)
+    board_idx, unit_idx, digit_idx = np.nonzero(lone)
+    if board_idx.size == 0:
+        return np.zeros(len(values), dtype=bool)
+
+    slot = has[board_idx, unit_idx, :, digit_idx].argmax(axis=1)
+    cells = UNITS[unit_idx, slot]
+    # Conflicting placements in one cell surface as contradictions later
+    values[board_idx, cells] = (digit_idx + 1).astype(np.uint8)
+    masks[board_idx, cells] = 0
+    progress = np.zeros(len(values), dtype=bool)
+    progress[board_idx] = True
+    return progress
+
+
+def propagate(values: np.ndarray, masks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Runs singles to a fixpoint on all boards, in place.
+
+    Returns (solved, dead) boolean arrays over the boards.
+    """
+    active = np.arange(len(values))
+    dead = np.zeros(len(values), dtype=bool)
+    while active.size:
+        v, m = values[active], masks[active]
+        eliminate(v, m)
+        progress = place_naked_singles(v, m)
+        eliminate(v, m)
+        progress |= place_hidden_singles(v, m)
+        eliminate(v, m)
+        bad = contradictions(v, m)
+        values[active], masks[active] = v, m
+        dead[active[bad]] = True
+        active = active[progress & ~bad & (v == 0).any(axis=1)]
+    solved = ~dead & (values != 0).all(axis=1)
+    return solved, dead
+
+
+def solve_many(puzzles: List[str], fallback: bool = True) -> List[Optional[str]]:
+    """Solves many puzzles at once.
+
+    Returns the solution string for each puzzle, or None when the puzzle
+    has no solution (or stalls and fallback is disabled).
+    """
+    if not puzzles:
+        return []
+    return solve_values(parse_many(puzzles), fallback)
+
+
+def solve_values(values: np.ndarray, fallback: bool = True) -> List[Optional[str]]:
+    """Like solve_many, for an (N, 81) digit array such as Corpus.digits().
+
+    The array is copied, never modified.
+    """
+    values = np.array(values, dtype=np.uint8)
+    masks = initial_masks(values)
+    solved, dead = propagate(values, masks)
+    partial = format_many(values)
+
+    results: List[Optional[str]] = []
+    for i, text in enumerate(partial):
+        if solved[i]:
+            results.append(text)
+        elif dead[i] or not fallback:
+            results.append(None)
+        else:
+            results.append(_solve_scalar(text))
+    return results
+
+
+def _solve_scalar(puzzle_str: str) -> Optional[str]:
+    board = parse_puzzle(puzzle_str)
+    if not board.is_valid():
+        return None
+    for _ in SudokuSolver(board, sweep=True).solve():
+        pass
+    if not board.is_solved() and not solve_sudoku_backtracking(board):
+        return None
+    return board_to_string(board)
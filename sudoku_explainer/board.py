@@ -1,41 +1,184 @@
-from typing import List, Set, Optional
+from typing import Any, List, Set, Optional, Sequence, Tuple
+
+from .geometry import STANDARD, SYMBOLS, Geometry, geometry_for_size
+
+
+# Trail entry kinds; see Board.start_trail
+_PLACED = 0  # (_PLACED, row, col, (old value, old candidate set))
+_REMOVED = 1  # (_REMOVED, row, col, value)
+_ADDED = 2  # (_ADDED, row, col, value)
 
 
 class Board:
-    def __init__(self, grid: Optional[List[List[int]]] = None):
-        self.grid = [[0 for _ in range(9)] for _ in range(9)]
-        self.candidates = [[set(range(1, 10)) for _ in range(9)] for _ in range(9)]
+    """A grid with the candidates of each empty cell.
+
+    Alongside the grid the board keeps the digits placed in each unit
+    (held[unit], a mask with bit d - 1 for digit d, units in geometry.units
+    order), the (unit, digit) pairs placed more than once (conflicts) and
+    the number of empty cells, so is_valid and is_solved take O(1). They
+    follow every set_value, clear_value and rollback; call recount() after
+    writing to grid directly.
+    """
+
+    # Undo log of changes since start_trail(), or None when not recording
+    trail: Optional[List[Tuple[Any, ...]]] = None
 
+    def __init__(
+        self,
+        grid: Optional[List[List[int]]] = None,
+        geometry: Optional[Geometry] = None,
+    ):
+        """A board of the given geometry, inferred from the grid if omitted
+        (standard 9x9 when both are)."""
+        if geometry is None:
+            geometry = geometry_for_size(len(grid)) if grid else STANDARD
+        self.geometry = geometry
+        self.size = geometry.size
         if grid:
-            for r in range(9):
-                for c in range(9):
-                    if grid[r][c] != 0:
-                        self.set_value(r, c, grid[r][c])
+            self._load([v for row in grid for v in row])
+        else:
+            self._load([0] * geometry.cell_count)
+
+    @classmethod
+    def from_values(
+        cls, values: Sequence[int], geometry: Geometry = STANDARD
+    ) -> "Board":
+        """Builds a board from its digits in row-major order (0 = empty)."""
+        board = cls.__new__(cls)
+        board.geometry = geometry
+        board.size = geometry.size
+        board._load(values)
+        return board
+
+    def _load(self, values: Sequence[int]) -> None:
+        # Same result as calling set_value for every clue, but builds each
+        # cell's candidates once from the row/column/box masks.
+        geo = self.geometry
+        n = geo.size
+        if len(values) != geo.cell_count:
+            raise ValueError(f"Expected {geo.cell_count} cells, got {len(values)}.")
+        rows = [0] * n
+        cols = [0] * n
+        boxes = [0] * n
+        box_of = geo.box_of
+        conflicts = set()
+        clues = 0
+        for idx, v in enumerate(values):
+            if v:
+                if not 0 < v <= n:
+                    raise ValueError(f"Value {v} out of range for a {n}x{n} grid.")
+                r, c = divmod(idx, n)
+                b = box_of[r][c]
+                bit = 1 << (v - 1)
+                if (rows[r] | cols[c] | boxes[b]) & bit:
+                    # A repeated clue; mark the units it repeats in
+                    units = geo.cell_units[r][c]
+                    for unit, held in zip(units, (rows[r], cols[c], boxes[b])):
+                        if held & bit:
+                            conflicts.add((unit, v))
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+                clues += 1
+
+        self.grid = [list(values[r * n : r * n + n]) for r in range(n)]
+        self.candidates = []
+        for r in range(n):
+            row = []
+            for c in range(n):
+                if values[r * n + c]:
+                    row.append(set())
+                else:
+                    used = rows[r] | cols[c] | boxes[box_of[r][c]]
+                    row.append(set(geo.mask_digits(geo.all_mask & ~used)))
+            self.candidates.append(row)
+        self.held: List[int] = rows + cols + boxes
+        self.conflicts: Set[Tuple[int, int]] = conflicts
+        self.empty = geo.cell_count - clues
+
+    def recount(self) -> None:
+        """Rebuilds held, conflicts and empty from the grid, after writing
+        to it directly. Candidates are left as they are."""
+        grid = self.grid
+        self.held = [0] * len(self.geometry.units)
+        self.conflicts = set()
+        self.empty = self.geometry.cell_count
+        for r, row in enumerate(grid):
+            for c, value in enumerate(row):
+                if value:
+                    row[c] = 0
+                    self._put(r, c, value)
+
+    def _placed(self, unit: int, value: int) -> int:
+        """How many cells of unit hold value."""
+        grid = self.grid
+        return sum(grid[r][c] == value for r, c in self.geometry.units[unit][2])
+
+    def _put(self, row: int, col: int, value: int) -> None:
+        """Writes value (0 to clear) to the grid, keeping held, conflicts and
+        empty in step."""
+        grid = self.grid
+        old = grid[row][col]
+        if old == value:
+            return
+        held, conflicts = self.held, self.conflicts
+        units = self.geometry.cell_units[row][col]
+        grid[row][col] = value
+        if old:
+            bit = 1 << (old - 1)
+            for unit in units:
+                if not conflicts or (unit, old) not in conflicts:
+                    held[unit] &= ~bit
+                elif self._placed(unit, old) == 1:
+                    conflicts.discard((unit, old))
+        else:
+            self.empty -= 1
+        if value:
+            bit = 1 << (value - 1)
+            for unit in units:
+                if held[unit] & bit:
+                    conflicts.add((unit, value))
+                else:
+                    held[unit] |= bit
+        else:
+            self.empty += 1
 
     def set_value(self, row: int, col: int, value: int) -> None:
         """Sets a value in the grid and clears candidates for that cell."""
-        self.grid[row][col] = value
+        if self.trail is not None:
+            # The old set is replaced, not mutated, so it can be kept as is
+            self.trail.append(
+                (_PLACED, row, col, (self.grid[row][col], self.candidates[row][col]))
+            )
+        self._put(row, col, value)
         self.candidates[row][col] = set()
         self.update_peers(row, col, value)
 
+    def clear_value(self, row: int, col: int) -> None:
+        """Empties a cell. Its candidates become the digits none of its peers
+        hold; the peers' candidates are left as they are."""
+        if self.trail is not None:
+            self.trail.append(
+                (_PLACED, row, col, (self.grid[row][col], self.candidates[row][col]))
+            )
+        self._put(row, col, 0)
+        grid = self.grid
+        held = {grid[r][c] for r, c in self.geometry.peers[row][col]}
+        self.candidates[row][col] = set(self.geometry.digits) - held
+
     def update_peers(self, row: int, col: int, value: int) -> None:
         """Removes the set value from candidates of all peers."""
-        # Row
-        for c in range(9):
-            if value in self.candidates[row][c]:
-                self.candidates[row][c].remove(value)
-
-        # Column
-        for r in range(9):
-            if value in self.candidates[r][col]:
-                self.candidates[r][col].remove(value)
-
-        # Box
-        start_r, start_c = (row // 3) * 3, (col // 3) * 3
-        for r in range(start_r, start_r + 3):
-            for c in range(start_c, start_c + 3):
-                if value in self.candidates[r][c]:
-                    self.candidates[r][c].remove(value)
+        candidates = self.candidates
+        trail = self.trail
+        if trail is None:
+            for r, c in self.geometry.peers[row][col]:
+                candidates[r][c].discard(value)
+            return
+        for r, c in self.geometry.peers[row][col]:
+            cands = candidates[r][c]
+            if value in cands:
+                cands.remove(value)
+                trail.append((_REMOVED, r, c, value))
 
     def get_value(self, row: int, col: int) -> int:
         return self.grid[row][col]
@@ -47,6 +190,8 @@ class Board:
         """Removes a candidate from a cell. Returns True if changed."""
         if value in self.candidates[row][col]:
             self.candidates[row][col].remove(value)
+            if self.trail is not None:
+                self.trail.append((_REMOVED, row, col, value))
             return True
         return False
 
@@ -54,67 +199,88 @@ class Board:
         """Adds a candidate to a cell. Returns True if changed."""
         if value not in self.candidates[row][col]:
             self.candidates[row][col].add(value)
+            if self.trail is not None:
+                self.trail.append((_ADDED, row, col, value))
             return True
         return False
 
+    def start_trail(self) -> "Board":
+        """Starts recording changes so they can be undone with rollback().
+
+        Every set_value, clear_value, remove_candidate and add_candidate
+        from here on is logged in O(1) per changed cell; writes straight to grid or
+        candidates are not. Returns the board.
+        """
+        if self.trail is None:
+            self.trail = []
+        return self
+
+    def stop_trail(self) -> None:
+        """Stops recording and drops the trail."""
+        self.trail = None
+
+    def mark(self) -> int:
+        """A position to roll back to, starting the trail if needed."""
+        if self.trail is None:
+            self.trail = []
+        return len(self.trail)
+
+    def rollback(self, mark: int) -> None:
+        """Undoes every recorded change made since mark, newest first."""
+        trail = self.trail
+        if trail is None or mark > len(trail):
+            raise ValueError("Mark is not on this board's trail.")
+        candidates = self.candidates
+        while len(trail) > mark:
+            kind, r, c, data = trail.pop()
+            if kind == _REMOVED:
+                candidates[r][c].add(data)
+            elif kind == _PLACED:
+                value, candidates[r][c] = data
+                self._put(r, c, value)
+            else:
+                candidates[r][c].discard(data)
+
     def is_solved(self) -> bool:
-        for r in range(9):
-            for c in range(9):
-                if self.grid[r][c] == 0:
-                    return False
-        return self.is_valid()
+        return not self.empty and not self.conflicts
 
     def is_valid(self) -> bool:
-        # Check rows
-        for r in range(9):
-            seen = set()
-            for c in range(9):
-                val = self.grid[r][c]
-                if val != 0:
-                    if val in seen:
-                        return False
-                    seen.add(val)
-
-        # Check cols
-        for c in range(9):
-            seen = set()
-            for r in range(9):
-                val = self.grid[r][c]
-                if val != 0:
-                    if val in seen:
-                        return False
-                    seen.add(val)
-
-        # Check boxes
-        for br in range(0, 9, 3):
-            for bc in range(0, 9, 3):
-                seen = set()
-                for r in range(br, br + 3):
-                    for c in range(bc, bc + 3):
-                        val = self.grid[r][c]
-                        if val != 0:
-                            if val in seen:
-                                return False
-                            seen.add(val)
-        return True
+        """True if no row, column or box repeats a digit."""
+        return not self.conflicts
+
+    def conflict_cells(self) -> Set[Tuple[int, int]]:
+        """Filled cells whose digit repeats in their row, column or box."""
+        grid, units = self.grid, self.geometry.units
+        cells = set()
+        for unit, value in self.conflicts:
+            for r, c in units[unit][2]:
+                if grid[r][c] == value:
+                    cells.add((r, c))
+        return cells
 
     def clone(self) -> "Board":
-        """Creates a deep copy of the board."""
-        new_board = Board()
+        """Creates a deep copy of the board (without its trail)."""
+        new_board = Board.__new__(Board)
+        new_board.geometry = self.geometry
+        new_board.size = self.size
         new_board.grid = [row[:] for row in self.grid]
         new_board.candidates = [[c.copy() for c in row] for row in self.candidates]
+        new_board.held = self.held[:]
+        new_board.conflicts = set(self.conflicts)
+        new_board.empty = self.empty
         return new_board
 
     def __str__(self) -> str:
+        geo = self.geometry
         res = []
-        for r in range(9):
-            if r % 3 == 0 and r != 0:
-                res.append("-" * 21)
+        for r in range(self.size):
+            if r % geo.box_rows == 0 and r != 0:
+                res.append("-" * (2 * (self.size + geo.boxes_across - 1) - 1))
             row_str = []
-            for c in range(9):
-                if c % 3 == 0 and c != 0:
+            for c in range(self.size):
+                if c % geo.box_cols == 0 and c != 0:
                     row_str.append("|")
                 val = self.grid[r][c]
-                row_str.append(str(val) if val != 0 else ".")
+                row_str.append(SYMBOLS[val - 1] if val != 0 else ".")
             res.append(" ".join(row_str))
         return "\n".join(res)
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Optional
+
+# Reasons a budgeted solve stops early
+TIME = "time"
+NODES = "nodes"
+CANCELLED = "cancelled"
+
+
+class BudgetExceeded(ValueError):
+    """Raised when a solve runs out of time or nodes, or is cancelled.
+
+    A ValueError, so callers that already report unsolvable input report
+    these puzzles the same way.
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(f"Solve stopped: {_MESSAGES[reason]}.")
+        self.reason = reason
+
+
+_MESSAGES = {
+    TIME: "time limit reached",
+    NODES: "node limit reached",
+    CANCELLED: "cancelled",
+}
+
+
+class Budget:
+    """Deadline, node budget and cancellation token for one solve.
+
+    Solvers call charge() once per step or search node. cancel() may be
+    called from another thread; the solve stops at its next charge.
+    """
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = None,
+        node_limit: Optional[int] = None,
+    ):
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.started = time.monotonic()
+        self.deadline = self.started + time_limit if time_limit is not None else None
+        self.nodes = 0
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def charge(self, nodes: int = 1) -> None:
+        """Counts nodes and raises BudgetExceeded once the budget is spent."""
+        self.nodes += nodes
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise BudgetExceeded(NODES)
+        if self._cancelled.is_set():
+            raise BudgetExceeded(CANCELLED)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded(TIME)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
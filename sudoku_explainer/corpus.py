@@ -0,0 +1,193 @@
+"""Memory-mapped access to large puzzle corpora.
+
+Two formats are supported:
+
+* text: fixed-width lines of 81 puzzle characters ('0' or '.' for blanks)
+  plus a line ending. Records are exposed as zero-copy uint8 views of the
+  mapped file; digits are converted only when asked for.
+* binary (.sdkc): a 16-byte header (magic, version, record count) followed
+  by 41-byte records, two cells per byte (high nibble first).
+
+    python -m sudoku_explainer.corpus convert puzzles.txt puzzles.sdkc
+    python -m sudoku_explainer.corpus info puzzles.sdkc
+"""
+
+import argparse
+import mmap
+import struct
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"SDKC"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")  # magic, version, record count
+PACKED_SIZE = 41  # ceil(81 / 2)
+
+# Byte -> digit ('1'..'9' map to 1..9, everything else is blank)
+_DIGITS = np.zeros(256, dtype=np.uint8)
+_DIGITS[ord("1") : ord("9") + 1] = np.arange(1, 10, dtype=np.uint8)
+
+
+class Corpus:
+    """Random-access, memory-mapped puzzle corpus (text or binary)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.binary = self._map[:4] == MAGIC
+        try:
+            self.offset, self.stride, self.count = self._layout()
+        except ValueError:
+            self._map.close()
+            self._file.close()
+            raise
+        self._records = np.frombuffer(self._map, dtype=np.uint8, offset=self.offset)
+
+    def _layout(self) -> Tuple[int, int, int]:
+        """(offset of the first record, record stride, record count)."""
+        size = len(self._map)
+        if self.binary:
+            if size < HEADER.size:
+                raise ValueError(f"{self.path} is truncated: no complete header.")
+            magic, version, count = HEADER.unpack_from(self._map, 0)
+            if version != VERSION:
+                raise ValueError(f"Unsupported corpus version {version}.")
+            if HEADER.size + count * PACKED_SIZE > size:
+                raise ValueError(
+                    f"{self.path} is truncated: the header promises {count} records."
+                )
+            return HEADER.size, PACKED_SIZE, count
+
+        newline = self._map.find(b"\n")
+        if newline == -1:
+            newline = size
+        if newline < 81:
+            raise ValueError("Corpus lines must hold 81 puzzle characters.")
+        stride = newline + 1
+        # An unterminated last line still counts as a record
+        full, rest = divmod(size, stride)
+        return 0, stride, full + (rest >= 81)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def raw(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of records [start, stop) as an (n, stride) array.
+
+        Text records are ASCII bytes (line ending included); binary records
+        are packed nibbles.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        start = max(0, min(start, stop))
+        lo, hi = start * self.stride, stop * self.stride
+        view = self._records[lo:hi]
+        if len(view) < hi - lo and not self.binary:
+            # Pad the unterminated last line with a copy
+            view = np.concatenate([view, np.full(hi - lo - len(view), 10, np.uint8)])
+        return view.reshape(stop - start, self.stride)
+
+    def digits(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Records [start, stop) as an (n, 81) uint8 array of digits 0..9."""
+        raw = self.raw(start, stop)
+        if self.binary:
+            return unpack_nibbles(raw)
+        return _DIGITS[raw[:, :81]]
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("corpus index out of range")
+        return format_digits(self.digits(index, index + 1)[0])
+
+    def __iter__(self) -> Iterator[str]:
+        for start in range(0, self.count, 4096):
+            for row in self.digits(start, start + 4096):
+                yield format_digits(row)
+
+    def shard(self, index: int, total: int) -> Tuple[int, int]:
+        """Record range [start, stop) of shard index out of total.
+
+        Shards split the file's byte range and are aligned to record
+        boundaries, so workers can map the same file and split the work
+        without reading it first.
+        """
+        if not 0 <= index < total:
+            raise ValueError("shard index out of range")
+        size = self.count * self.stride
+        start = -(-size * index // total) // self.stride
+        stop = -(-size * (index + 1) // total) // self.stride
+        return start, min(stop, self.count)
+
+    def close(self) -> None:
+        # Views handed out keep the map alive; drop ours before closing
+        self._records = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def pack_nibbles(digits: np.ndarray) -> np.ndarray:
+    """Packs an (n, 81) digit array into (n, 41) bytes, high nibble first."""
+    padded = np.zeros((len(digits), PACKED_SIZE * 2), dtype=np.uint8)
+    padded[:, :81] = digits
+    return (padded[:, 0::2] << 4) | padded[:, 1::2]
+
+
+def unpack_nibbles(packed: np.ndarray) -> np.ndarray:
+    """Inverse of pack_nibbles."""
+    out = np.empty((len(packed), PACKED_SIZE * 2), dtype=np.uint8)
+    out[:, 0::2] = packed >> 4
+    out[:, 1::2] = packed & 0x0F
+    return out[:, :81]
+
+
+def format_digits(row: np.ndarray) -> str:
+    return (row + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+
+
+def convert(src: str, dst: str, chunk: int = 1 << 16) -> int:
+    """Converts a text corpus to the packed binary format. Returns the count."""
+    with Corpus(src) as corpus, open(dst, "wb") as out:
+        if corpus.binary:
+            raise ValueError(f"{src} is already a binary corpus.")
+        out.write(HEADER.pack(MAGIC, VERSION, len(corpus)))
+        for start in range(0, len(corpus), chunk):
+            out.write(pack_nibbles(corpus.digits(start, start + chunk)).tobytes())
+        return len(corpus)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Puzzle corpus tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="Text corpus -> packed binary corpus")
+    conv.add_argument("src")
+    conv.add_argument("dst")
+    info = sub.add_parser("info", help="Show record count and format")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        count = convert(args.src, args.dst)
+        print(f"Wrote {count} puzzles to {args.dst}")
+    elif args.command == "info":
+        with Corpus(args.path) as corpus:
+            kind = "binary" if corpus.binary else "text"
+            print(
+                f"{args.path}: {len(corpus)} puzzles "
+                f"({kind}, {corpus.stride} B/record)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Dancing Links (Algorithm X) exact-cover search.
+
+A grid of size N is the exact-cover problem with N^3 candidate rows (cell,
+digit) and 4 * N^2 constraint columns (each cell filled once; each digit
+once per row, column and box). The links live in flat integer lists built
+once per geometry and thread; every solve restores them from a pristine
+copy by slice assignment instead of building a new matrix.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from .board import Board
+from .budget import Budget
+from .geometry import Geometry
+
+
+class DancingLinks:
+    """Reusable exact-cover matrix for one geometry."""
+
+    def __init__(self, geometry: Geometry):
+        self.geometry = geometry
+        n = geometry.size
+        cells = n * n
+        self.column_count = columns = 4 * cells
+
+        # Node 0 is the root, 1..columns the column headers
+        L = list(range(-1, columns))
+        R = list(range(1, columns + 2))
+        L[0], R[columns] = columns, 0
+        U = list(range(columns + 1))
+        D = list(range(columns + 1))
+        C = list(range(columns + 1))
+        S = [0] * (columns + 1)
+        # Candidate index ((r * n + c) * n + d - 1) of every node
+        cand = [-1] * (columns + 1)
+        self.row_start: List[int] = []
+
+        for r in range(n):
+            for c in range(n):
+                b = geometry.box_of[r][c]
+                for d in range(n):
+                    idx = (r * n + c) * n + d
+                    cols = (
+                        1 + r * n + c,
+                        1 + cells + r * n + d,
+                        1 + 2 * cells + c * n + d,
+                        1 + 3 * cells + b * n + d,
+                    )
+                    first = len(L)
+                    self.row_start.append(first)
+                    for k, col in enumerate(cols):
+                        node = first + k
+                        L.append(first + (k - 1) % 4)
+                        R.append(first + (k + 1) % 4)
+                        U.append(U[col])
+                        D.append(col)
+                        D[U[col]] = node
+                        U[col] = node
+                        C.append(col)
+                        cand.append(idx)
+                        S[col] += 1
+
+        self._pristine = (L, R, U, D, S)
+        self.L, self.R, self.U, self.D, self.S = (
+            L[:], R[:], U[:], D[:], S[:]
+        )
+        self.C = C
+        self.cand = cand
+        self.budget: Optional[Budget] = None
+
+    def _reset(self) -> None:
+        L, R, U, D, S = self._pristine
+        self.L[:] = L
+        self.R[:] = R
+        self.U[:] = U
+        self.D[:] = D
+        self.S[:] = S
+
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                D[U[j]] = D[j]
+                U[D[j]] = U[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                D[U[j]] = j
+                U[D[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def _load(self, board: Board) -> bool:
+        """Resets the matrix and selects the board's clues.
+
+        Returns False if two clues share a constraint.
+        """
+        self._reset()
+        n = self.geometry.size
+        C = self.C
+        covered = [False] * (self.column_count + 1)
+        for r, row in enumerate(board.grid):
+            for c, v in enumerate(row):
+                if not v:
+                    continue
+                first = self.row_start[(r * n + c) * n + v - 1]
+                for node in range(first, first + 4):
+                    col = C[node]
+                    if covered[col]:
+                        return False
+                    covered[col] = True
+                    self._cover(col)
+        return True
+
+    def _choose(self) -> int:
+        """Uncovered column with the fewest rows (0 when all are covered)."""
+        R, S = self.R, self.S
+        c = R[0]
+        best, best_size = c, S[c]
+        while c != 0:
+            if S[c] < best_size:
+                best, best_size = c, S[c]
+                if best_size <= 1:
+                    break
+            c = R[c]
+        return best
+
+    def _search(self, partial: List[int], limit: int, found: List[List[int]]) -> int:
+        """Counts solutions up to limit, keeping the first one in found."""
+        if self.budget is not None:
+            self.budget.charge()
+        if self.R[0] == 0:
+            if not found:
+                found.append(partial[:])
+            return 1
+        c = self._choose()
+        if self.S[c] == 0:
+            return 0
+
+        R, L, D, C = self.R, self.L, self.D, self.C
+        total = 0
+        self._cover(c)
+        r = D[c]
+        while r != c and total < limit:
+            partial.append(r)
+            j = R[r]
+            while j != r:
+                self._cover(C[j])
+                j = R[j]
+            total += self._search(partial, limit - total, found)
+            j = L[r]
+            while j != r:
+                self._uncover(C[j])
+                j = L[j]
+            partial.pop()
+            r = D[r]
+        self._uncover(c)
+        return total
+
+    def solve(self, board: Board, budget: Optional[Budget] = None) -> bool:
+        """Fills the board's grid with a solution. Returns False if none."""
+        found: List[List[int]] = []
+        if not self._run(board, 1, found, budget):
+            return False
+        n = self.geometry.size
+        for node in found[0]:
+            idx = self.cand[node]
+            cell, d = divmod(idx, n)
+            board.grid[cell // n][cell % n] = d + 1
+        board.recount()
+        return True
+
+    def count(
+        self, board: Board, limit: Optional[int] = None, budget: Optional[Budget] = None
+    ) -> int:
+        """Number of solutions, stopping at limit (None counts them all)."""
+        if limit is None:
+            limit = 1 << 62
+        return self._run(board, limit, [], budget)
+
+    def _run(
+        self, board: Board, limit: int, found: List[List[int]], budget: Optional[Budget]
+    ) -> int:
+        if not self._load(board):
+            return 0
+        self.budget = budget
+        try:
+            return self._search([], limit, found)
+        finally:
+            self.budget = None
+
+
+_local = threading.local()
+
+
+def get_matrix(geometry: Geometry) -> DancingLinks:
+    """The calling thread's reusable matrix for geometry."""
+    cache: Dict[Geometry, DancingLinks] = getattr(_local, "matrices", None)
+    if cache is None:
+        cache = _local.matrices = {}
+    matrix = cache.get(geometry)
+    if matrix is None:
+        matrix = cache[geometry] = DancingLinks(geometry)
+    return matrix
+
+
+def solve_dlx(board: Board, budget: Optional[Budget] = None) -> bool:
+    """Solves the board's grid in place with Algorithm X. Returns True if solvable.
+
+    Like solve_sudoku_backtracking, raises BudgetExceeded when budget runs
+    out, leaving the grid untouched.
+    """
+    return get_matrix(board.geometry).solve(board, budget)
+
+
+def count_solutions_dlx(
+    board: Board, limit: Optional[int] = 2, budget: Optional[Budget] = None
+) -> int:
+    """Counts solutions of the board's grid, stopping at limit."""
+    return get_matrix(board.geometry).count(board, limit, budget)
@@ -0,0 +1,172 @@
+"""Board shapes: box dimensions and the unit and peer tables derived from them.
+
+A grid of size N = box_rows * box_cols has N rows, N columns and N boxes of
+box_rows x box_cols cells, and holds the digits 1..N. Tables are built once
+per shape and shared by every board of that shape.
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+
+Cell = Tuple[int, int]
+Unit = Tuple[str, int, List[Cell]]
+
+# Cell symbols beyond 9 (16x16 and 25x25 grids use letters for 10..25)
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+
+
+class Region(NamedTuple):
+    """A cell, row, column or box that a targeted search is limited to."""
+
+    kind: str  # "cell", "row", "col" or "box"
+    index: Tuple[int, ...]  # (row, col) of a cell, else (unit index,)
+    cells: FrozenSet[Cell]
+    units: List[Unit]  # every unit sharing a cell with the region
+
+    def touches(self, step) -> bool:
+        """True if step places a digit in, or removes a candidate from, the region."""
+        cells = self.cells
+        if step.placement and step.placement[:2] in cells:
+            return True
+        return any((r, c) in cells for r, c, _ in step.eliminations)
+
+
+class Geometry:
+    def __init__(self, box_rows: int, box_cols: int):
+        self.box_rows = box_rows
+        self.box_cols = box_cols
+        self.size = size = box_rows * box_cols
+        self.cell_count = size * size
+        self.digits = tuple(range(1, size + 1))
+        # Candidate masks set bit d - 1 for digit d; the wire format of
+        # utils.candidate_mask uses bit d
+        self.all_mask = (1 << size) - 1
+        # Boxes per band (a band is box_rows rows tall)
+        self.boxes_across = size // box_cols
+
+        self.rows: List[List[Cell]] = [
+            [(r, c) for c in range(size)] for r in range(size)
+        ]
+        self.cols: List[List[Cell]] = [
+            [(r, c) for r in range(size)] for c in range(size)
+        ]
+        self.boxes: List[List[Cell]] = []
+        for index in range(size):
+            br, bc = self.box_origin(index)
+            self.boxes.append(
+                [
+                    (r, c)
+                    for r in range(br, br + box_rows)
+                    for c in range(bc, bc + box_cols)
+                ]
+            )
+        # (kind, index, cells) of every unit: rows, then columns, then boxes
+        self.units: List[Unit] = (
+            [("row", i, cells) for i, cells in enumerate(self.rows)]
+            + [("col", i, cells) for i, cells in enumerate(self.cols)]
+            + [("box", i, cells) for i, cells in enumerate(self.boxes)]
+        )
+
+        self.box_of = [[self.box_index(r, c) for c in range(size)] for r in range(size)]
+        # Positions in self.units of each cell's row, column and box
+        self.cell_units: List[List[Tuple[int, int, int]]] = [
+            [(r, size + c, 2 * size + self.box_of[r][c]) for c in range(size)]
+            for r in range(size)
+        ]
+        self.peers: List[List[Tuple[Cell, ...]]] = [
+            [self._peers(r, c) for c in range(size)] for r in range(size)
+        ]
+        # Regions built by region(), by (kind, index)
+        self._regions: Dict[Tuple[str, Tuple[int, ...]], Region] = {}
+        # Symbol -> value for parsing; blanks and unknown symbols are absent
+        self.symbol_values: Dict[str, int] = {}
+        for value, symbol in enumerate(SYMBOLS[:size], 1):
+            self.symbol_values[symbol] = value
+            self.symbol_values[symbol.lower()] = value
+
+    @property
+    def standard(self) -> bool:
+        return self.box_rows == 3 and self.box_cols == 3
+
+    def box_index(self, row: int, col: int) -> int:
+        return (row // self.box_rows) * self.boxes_across + col // self.box_cols
+
+    def box_origin(self, index: int) -> Cell:
+        """Top-left cell of box index."""
+        return (
+            (index // self.boxes_across) * self.box_rows,
+            (index % self.boxes_across) * self.box_cols,
+        )
+
+    def _peers(self, row: int, col: int) -> Tuple[Cell, ...]:
+        cells = set(self.rows[row]) | set(self.cols[col])
+        cells |= set(self.boxes[self.box_index(row, col)])
+        cells.discard((row, col))
+        return tuple(sorted(cells))
+
+    def region(self, kind: str, *index: int) -> Region:
+        """region("cell", row, col), or region(kind, i) for row, col or box i."""
+        region = self._regions.get((kind, index))
+        if region is not None:
+            return region
+        if kind == "cell":
+            row, col = index
+            if not (0 <= row < self.size and 0 <= col < self.size):
+                raise ValueError(f"Cell ({row}, {col}) is off the board.")
+            cells = frozenset([(row, col)])
+        else:
+            tables = {"row": self.rows, "col": self.cols, "box": self.boxes}
+            if kind not in tables:
+                raise ValueError(f"Unknown region kind {kind!r}.")
+            (i,) = index
+            if not 0 <= i < self.size:
+                raise ValueError(f"No {kind} {i} on a {self.size}x{self.size} grid.")
+            cells = frozenset(tables[kind][i])
+        units = [unit for unit in self.units if not cells.isdisjoint(unit[2])]
+        region = self._regions[kind, index] = Region(kind, index, cells, units)
+        return region
+
+    def mask_digits(self, mask: int) -> Tuple[int, ...]:
+        """Digits of a candidate mask (bit d - 1 set for digit d)."""
+        if self.size <= 9:
+            return _MASK_DIGITS[mask]
+        digits = []
+        while mask:
+            low = mask & -mask
+            digits.append(low.bit_length())
+            mask ^= low
+        return tuple(digits)
+
+    def __repr__(self) -> str:
+        return f"Geometry({self.box_rows}, {self.box_cols})"
+
+
+_MASK_DIGITS = [
+    tuple(d for d in range(1, 10) if mask >> (d - 1) & 1) for mask in range(512)
+]
+
+
+@lru_cache(maxsize=None)
+def get_geometry(box_rows: int, box_cols: int) -> Geometry:
+    return Geometry(box_rows, box_cols)
+
+
+def geometry_for_size(size: int) -> Geometry:
+    """Geometry of an N x N grid, with boxes as square as N allows."""
+    box_rows = int(size**0.5)
+    while box_rows > 1 and size % box_rows:
+        box_rows -= 1
+    if box_rows < 2 or size > len(SYMBOLS):
+        raise ValueError(f"Unsupported grid size {size}.")
+    return get_geometry(box_rows, size // box_rows)
+
+
+def geometry_for_length(length: int) -> Geometry:
+    """Geometry of a puzzle string with length cells."""
+    size = int(round(length**0.5))
+    if size * size != length:
+        raise ValueError(f"{length} cells do not form a square grid.")
+    return geometry_for_size(size)
+
+
+STANDARD = get_geometry(3, 3)
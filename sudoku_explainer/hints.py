@@ -0,0 +1,70 @@
+"""Targeted hints: the cheapest deduction for a chosen cell, row, column or box.
+
+find_hint() tries the solver's strategies in the policy's cost order, each
+limited to the units involving the region (Strategy.apply_in), and returns
+the first deduction that touches it. Strategies work on the board's own
+candidates and are undone through its trail, so the board is left as it
+was and no copy is made.
+"""
+
+from typing import Optional, Tuple, Union
+
+from .board import Board
+from .geometry import Region
+from .policy import OrderingPolicy
+from .solver import SudokuSolver
+from .step import Step
+
+
+def find_hint(
+    board: Board,
+    region: Region,
+    policy: Union[str, OrderingPolicy, None] = None,
+) -> Optional[Step]:
+    """The first deduction touching region, in policy order, or None.
+
+    The board is not changed; replay the step (see replay_steps) to apply it.
+    """
+    solver = SudokuSolver(board, policy=policy)
+    recording = board.trail is not None
+    try:
+        for strategy in solver.policy.order(solver.strategies):
+            mark = board.mark()
+            try:
+                step = strategy.apply_in(board, region)
+            finally:
+                board.rollback(mark)
+            if step is not None:
+                return step
+    finally:
+        if not recording:
+            board.stop_trail()
+    return None
+
+
+def parse_region(board: Board, scope: str, row: int, col: int) -> Region:
+    """The region of scope ("cell", "row", "col" or "box") around (row, col)."""
+    geometry = board.geometry
+    index: Tuple[int, ...]
+    if scope == "cell":
+        index = (row, col)
+    elif scope == "row":
+        index = (row,)
+    elif scope == "col":
+        index = (col,)
+    elif scope == "box":
+        if not (0 <= row < board.size and 0 <= col < board.size):
+            raise ValueError(f"Cell ({row}, {col}) is off the board.")
+        index = (geometry.box_of[row][col],)
+    else:
+        raise ValueError(f"Unknown hint scope {scope!r}; choose cell, row, col or box.")
+    return geometry.region(scope, *index)
+
+
+def describe_region(region: Region) -> str:
+    """The region as the explanations name it, e.g. "row 3" (1-based)."""
+    if region.kind == "cell":
+        row, col = region.index
+        return f"cell ({row + 1}, {col + 1})"
+    name = {"row": "row", "col": "column", "box": "box"}[region.kind]
+    return f"{name} {region.index[0] + 1}"
@@ -0,0 +1,148 @@
+"""Strategy ordering policies for SudokuSolver.
+
+A policy decides which strategy to try next. "human" always tries the
+strategies in their listed order, simplest first, so every step is the
+easiest deduction available. "fast" learns each strategy's cost per unit
+of progress (placements plus eliminations) across solves and, for each
+step, tries the strategies cheapest first (re-ranked every RERANK_EVERY
+steps). Neither policy batches; applying all of one strategy's deductions
+at once is the solver's sweep mode (see next_pass).
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from .board import Board
+from .step import Step
+from .strategies.base import Strategy
+
+
+class OrderingPolicy:
+    name = "human"
+
+    def order(self, strategies: Sequence[Strategy]) -> List[Strategy]:
+        """Strategies in the order they are tried."""
+        return list(strategies)
+
+    def next_step(self, board: Board, strategies: Sequence[Strategy]) -> Optional[Step]:
+        """Applies the first strategy that finds a step."""
+        for strategy in strategies:
+            result = strategy.apply(board)
+            if result:
+                return result
+        return None
+
+    def next_pass(self, board: Board, strategies: Sequence[Strategy]) -> List[Step]:
+        """Applies every deduction of the first strategy that finds any."""
+        for strategy in strategies:
+            steps = strategy.apply_all(board)
+            if steps:
+                return steps
+        return []
+
+
+class StrategyStats:
+    """Time spent and progress made per strategy class, across solves."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds: Dict[str, float] = {}
+        self.progress: Dict[str, float] = {}
+
+    def record(self, strategy: Strategy, seconds: float, steps: Iterable[Step]) -> None:
+        """Adds one attempt at strategy and the steps it made."""
+        key = type(strategy).__name__
+        gained = 0
+        for step in steps:
+            gained += len(step.eliminations) + (1 if step.placement else 0)
+        with self._lock:
+            self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+            self.progress[key] = self.progress.get(key, 0.0) + gained
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                key: {"seconds": seconds, "progress": self.progress.get(key, 0.0)}
+                for key, seconds in self.seconds.items()
+            }
+
+
+# Shared by every FastPolicy unless given its own, so the process keeps tuning
+FAST_STATS = StrategyStats()
+
+
+class FastPolicy(OrderingPolicy):
+    """Orders strategies by observed seconds per unit of progress.
+
+    Estimates are smoothed with a prior that reproduces the human order, so
+    an untrained policy behaves like "human" until it has data.
+    """
+
+    name = "fast"
+    PRIOR_SECONDS = 1e-5  # prior cost of the i-th listed strategy: (i + 1) * this
+    PRIOR_YIELD = 1.0
+
+    # Steps (or sweep passes) between re-ranking the strategies
+    RERANK_EVERY = 32
+
+    def __init__(self, stats: Optional[StrategyStats] = None):
+        self.stats = stats if stats is not None else FAST_STATS
+        self._ranked: Optional[List[Strategy]] = None
+        self._until_rerank = 0
+
+    def cost(self, strategy: Strategy, rank: int) -> float:
+        key = type(strategy).__name__
+        seconds = self.stats.seconds.get(key, 0.0) + (rank + 1) * self.PRIOR_SECONDS
+        return seconds / (self.stats.progress.get(key, 0.0) + self.PRIOR_YIELD)
+
+    def order(self, strategies: Sequence[Strategy]) -> List[Strategy]:
+        """Strategies from cheapest to dearest per unit of progress."""
+        if self._ranked is None or self._until_rerank <= 0:
+            ranked = sorted(
+                range(len(strategies)), key=lambda i: self.cost(strategies[i], i)
+            )
+            self._ranked = [strategies[i] for i in ranked]
+            self._until_rerank = self.RERANK_EVERY
+        self._until_rerank -= 1
+        return self._ranked
+
+    def next_step(self, board: Board, strategies: Sequence[Strategy]) -> Optional[Step]:
+        clock = time.perf_counter
+        for strategy in self.order(strategies):
+            start = clock()
+            result = strategy.apply(board)
+            self.stats.record(strategy, clock() - start, (result,) if result else ())
+            if result:
+                return result
+        return None
+
+    def next_pass(self, board: Board, strategies: Sequence[Strategy]) -> List[Step]:
+        clock = time.perf_counter
+        for strategy in self.order(strategies):
+            start = clock()
+            steps = strategy.apply_all(board)
+            self.stats.record(strategy, clock() - start, steps)
+            if steps:
+                return steps
+        return []
+
+
+POLICIES = {"human": OrderingPolicy, "fast": FastPolicy}
+DEFAULT_POLICY = "human"
+
+
+def get_policy(policy: Union[str, OrderingPolicy, None] = None) -> OrderingPolicy:
+    """Resolves a policy name to a new policy; instances pass through.
+
+    Every "fast" policy learns into FAST_STATS unless built with its own
+    StrategyStats.
+    """
+    if isinstance(policy, OrderingPolicy):
+        return policy
+    try:
+        return POLICIES[policy or DEFAULT_POLICY]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown ordering policy {policy!r}; choose from {', '.join(POLICIES)}."
+        ) from None
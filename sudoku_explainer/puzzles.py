@@ -1,30 +1,54 @@
 import random
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 # Base puzzles
 BASE_EASY = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
 BASE_MEDIUM = "000000010400000000020000000000050407008000300001090000300400200050100000000806000"
 BASE_HARD = "000000000000003085001020000000507000004000100090000000500000073002010000000040009"
 
-def get_puzzles():
+POOL_SIZE = 10
+POOL_SEED = 2024
+
+
+def get_puzzles() -> Dict[str, List[str]]:
+    """Returns the pregenerated puzzle pool (built once per process)."""
+    return _puzzle_pool()
+
+
+@lru_cache(maxsize=1)
+def _puzzle_pool() -> Dict[str, List[str]]:
+    return build_puzzle_pool(POOL_SIZE, seed=POOL_SEED)
+
+
+def build_puzzle_pool(count: int, seed: Optional[int] = None) -> Dict[str, List[str]]:
+    """Builds the difficulty -> puzzles mapping shown in the puzzle picker."""
+    rng = random.Random(seed)
     return {
-        "Easy": generate_variations(BASE_EASY, 10),
-        "Medium": generate_variations(BASE_MEDIUM, 10),
-        "Hard": generate_variations(BASE_HARD, 10)
+        "Easy": generate_variations(BASE_EASY, count, rng),
+        "Medium": generate_variations(BASE_MEDIUM, count, rng),
+        "Hard": generate_variations(BASE_HARD, count, rng),
     }
 
-def generate_variations(base_puzzle: str, count: int) -> list[str]:
+
+def generate_variations(
+    base_puzzle: str, count: int, rng: Optional[random.Random] = None
+) -> list[str]:
     """Generates variations of a puzzle by permuting symbols."""
-    variations = set()
-    variations.add(base_puzzle)
-    
+    rng = rng or random
+    variations = [base_puzzle]
+    seen = {base_puzzle}
+
     while len(variations) < count:
         # Simple symbol permutation mapping
         mapping = list("123456789")
-        random.shuffle(mapping)
+        rng.shuffle(mapping)
         map_dict = {str(i+1): mapping[i] for i in range(9)}
         map_dict['0'] = '0' # Keep empty cells empty
         
         new_puzzle = "".join(map_dict[c] for c in base_puzzle)
-        variations.add(new_puzzle)
+        if new_puzzle not in seen:
+            seen.add(new_puzzle)
+            variations.append(new_puzzle)
         
-    return list(variations)
+    return variations
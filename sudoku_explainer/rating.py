@@ -0,0 +1,70 @@
+from typing import Any, Dict, Iterable
+
+from .board import Board
+from .solver import SudokuSolver
+from .step import Step
+
+# Difficulty score of each strategy, by Step.strategy id prefix
+STRATEGY_SCORES = {
+    "naked_single": 1,
+    "hidden_single": 2,
+    "naked_pair": 3,
+    "naked_triple": 4,
+    "x_wing": 5,
+}
+# Score given to puzzles the logical strategies cannot finish
+SEARCH_SCORE = 10
+
+LEVELS = [
+    (1, "Easy"),
+    (2, "Medium"),
+    (4, "Hard"),
+    (5, "Expert"),
+    (SEARCH_SCORE, "Extreme"),
+]
+
+
+def rate_board(board: Board, sweep: bool = True) -> Dict[str, Any]:
+    """Rates a puzzle by the hardest strategy needed to solve it logically.
+
+    The board is solved in place as far as the strategies allow. sweep
+    solves a strategy pass at a time: same score, far fewer passes, though
+    "steps" then counts the deductions of the sweep rather than of a
+    step-by-step solve.
+    """
+    solver = SudokuSolver(board, sweep=sweep)
+    for _ in solver.solve():
+        pass
+    return rate_steps(solver.steps, board.is_solved())
+
+
+def rate_steps(steps: Iterable[Step], solved: bool) -> Dict[str, Any]:
+    """Rates an already recorded logical solve."""
+    score = 0
+    count = 0
+    for step in steps:
+        score = max(score, strategy_score(step.strategy))
+        count += 1
+    if not solved:
+        score = SEARCH_SCORE
+
+    return {
+        "score": score,
+        "level": level_for_score(score),
+        "steps": count,
+        "solved_logically": solved,
+    }
+
+
+def strategy_score(strategy: str) -> int:
+    for prefix, score in STRATEGY_SCORES.items():
+        if strategy.startswith(prefix):
+            return score
+    return SEARCH_SCORE
+
+
+def level_for_score(score: int) -> str:
+    for limit, level in LEVELS:
+        if score <= limit:
+            return level
+    return LEVELS[-1][1]
@@ -0,0 +1,44 @@
+"""Registry of complete search backends.
+
+A backend finishes what the logical strategies leave. solve(board, budget)
+fills board.grid in place and returns whether a solution exists;
+count(board, limit, budget) counts solutions up to limit. Both raise
+BudgetExceeded when the budget runs out, leaving the grid as it was.
+"""
+
+from typing import Callable, Dict, NamedTuple, Optional
+
+from .board import Board
+from .budget import Budget
+from .dlx import count_solutions_dlx, solve_dlx
+from .utils import count_solutions, solve_sudoku_backtracking
+
+
+class Backend(NamedTuple):
+    solve: Callable[[Board, Optional[Budget]], bool]
+    count: Callable[[Board, int, Optional[Budget]], int]
+
+
+BACKENDS: Dict[str, Backend] = {
+    "backtracking": Backend(solve_sudoku_backtracking, count_solutions),
+    "dlx": Backend(solve_dlx, count_solutions_dlx),
+}
+DEFAULT_BACKEND = "backtracking"
+
+
+def register_backend(
+    name: str,
+    solve: Callable[[Board, Optional[Budget]], bool],
+    count: Callable[[Board, int, Optional[Budget]], int],
+) -> None:
+    BACKENDS[name] = Backend(solve, count)
+
+
+def get_backend(name: Optional[str] = None) -> Backend:
+    """The named backend (DEFAULT_BACKEND if None)."""
+    try:
+        return BACKENDS[name or DEFAULT_BACKEND]
+    except KeyError:
+        raise ValueError(
+            f"Unknown search backend {name!r}; choose from {', '.join(BACKENDS)}."
+        ) from None
@@ -1,14 +1,34 @@
-from typing import List, Dict, Any, Generator
+from typing import List, Generator, NamedTuple, Optional, Union
 from .board import Board
+from .budget import Budget, BudgetExceeded
+from .policy import OrderingPolicy, get_policy
+from .step import Step
 from .strategies.base import Strategy
 from .strategies.basics import NakedSingle, HiddenSingle
 from .strategies.pairs import NakedPair
 from .strategies.x_wing import XWing
 from .strategies.triples import NakedTriple
+from .search import get_backend
 
 class SudokuSolver:
-    def __init__(self, board: Board):
+    def __init__(
+        self,
+        board: Board,
+        budget: Optional[Budget] = None,
+        policy: Union[str, OrderingPolicy, None] = None,
+        sweep: bool = False,
+    ):
         self.board = board
+        self.budget = budget
+        # Which strategy to try next: "human" (listed order) or "fast"
+        self.policy = get_policy(policy)
+        # Budget reason ("time", "nodes", "cancelled") if solve() stopped early
+        self.stopped: Optional[str] = None
+        # Apply every deduction a strategy finds per pass instead of one step
+        # per scan. Same outcome, far fewer passes; steps are no longer each
+        # the easiest available, so keep it off for step-by-step explanations.
+        self.sweep = sweep
+        self.passes = 0
         self.strategies: List[Strategy] = [
             NakedSingle(),
             HiddenSingle(),
@@ -17,26 +37,89 @@ class SudokuSolver:
             XWing(),
             # Add more strategies here as they are implemented
         ]
-        self.steps: List[Dict[str, Any]] = []
+        self.steps: List[Step] = []
 
-    def solve(self) -> Generator[Dict[str, Any], None, bool]:
+    def solve(self) -> Generator[Step, None, bool]:
         """
-        Yields each step taken to solve the puzzle.
-        Returns True if solved, False if stuck.
+        Yields each step taken to solve the puzzle (a pass of them at a time
+        in sweep mode; self.passes counts the passes).
+        Returns True if solved, False if stuck or out of budget
+        (self.stopped then says why).
         """
         while not self.board.is_solved():
-            step = self.solve_step()
-            if step:
-                self.steps.append(step)
-                yield step
+            if self.budget is not None:
+                try:
+                    self.budget.charge()
+                except BudgetExceeded as e:
+                    self.stopped = e.reason
+                    return False
+            self.passes += 1
+            if self.sweep:
+                steps = self.solve_pass()
             else:
+                step = self.solve_step()
+                steps = [step] if step else []
+            if not steps:
                 return False
+            self.steps.extend(steps)
+            yield from steps
         return True
 
-    def solve_step(self) -> Dict[str, Any]:
-        """Attempts to apply one strategy."""
-        for strategy in self.strategies:
-            result = strategy.apply(self.board)
-            if result:
-                return result
-        return None
+    def solve_step(self) -> Optional[Step]:
+        """Attempts to apply one strategy, chosen by the ordering policy."""
+        return self.policy.next_step(self.board, self.strategies)
+
+    def solve_pass(self) -> List[Step]:
+        """Applies every deduction of one strategy, chosen by the ordering policy."""
+        return self.policy.next_pass(self.board, self.strategies)
+
+
+def replay_steps(board: Board, steps: List[Step]) -> None:
+    """Re-applies recorded steps (e.g. from a stored trace) to a board."""
+    for step in steps:
+        if step.placement:
+            board.set_value(*step.placement)
+        for r, c, v in step.eliminations:
+            board.remove_candidate(r, c, v)
+
+
+class SolveResult(NamedTuple):
+    board: Board  # solved board, or the furthest logical progress
+    steps: List[Step]
+    solved: bool
+    reason: str  # "solved", "stuck", "unsolvable" or a budget reason
+
+
+def solve_board(
+    board: Board,
+    budget: Optional[Budget] = None,
+    search: bool = True,
+    backend: Optional[str] = None,
+    policy: Union[str, OrderingPolicy, None] = None,
+    sweep: bool = False,
+) -> SolveResult:
+    """Solves logically, then with a search backend if search is set, within budget.
+
+    backend names an entry of search.BACKENDS (backtracking by default).
+    sweep applies deductions a strategy pass at a time (see SudokuSolver).
+
+    The board is modified in place. When the budget runs out the result
+    holds the steps found so far and the board as logic left it.
+    """
+    solver = SudokuSolver(board, budget, policy, sweep)
+    for _ in solver.solve():
+        pass
+    if solver.stopped:
+        return SolveResult(board, solver.steps, False, solver.stopped)
+    if board.is_solved():
+        return SolveResult(board, solver.steps, True, "solved")
+    if not search:
+        return SolveResult(board, solver.steps, False, "stuck")
+    if not board.is_valid():
+        return SolveResult(board, solver.steps, False, "unsolvable")
+
+    try:
+        found = get_backend(backend).solve(board, budget)
+    except BudgetExceeded as e:
+        return SolveResult(board, solver.steps, False, e.reason)
+    return SolveResult(board, solver.steps, found, "solved" if found else "unsolvable")
@@ -0,0 +1,182 @@
+from typing import Any, Dict, Optional, Tuple
+
+from .geometry import STANDARD, Geometry
+
+Cell = Tuple[int, int]
+Elimination = Tuple[int, int, int]
+
+# Per-locale (name, explanation template) for each strategy id. Templates are
+# formatted with the fields from Step._fields(); coordinates are 1-based.
+TEMPLATES: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "en": {
+        "naked_single": (
+            "Naked Single",
+            "Cell ({row}, {col}) has only one possible candidate: {value}",
+        ),
+        "hidden_single_row": (
+            "Hidden Single (Row)",
+            "In row {row}, the value {value} can only go in cell ({row}, {col})",
+        ),
+        "hidden_single_col": (
+            "Hidden Single (Column)",
+            "In column {col}, the value {value} can only go in cell ({row}, {col})",
+        ),
+        "hidden_single_box": (
+            "Hidden Single (Box)",
+            "In the box starting at ({box_row}, {box_col}), the value {value} "
+            "can only go in cell ({row}, {col})",
+        ),
+        "naked_pair": (
+            "Naked Pair",
+            "In {unit}, cells {cells} form a Naked Pair with values {digits}. "
+            "We can remove these values from other cells in the same {unit_kind}.",
+        ),
+        "naked_triple": (
+            "Naked Triple",
+            "In {unit}, cells {cells} form a Naked Triple with digits {digits}. "
+            "Removed those digits from other cells in the unit.",
+        ),
+        "x_wing_rows": (
+            "X-Wing (Rows)",
+            "Digit {digits} forms an X-Wing on rows {rows} in columns {cols}. "
+            "Remove {digits} from other cells in those columns.",
+        ),
+        "x_wing_cols": (
+            "X-Wing (Columns)",
+            "Digit {digits} forms an X-Wing on columns {cols} in rows {rows}. "
+            "Remove {digits} from other cells in those rows.",
+        ),
+    },
+}
+
+UNIT_LABELS: Dict[str, Dict[str, str]] = {
+    "en": {
+        "row": "Row {n}",
+        "col": "Column {n}",
+        "box": "Box starting at ({r}, {c})",
+        "and": "and",
+    },
+}
+
+DEFAULT_LOCALE = "en"
+
+
+def register_locale(
+    locale: str,
+    templates: Dict[str, Tuple[str, str]],
+    unit_labels: Optional[Dict[str, str]] = None,
+) -> None:
+    """Adds translated templates. Missing strategies fall back to English."""
+    TEMPLATES[locale] = templates
+    if unit_labels is not None:
+        UNIT_LABELS[locale] = unit_labels
+
+
+class Step:
+    """One deduction made by a strategy.
+
+    Only compact tuples are stored; the explanation text is rendered on
+    demand, so solving in bulk never formats strings nobody reads.
+    """
+
+    __slots__ = (
+        "strategy",
+        "cells",
+        "digits",
+        "eliminations",
+        "placement",
+        "unit",
+        "geometry",
+    )
+
+    def __init__(
+        self,
+        strategy: str,
+        cells: Tuple[Cell, ...] = (),
+        digits: Tuple[int, ...] = (),
+        eliminations: Tuple[Elimination, ...] = (),
+        placement: Optional[Tuple[int, int, int]] = None,
+        unit: Optional[Tuple[str, int]] = None,
+        geometry: Optional[Geometry] = None,
+    ):
+        self.strategy = strategy
+        self.cells = cells
+        self.digits = digits
+        self.eliminations = eliminations
+        self.placement = placement  # (row, col, value) for placing steps
+        self.unit = unit  # ("row" | "col" | "box", index) the step lives in
+        self.geometry = geometry  # board shape, for box labels; None = 9x9
+
+    @property
+    def type(self) -> str:
+        return TEMPLATES[DEFAULT_LOCALE][self.strategy][0]
+
+    @property
+    def explanation(self) -> str:
+        return self.explain()
+
+    def title(self, locale: str = DEFAULT_LOCALE) -> str:
+        return _templates(locale, self.strategy)[0]
+
+    def explain(self, locale: str = DEFAULT_LOCALE) -> str:
+        """Renders the human-readable explanation."""
+        return _templates(locale, self.strategy)[1].format(**self._fields(locale))
+
+    def _fields(self, locale: str) -> Dict[str, Any]:
+        labels = UNIT_LABELS.get(locale, UNIT_LABELS[DEFAULT_LOCALE])
+        cells = [f"({r + 1}, {c + 1})" for r, c in self.cells]
+        fields: Dict[str, Any] = {
+            "digits": _join(self.digits, labels["and"]),
+            "cells": _join(cells, labels["and"]),
+            "rows": _join(sorted({r + 1 for r, _ in self.cells}), labels["and"]),
+            "cols": _join(sorted({c + 1 for _, c in self.cells}), labels["and"]),
+        }
+        if self.placement:
+            r, c, v = self.placement
+            fields.update(row=r + 1, col=c + 1, value=v)
+        if self.unit:
+            kind, index = self.unit
+            box_row, box_col = (self.geometry or STANDARD).box_origin(index)
+            box_row, box_col = box_row + 1, box_col + 1
+            fields.update(
+                unit=labels[kind].format(n=index + 1, r=box_row, c=box_col),
+                unit_kind=labels[kind].split(" ")[0],
+                box_row=box_row,
+                box_col=box_col,
+            )
+        return fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Legacy dict form (the pre-Step strategy return value)."""
+        result: Dict[str, Any] = {"type": self.type}
+        if self.placement:
+            result["row"], result["col"], result["value"] = self.placement
+        if self.strategy == "naked_triple":
+            result["cells"] = self.cells
+            result["digits"] = self.digits
+        elif self.strategy.startswith("x_wing"):
+            result["digit"] = self.digits[0]
+            result["rows"] = tuple(sorted({r for r, _ in self.cells}))
+            result["cols"] = tuple(sorted({c for _, c in self.cells}))
+        if self.eliminations:
+            result["candidates_removed"] = list(self.eliminations)
+        result["explanation"] = self.explanation
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"Step({self.strategy!r}, cells={self.cells!r}, digits={self.digits!r}, "
+            f"eliminations={self.eliminations!r}, placement={self.placement!r})"
+        )
+
+
+def _templates(locale: str, strategy: str) -> Tuple[str, str]:
+    templates = TEMPLATES.get(locale, {})
+    return templates.get(strategy) or TEMPLATES[DEFAULT_LOCALE][strategy]
+
+
+def _join(items, conjunction: str) -> str:
+    items = [str(x) for x in items]
+    if len(items) <= 2:
+        return f" {conjunction} ".join(items)
+    return ", ".join(items[:-1]) + f" {conjunction} " + items[-1]
@@ -0,0 +1,340 @@
+"""Persistent solved-puzzle store backed by SQLite.
+
+Puzzles are keyed by their canonical form: digits relabelled in order of
+first appearance, so every symbol permutation of a puzzle (such as the
+variations in puzzles.generate_variations) shares one row. Each row holds
+the solution, the solution count (0, 1, or 2 meaning "several"), the rating
+and the zlib-compressed logical step trace (found with the default "human"
+policy), all in canonical labels.
+Bulk-imported rows hold only a checked solution; their count is UNCOUNTED
+until a lookup that needs the full entry analyzes the puzzle.
+
+    python -m sudoku_explainer.store import puzzles.csv --db solved.sqlite3
+"""
+
+import argparse
+import json
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .budget import Budget, BudgetExceeded
+from .rating import level_for_score, rate_steps
+from .search import get_backend
+from .solver import SudokuSolver
+from .step import Step
+from .utils import board_to_string, normalize_puzzle, parse_puzzle
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    key TEXT PRIMARY KEY,
+    solution TEXT,
+    solutions INTEGER NOT NULL,
+    score INTEGER,
+    trace BLOB
+) WITHOUT ROWID
+"""
+
+Row = Tuple[str, Optional[str], int, Optional[int], Optional[bytes]]
+
+_DIGITS = frozenset("123456789")
+
+# Solution count of bulk-imported rows, which were never searched
+UNCOUNTED = -1
+
+
+class Entry(NamedTuple):
+    solution: Optional[str]
+    solutions: int  # 0 = none, 1 = unique, 2 = more than one, or UNCOUNTED
+    score: Optional[int]
+    level: Optional[str]
+    steps: Optional[List[Step]]
+
+    @property
+    def unique(self) -> bool:
+        return self.solutions == 1
+
+
+def canonicalize(puzzle_str: str) -> Tuple[str, Dict[str, str]]:
+    """Relabels digits by first appearance.
+
+    Returns (canonical puzzle, mapping original digit -> canonical digit).
+    Digits absent from the puzzle are mapped to the leftover labels. Only
+    "1"-"9" are relabelled; pass puzzles through normalize_puzzle first so
+    blanks are "0".
+    """
+    mapping: Dict[str, str] = {}
+    for ch in puzzle_str:
+        if ch in _DIGITS and ch not in mapping:
+            mapping[ch] = str(len(mapping) + 1)
+    free = (str(d) for d in range(len(mapping) + 1, 10))
+    for d in "123456789":
+        if d not in mapping:
+            mapping[d] = next(free)
+    mapping["0"] = "0"
+    return puzzle_str.translate(str.maketrans(mapping)), mapping
+
+
+def encode_trace(steps: Iterable[Step], mapping: Dict[str, str]) -> bytes:
+    """Compresses steps, relabelling their digits through mapping."""
+    m = {int(k): int(v) for k, v in mapping.items()}
+    rows = []
+    for s in steps:
+        rows.append(
+            [
+                s.strategy,
+                s.cells,
+                [m[d] for d in s.digits],
+                [(r, c, m[v]) for r, c, v in s.eliminations],
+                (s.placement[0], s.placement[1], m[s.placement[2]])
+                if s.placement
+                else None,
+                s.unit,
+            ]
+        )
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode("ascii"))
+
+
+def decode_trace(blob: bytes, mapping: Dict[str, str]) -> List[Step]:
+    m = {int(k): int(v) for k, v in mapping.items()}
+    steps = []
+    for strategy, cells, digits, elims, placement, unit in json.loads(
+        zlib.decompress(blob)
+    ):
+        steps.append(
+            Step(
+                strategy,
+                cells=tuple(tuple(c) for c in cells),
+                digits=tuple(m[d] for d in digits),
+                eliminations=tuple((r, c, m[v]) for r, c, v in elims),
+                placement=(placement[0], placement[1], m[placement[2]])
+                if placement
+                else None,
+                unit=tuple(unit) if unit else None,
+            )
+        )
+    return steps
+
+
+def analyze(
+    puzzle_str: str, budget: Optional[Budget] = None, backend: Optional[str] = None
+) -> Tuple[Optional[str], int, Optional[int], List[Step]]:
+    """Solves a puzzle from scratch with the named search backend.
+
+    Returns (solution, solution count, rating score, logical steps).
+    Raises BudgetExceeded if budget runs out before the analysis is complete.
+    """
+    search = get_backend(backend)
+    board = parse_puzzle(puzzle_str)
+    solutions = search.count(board, 2, budget)
+    if solutions == 0:
+        return None, 0, None, []
+
+    solver = SudokuSolver(board, budget)
+    for _ in solver.solve():
+        pass
+    if solver.stopped:
+        raise BudgetExceeded(solver.stopped)
+    score = rate_steps(solver.steps, board.is_solved())["score"]
+    search.solve(board, budget)
+    return board_to_string(board), solutions, score, solver.steps
+
+
+class SolutionStore:
+    """SQLite-backed map from canonical puzzle to its solve results.
+
+    Writes are buffered and flushed in batches; reads see pending writes.
+    Safe to share between threads; several processes may open one file.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Row] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def get(self, puzzle_str: str) -> Optional[Entry]:
+        key, mapping = canonicalize(normalize_puzzle(puzzle_str))
+        with self._lock:
+            row = self._pending.get(key)
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT key, solution, solutions, score, trace "
+                    "FROM puzzles WHERE key = ?",
+                    (key,),
+                ).fetchone()
+        if row is None:
+            return None
+
+        inverse = {v: k for k, v in mapping.items()}
+        _, solution, solutions, score, trace = row
+        return Entry(
+            solution=solution.translate(str.maketrans(inverse)) if solution else None,
+            solutions=solutions,
+            score=score,
+            level=level_for_score(score) if score is not None else None,
+            steps=decode_trace(trace, inverse) if trace else None,
+        )
+
+    def put(
+        self,
+        puzzle_str: str,
+        solution: Optional[str],
+        solutions: int,
+        score: Optional[int] = None,
+        steps: Optional[Iterable[Step]] = None,
+    ) -> None:
+        key, mapping = canonicalize(normalize_puzzle(puzzle_str))
+        row = (
+            key,
+            solution.translate(str.maketrans(mapping)) if solution else None,
+            solutions,
+            score,
+            encode_trace(steps, mapping) if steps is not None else None,
+        )
+        with self._lock:
+            self._pending[key] = row
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def lookup_or_solve(
+        self,
+        puzzle_str: str,
+        budget: Optional[Budget] = None,
+        backend: Optional[str] = None,
+        complete: bool = True,
+    ) -> Entry:
+        """Read-through: returns the stored entry, solving and storing on a miss.
+
+        A bulk-imported entry counts as a miss unless complete is False, for
+        callers that only need the solution. Misses are solved within
+        budget; nothing is stored if it runs out.
+        """
+        puzzle_str = normalize_puzzle(puzzle_str)
+        entry = self.get(puzzle_str)
+        if entry is not None and (entry.solutions != UNCOUNTED or not complete):
+            return entry
+        solution, solutions, score, steps = analyze(puzzle_str, budget, backend)
+        self.put(puzzle_str, solution, solutions, score, steps)
+        return Entry(
+            solution,
+            solutions,
+            score,
+            level_for_score(score) if score is not None else None,
+            steps,
+        )
+
+    def bulk_import(
+        self, pairs: Iterable[Tuple[str, str]], chunk: int = 5000
+    ) -> Tuple[int, int]:
+        """Preloads (puzzle, solution) pairs without searching.
+
+        A pair is kept only if the solution is a complete, valid grid that
+        agrees with every clue; its solution count is stored as UNCOUNTED
+        (see lookup_or_solve). Existing rows win. Rows are committed every
+        chunk pairs, so lookups from other threads are not held up for the
+        whole import. Returns (rows added, pairs rejected).
+        """
+        stored = rejected = 0
+        sql = (
+            "INSERT OR IGNORE INTO puzzles (key, solution, solutions) "
+            f"VALUES (?, ?, {UNCOUNTED})"
+        )
+        self.flush()
+        batch = []
+        for puzzle, solution in pairs:
+            try:
+                puzzle = normalize_puzzle(puzzle)
+                if not _solves(puzzle, solution):
+                    raise ValueError(solution)
+            except ValueError:
+                rejected += 1
+                continue
+            key, mapping = canonicalize(puzzle)
+            batch.append((key, solution.translate(str.maketrans(mapping))))
+            if len(batch) >= chunk:
+                stored += self._insert(sql, batch)
+                batch = []
+        stored += self._insert(sql, batch)
+        return stored, rejected
+
+    def _insert(self, sql: str, rows: List[Tuple[str, str]]) -> int:
+        with self._lock:
+            inserted = self._conn.executemany(sql, rows).rowcount
+            self._conn.commit()
+        return inserted
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO puzzles (key, solution, solutions, score, trace) "
+            "VALUES (?, ?, ?, ?, ?)",
+            list(self._pending.values()),
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+    def __len__(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "SolutionStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _solves(puzzle_str: str, solution: str) -> bool:
+    """True if solution is a complete valid grid that keeps the puzzle's clues."""
+    if len(solution) != 81 or not _DIGITS.issuperset(solution):
+        return False
+    pairs = zip(puzzle_str, solution)
+    if any(clue != "0" and clue != answer for clue, answer in pairs):
+        return False
+    return parse_puzzle(solution).is_solved()
+
+
+def _read_pairs(path: str) -> Iterable[Tuple[str, str]]:
+    """Yields (puzzle, solution) from 'puzzle,solution' or whitespace lines."""
+    with open(path) as f:
+        for line in f:
+            parts = line.replace(",", " ").split()
+            if len(parts) >= 2 and len(parts[0]) == 81 and len(parts[1]) == 81:
+                yield parts[0].replace(".", "0"), parts[1]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Solved-puzzle store tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="Bulk-load 'puzzle,solution' lines")
+    imp.add_argument("file")
+    imp.add_argument("--db", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        with SolutionStore(args.db) as store:
+            stored, rejected = store.bulk_import(_read_pairs(args.file))
+        print(f"Imported {stored} puzzles into {args.db}")
+        if rejected:
+            print(f"Skipped {rejected} lines whose solution does not solve the puzzle")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Optional
 from ..board import Board
+from ..geometry import Region
+from ..step import Step
 
 class Strategy(ABC):
     @abstractmethod
-    def apply(self, board: Board) -> Optional[Dict[str, Any]]:
+    def apply(self, board: Board) -> Optional[Step]:
         """
         Applies the strategy to the board.
-        Returns a dictionary with details of the move if successful, else None.
-        The dictionary should contain:
-        - 'type': Strategy name
-        - 'row': Row index (if applicable)
-        - 'col': Column index (if applicable)
-        - 'value': Value placed (if applicable)
-        - 'candidates_removed': List of (row, col, value) tuples (if applicable)
-        - 'explanation': Human-readable string
+        Returns a Step describing the move if successful, else None.
+        The Step records compact data only:
+        - 'strategy': Strategy id (see step.TEMPLATES)
+        - 'placement': (row, col, value) placed (if applicable)
+        - 'eliminations': (row, col, value) candidates removed (if applicable)
+        - 'cells' / 'digits' / 'unit': the pattern that justified the move
+        Its explanation is rendered lazily; use Step.to_dict() for the
+        legacy dictionary form.
         """
         pass
+
+    def apply_all(self, board: Board) -> List[Step]:
+        """
+        Applies every deduction the strategy finds in one pass over the board.
+        Each Step is valid on the board as left by the steps before it, so
+        replaying them in order reproduces the pass. Subclasses override this
+        with a single scan; by default apply() is repeated until it fails.
+        """
+        steps = []
+        while (step := self.apply(board)) is not None:
+            steps.append(step)
+        return steps
+
+    def apply_in(self, board: Board, region: Region) -> Optional[Step]:
+        """
+        Like apply(), but only finds deductions that touch region (see
+        Region.touches), looking at region.units rather than the whole board.
+        Subclasses override this with a targeted search; by default apply()
+        runs on the whole board and its step counts only if it touches region
+        (the board may be changed either way).
+        """
+        step = self.apply(board)
+        return step if step is not None and region.touches(step) else None
@@ -1,94 +1,106 @@
-from typing import Optional, Dict, Any
+from typing import Dict, List, Optional, Tuple
 from ..board import Board
+from ..geometry import Region
+from ..step import Step
 from .base import Strategy
 
+Cell = Tuple[int, int]
+
 
 class NakedSingle(Strategy):
-    def apply(self, board: Board) -> Optional[Dict[str, Any]]:
-        for r in range(9):
-            for c in range(9):
+    def apply(self, board: Board) -> Optional[Step]:
+        for r in range(board.size):
+            for c in range(board.size):
                 if board.get_value(r, c) == 0:
                     candidates = board.get_candidates(r, c)
                     if len(candidates) == 1:
                         val = list(candidates)[0]
                         board.set_value(r, c, val)
-                        return {
-                            "type": "Naked Single",
-                            "row": r,
-                            "col": c,
-                            "value": val,
-                            "explanation": f"Cell ({r + 1}, {c + 1}) has only one possible candidate: {val}",
-                        }
+                        return Step("naked_single", placement=(r, c, val))
         return None
 
+    def apply_all(self, board: Board) -> List[Step]:
+        # One row-major scan; singles a placement creates behind the scan
+        # are left for the next pass
+        steps = []
+        candidates = board.candidates
+        for r in range(board.size):
+            for c in range(board.size):
+                if board.grid[r][c] == 0 and len(candidates[r][c]) == 1:
+                    (val,) = candidates[r][c]
+                    board.set_value(r, c, val)
+                    steps.append(Step("naked_single", placement=(r, c, val)))
+        return steps
+
+    def apply_in(self, board: Board, region: Region) -> Optional[Step]:
+        for r, c in sorted(region.cells):
+            if board.grid[r][c] == 0 and len(board.candidates[r][c]) == 1:
+                (val,) = board.candidates[r][c]
+                board.set_value(r, c, val)
+                return Step("naked_single", placement=(r, c, val))
+        return None
 
-class HiddenSingle(Strategy):
-    def apply(self, board: Board) -> Optional[Dict[str, Any]]:
-        # Check rows
-        for r in range(9):
-            counts = {}
-            for c in range(9):
-                if board.get_value(r, c) == 0:
-                    for val in board.get_candidates(r, c):
-                        if val not in counts:
-                            counts[val] = []
-                        counts[val].append(c)
 
-            for val, cols in counts.items():
-                if len(cols) == 1:
-                    c = cols[0]
+class HiddenSingle(Strategy):
+    def apply(self, board: Board) -> Optional[Step]:
+        # Rows, then columns, then boxes
+        for kind, index, cells in board.geometry.units:
+            for val, places in _places(board, cells).items():
+                if len(places) == 1:
+                    r, c = places[0]
                     board.set_value(r, c, val)
-                    return {
-                        "type": "Hidden Single (Row)",
-                        "row": r,
-                        "col": c,
-                        "value": val,
-                        "explanation": f"In row {r + 1}, the value {val} can only go in cell ({r + 1}, {c + 1})",
-                    }
+                    return Step(
+                        f"hidden_single_{kind}",
+                        placement=(r, c, val),
+                        unit=(kind, index),
+                        geometry=board.geometry,
+                    )
+        return None
 
-        # Check cols
-        for c in range(9):
-            counts = {}
-            for r in range(9):
-                if board.get_value(r, c) == 0:
-                    for val in board.get_candidates(r, c):
-                        if val not in counts:
-                            counts[val] = []
-                        counts[val].append(r)
+    def apply_all(self, board: Board) -> List[Step]:
+        steps = []
+        grid, candidates = board.grid, board.candidates
+        for kind, index, cells in board.geometry.units:
+            for val, found in _places(board, cells).items():
+                if len(found) != 1:
+                    continue
+                r, c = found[0]
+                # An earlier placement in this pass may have filled the cell
+                # or, on a broken grid, removed the digit from it
+                if grid[r][c] or val not in candidates[r][c]:
+                    continue
+                board.set_value(r, c, val)
+                steps.append(
+                    Step(
+                        f"hidden_single_{kind}",
+                        placement=(r, c, val),
+                        unit=(kind, index),
+                        geometry=board.geometry,
+                    )
+                )
+        return steps
 
-            for val, rows in counts.items():
-                if len(rows) == 1:
-                    r = rows[0]
+    def apply_in(self, board: Board, region: Region) -> Optional[Step]:
+        for kind, index, cells in region.units:
+            for val, found in _places(board, cells).items():
+                if len(found) == 1 and found[0] in region.cells:
+                    r, c = found[0]
                     board.set_value(r, c, val)
-                    return {
-                        "type": "Hidden Single (Column)",
-                        "row": r,
-                        "col": c,
-                        "value": val,
-                        "explanation": f"In column {c + 1}, the value {val} can only go in cell ({r + 1}, {c + 1})",
-                    }
+                    return Step(
+                        f"hidden_single_{kind}",
+                        placement=(r, c, val),
+                        unit=(kind, index),
+                        geometry=board.geometry,
+                    )
+        return None
 
-        # Check boxes
-        for br in range(0, 9, 3):
-            for bc in range(0, 9, 3):
-                counts = {}
-                for r in range(br, br + 3):
-                    for c in range(bc, bc + 3):
-                        if board.get_value(r, c) == 0:
-                            for val in board.get_candidates(r, c):
-                                if val not in counts:
-                                    counts[val] = []
-                                counts[val].append((r, c))
 
-                for val, cells in counts.items():
-                    if len(cells) == 1:
-                        r, c = cells[0]
-                        board.set_value(r, c, val)
-                        return {
-                            "type": "Hidden Single (Box)",
-                            "row": r,
-                            "col": c,
-                            "value": val,
-                            "explanation": f"In the box starting at ({br + 1}, {bc + 1}), the value {val} can only go in cell ({r + 1}, {c + 1})",
-                        }
-        return None
+def _places(board: Board, cells: List[Cell]) -> Dict[int, List[Cell]]:
+    """Empty cells of a unit where each candidate digit can go."""
+    grid, candidates = board.grid, board.candidates
+    places: Dict[int, List[Cell]] = {}
+    for r, c in cells:
+        if grid[r][c] == 0:
+            for val in candidates[r][c]:
+                places.setdefault(val, []).append((r, c))
+    return places
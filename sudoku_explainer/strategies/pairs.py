@@ -1,31 +1,39 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import AbstractSet, Optional, List, Tuple
 from ..board import Board
+from ..geometry import Region
+from ..step import Step
 from .base import Strategy
 
 class NakedPair(Strategy):
-    def apply(self, board: Board) -> Optional[Dict[str, Any]]:
-        # Check Rows
-        for r in range(9):
-            if res := self._check_unit(board, [(r, c) for c in range(9)], "Row", r + 1):
+    def apply(self, board: Board) -> Optional[Step]:
+        # Rows, then columns, then boxes
+        for kind, index, cells in board.geometry.units:
+            if res := self._check_unit(board, cells, (kind, index)):
                 return res
-        
-        # Check Cols
-        for c in range(9):
-            if res := self._check_unit(board, [(r, c) for r in range(9)], "Column", c + 1):
+        return None
+
+    def apply_all(self, board: Board) -> List[Step]:
+        steps = []
+        for kind, index, cells in board.geometry.units:
+            while res := self._check_unit(board, cells, (kind, index)):
+                steps.append(res)
+        return steps
+
+    def apply_in(self, board: Board, region: Region) -> Optional[Step]:
+        for kind, index, cells in region.units:
+            if res := self._check_unit(board, cells, (kind, index), region.cells):
                 return res
-                
-        # Check Boxes
-        for br in range(0, 9, 3):
-            for bc in range(0, 9, 3):
-                cells = []
-                for r in range(br, br + 3):
-                    for c in range(bc, bc + 3):
-                        cells.append((r, c))
-                if res := self._check_unit(board, cells, "Box", f"starting at ({br+1}, {bc+1})"):
-                    return res
         return None
 
-    def _check_unit(self, board: Board, cells: List[Tuple[int, int]], unit_type: str, unit_id: Any) -> Optional[Dict[str, Any]]:
+    def _check_unit(
+        self,
+        board: Board,
+        cells: List[Tuple[int, int]],
+        unit: Tuple[str, int],
+        focus: Optional[AbstractSet[Tuple[int, int]]] = None,
+    ) -> Optional[Step]:
+        """Applies the first Naked Pair in the unit that eliminates a candidate
+        (from a cell in focus, if given)."""
         # Find cells with exactly 2 candidates
         candidates_map = {}
         for r, c in cells:
@@ -47,18 +55,25 @@ class NakedPair(Strategy):
                 eliminated = []
                 for r, c in cells:
                     if (r, c) not in pair_cells and board.get_value(r, c) == 0:
-                        current_cands = board.get_candidates(r, c)
+                        current_cands = board.candidates[r][c]
                         if val1 in current_cands:
-                            board.remove_candidate(r, c, val1)
                             eliminated.append((r, c, val1))
                         if val2 in current_cands:
-                            board.remove_candidate(r, c, val2)
                             eliminated.append((r, c, val2))
-                
+                if focus is not None and not any(
+                    (r, c) in focus for r, c, _ in eliminated
+                ):
+                    continue
+
                 if eliminated:
-                    return {
-                        'type': 'Naked Pair',
-                        'candidates_removed': eliminated,
-                        'explanation': f"In {unit_type} {unit_id}, cells {pairs[0]} and {pairs[1]} form a Naked Pair with values {val1} and {val2}. We can remove these values from other cells in the same {unit_type}."
-                    }
+                    for r, c, v in eliminated:
+                        board.remove_candidate(r, c, v)
+                    return Step(
+                        "naked_pair",
+                        cells=tuple(pairs),
+                        digits=cands,
+                        eliminations=tuple(eliminated),
+                        unit=unit,
+                        geometry=board.geometry,
+                    )
         return None
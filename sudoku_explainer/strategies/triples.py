@@ -1,5 +1,7 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import AbstractSet, Optional, List, Tuple
 from ..board import Board
+from ..geometry import Region
+from ..step import Step
 from .base import Strategy
 
 
@@ -10,36 +12,41 @@ class NakedTriple(Strategy):
     three distinct digits; those digits can be removed from other cells in the unit.
     """
 
-    def apply(self, board: Board) -> Optional[Dict[str, Any]]:
-        # Rows
-        for r in range(9):
-            cells = [(r, c) for c in range(9) if board.get_value(r, c) == 0]
-            res = self._find_triples_and_eliminate(board, cells, f"Row {r+1}")
+    def apply(self, board: Board) -> Optional[Step]:
+        # Rows, then columns, then boxes
+        for kind, index, unit_cells in board.geometry.units:
+            cells = [(r, c) for r, c in unit_cells if board.get_value(r, c) == 0]
+            res = self._find_triples_and_eliminate(board, cells, (kind, index))
             if res:
                 return res
 
-        # Columns
-        for c in range(9):
-            cells = [(r, c) for r in range(9) if board.get_value(r, c) == 0]
-            res = self._find_triples_and_eliminate(board, cells, f"Column {c+1}")
-            if res:
-                return res
+        return None
 
-        # Boxes
-        for br in range(0, 9, 3):
-            for bc in range(0, 9, 3):
-                cells = []
-                for r in range(br, br + 3):
-                    for c in range(bc, bc + 3):
-                        if board.get_value(r, c) == 0:
-                            cells.append((r, c))
-                res = self._find_triples_and_eliminate(board, cells, f"Box starting at ({br+1},{bc+1})")
-                if res:
-                    return res
+    def apply_all(self, board: Board) -> List[Step]:
+        steps = []
+        for kind, index, unit_cells in board.geometry.units:
+            cells = [(r, c) for r, c in unit_cells if board.get_value(r, c) == 0]
+            while res := self._find_triples_and_eliminate(board, cells, (kind, index)):
+                steps.append(res)
+        return steps
 
+    def apply_in(self, board: Board, region: Region) -> Optional[Step]:
+        for kind, index, unit_cells in region.units:
+            cells = [(r, c) for r, c in unit_cells if board.get_value(r, c) == 0]
+            res = self._find_triples_and_eliminate(
+                board, cells, (kind, index), region.cells
+            )
+            if res:
+                return res
         return None
 
-    def _find_triples_and_eliminate(self, board: Board, cells: List[Tuple[int, int]], unit_name: str) -> Optional[Dict[str, Any]]:
+    def _find_triples_and_eliminate(
+        self,
+        board: Board,
+        cells: List[Tuple[int, int]],
+        unit: Tuple[str, int],
+        focus: Optional[AbstractSet[Tuple[int, int]]] = None,
+    ) -> Optional[Step]:
         from itertools import combinations
 
         # Build map from cell to candidates (as frozenset)
@@ -58,15 +65,21 @@ class NakedTriple(Strategy):
                         continue
                     r, c = other
                     for val in list(union):
-                        if val in board.get_candidates(r, c):
-                            board.remove_candidate(r, c, val)
+                        if val in board.candidates[r][c]:
                             eliminated.append((r, c, val))
+                if focus is not None and not any(
+                    (r, c) in focus for r, c, _ in eliminated
+                ):
+                    continue
                 if eliminated:
-                    return {
-                        "type": "Naked Triple",
-                        "cells": combo,
-                        "digits": tuple(sorted(list(union))),
-                        "candidates_removed": eliminated,
-                        "explanation": f"In {unit_name}, cells {[(x[0]+1,x[1]+1) for x in combo]} form a Naked Triple with digits {sorted(list(union))}. Removed those digits from other cells in the unit.",
-                    }
+                    for r, c, val in eliminated:
+                        board.remove_candidate(r, c, val)
+                    return Step(
+                        "naked_triple",
+                        cells=combo,
+                        digits=tuple(sorted(union)),
+                        eliminations=tuple(eliminated),
+                        unit=unit,
+                        geometry=board.geometry,
+                    )
         return None
@@ -1,5 +1,7 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import AbstractSet, Iterable, Optional, Tuple
 from ..board import Board
+from ..geometry import Region
+from ..step import Step
 from .base import Strategy
 
 
@@ -12,13 +14,30 @@ class XWing(Strategy):
     digit can be removed from other cells in those two columns (or rows).
     """
 
-    def apply(self, board: Board) -> Optional[Dict[str, Any]]:
+    def apply(self, board: Board) -> Optional[Step]:
+        return self._find(board, board.geometry.digits)
+
+    def apply_in(self, board: Board, region: Region) -> Optional[Step]:
+        # Only digits still possible in the region can be eliminated there
+        digits = set()
+        for r, c in region.cells:
+            digits |= board.candidates[r][c]
+        return self._find(board, sorted(digits), region.cells)
+
+    def _find(
+        self,
+        board: Board,
+        digits: Iterable[int],
+        focus: Optional[AbstractSet[Tuple[int, int]]] = None,
+    ) -> Optional[Step]:
+        digits = tuple(digits)
         # Check rows as base
-        for digit in range(1, 10):
+        n = board.size
+        for digit in digits:
             row_positions = []  # list of (row_index, set(columns_with_candidate))
-            for r in range(9):
+            for r in range(n):
                 cols = set()
-                for c in range(9):
+                for c in range(n):
                     if board.get_value(r, c) == 0 and digit in board.get_candidates(r, c):
                         cols.add(c)
                 if 1 < len(cols) <= 2:
@@ -35,28 +54,31 @@ class XWing(Strategy):
                         # Found an X-Wing in rows r1 and r2 across columns in cols1
                         eliminated = []
                         for c in cols1:
-                            for r in range(9):
-                                if r in (r1, r2):
+                            for r in range(n):
+                                if r in (r1, r2) or board.get_value(r, c) != 0:
                                     continue
-                                if board.get_value(r, c) == 0 and digit in board.get_candidates(r, c):
-                                    board.remove_candidate(r, c, digit)
+                                if digit in board.candidates[r][c]:
                                     eliminated.append((r, c, digit))
+                        if _misses(eliminated, focus):
+                            continue
                         if eliminated:
-                            return {
-                                "type": "X-Wing (Rows)",
-                                "digit": digit,
-                                "rows": (r1, r2),
-                                "cols": tuple(sorted(list(cols1))),
-                                "candidates_removed": eliminated,
-                                "explanation": f"Digit {digit} forms an X-Wing on rows {r1 + 1} and {r2 + 1} in columns {', '.join(str(x+1) for x in sorted(cols1))}. Remove {digit} from other cells in those columns.",
-                            }
+                            for r, c, _ in eliminated:
+                                board.remove_candidate(r, c, digit)
+                            return Step(
+                                "x_wing_rows",
+                                cells=tuple(
+                                    (r, c) for r in (r1, r2) for c in sorted(cols1)
+                                ),
+                                digits=(digit,),
+                                eliminations=tuple(eliminated),
+                            )
 
         # Check columns as base
-        for digit in range(1, 10):
+        for digit in digits:
             col_positions = []
-            for c in range(9):
+            for c in range(n):
                 rows = set()
-                for r in range(9):
+                for r in range(n):
                     if board.get_value(r, c) == 0 and digit in board.get_candidates(r, c):
                         rows.add(r)
                 if 1 < len(rows) <= 2:
@@ -71,20 +93,28 @@ class XWing(Strategy):
                     if rows1 == rows2:
                         eliminated = []
                         for r in rows1:
-                            for c in range(9):
-                                if c in (c1, c2):
+                            for c in range(n):
+                                if c in (c1, c2) or board.get_value(r, c) != 0:
                                     continue
-                                if board.get_value(r, c) == 0 and digit in board.get_candidates(r, c):
-                                    board.remove_candidate(r, c, digit)
+                                if digit in board.candidates[r][c]:
                                     eliminated.append((r, c, digit))
+                        if _misses(eliminated, focus):
+                            continue
                         if eliminated:
-                            return {
-                                "type": "X-Wing (Columns)",
-                                "digit": digit,
-                                "cols": (c1, c2),
-                                "rows": tuple(sorted(list(rows1))),
-                                "candidates_removed": eliminated,
-                                "explanation": f"Digit {digit} forms an X-Wing on columns {c1 + 1} and {c2 + 1} in rows {', '.join(str(x+1) for x in sorted(rows1))}. Remove {digit} from other cells in those rows.",
-                            }
+                            for r, c, _ in eliminated:
+                                board.remove_candidate(r, c, digit)
+                            return Step(
+                                "x_wing_cols",
+                                cells=tuple(
+                                    (r, c) for r in sorted(rows1) for c in (c1, c2)
+                                ),
+                                digits=(digit,),
+                                eliminations=tuple(eliminated),
+                            )
 
         return None
+
+
+def _misses(eliminated, focus) -> bool:
+    """True if a focus is given and no elimination falls in it."""
+    return focus is not None and not any((r, c) in focus for r, c, _ in eliminated)
@@ -1,19 +1,91 @@
-from typing import List
+import base64
+import os
+import struct
+from itertools import chain
+from typing import List, Optional
 from .board import Board
+from .geometry import SYMBOLS, Geometry
+from .budget import Budget, BudgetExceeded
 
+# ASCII byte -> digit value; every non-digit byte is an empty cell
+_BYTES_TO_VALUES = bytes(b - 48 if 49 <= b <= 57 else 0 for b in range(256))
+# Digit value -> ASCII byte
+_VALUES_TO_BYTES = bytes(b + 48 if b <= 9 else 48 for b in range(256))
+# Characters used for empty cells across common formats
+BLANK_CHARS = ".0*_xX?"
+# Layout characters in pretty-printed grids
+SEPARATOR_CHARS = "|+-=:"
+_NORMALIZE = str.maketrans(
+    {**{ch: "0" for ch in BLANK_CHARS}, **{ch: None for ch in SEPARATOR_CHARS}}
+)
+_DROP_DIGITS = str.maketrans("", "", "0123456789")
 
-def parse_puzzle(puzzle_str: str) -> Board:
-    """Parses an 81-character string into a Board object."""
+
+def parse_puzzle(puzzle_str: str, geometry: Optional[Geometry] = None) -> Board:
+    """Parses an 81-character string into a Board object.
+
+    Other sizes need their geometry (see geometry.geometry_for_length) and
+    one character per cell: 1-9, then A-P for 10-25; anything else is blank.
+    """
+    if geometry is not None and not geometry.standard:
+        if len(puzzle_str) != geometry.cell_count:
+            raise ValueError(
+                f"Puzzle string must be exactly {geometry.cell_count} characters long."
+            )
+        symbols = geometry.symbol_values
+        return Board.from_values([symbols.get(ch, 0) for ch in puzzle_str], geometry)
     if len(puzzle_str) != 81:
         raise ValueError("Puzzle string must be exactly 81 characters long.")
+    return parse_puzzle_bytes(puzzle_str.encode("ascii", "replace"))
+
+
+def parse_puzzle_bytes(data: bytes) -> Board:
+    """Parses 81 ASCII bytes into a Board object."""
+    if len(data) != 81:
+        raise ValueError("Puzzle string must be exactly 81 characters long.")
+    return Board.from_values(data.translate(_BYTES_TO_VALUES))
+
+
+def normalize_puzzle(text: str) -> str:
+    """Converts common puzzle notations to an 81-digit string.
+
+    Accepts '.', '*', '_', 'x' or '?' for blanks and pretty-printed grids
+    with '|', '+', '-' separators, whitespace and line breaks. Raises
+    ValueError for any other character, or a cell count other than 81.
+    """
+    digits = normalize_grid_text(text)
+    if len(digits) != 81:
+        raise ValueError(f"Expected 81 cells, found {len(digits)}.")
+    return digits
+
 
-    grid = []
-    for i in range(0, 81, 9):
-        row_str = puzzle_str[i : i + 9]
-        row = [int(c) if c.isdigit() else 0 for c in row_str]
-        grid.append(row)
+def load_puzzles(path: str) -> List[str]:
+    """Reads puzzles from a .sdk (one grid) or .sdm/text (one per line) file."""
+    with open(path) as f:
+        lines = [
+            line.strip()
+            for line in f
+            if line.strip() and not line.lstrip().startswith(("#", "["))
+        ]
 
-    return Board(grid)
+    if os.path.splitext(path)[1].lower() == ".sdk":
+        return [normalize_puzzle("".join(lines))]
+
+    try:
+        return [normalize_puzzle(line) for line in lines]
+    except ValueError:
+        # Not one puzzle per line: treat the file as consecutive grids
+        cells = normalize_grid_text("".join(lines))
+        return [cells[i : i + 81] for i in range(0, len(cells) - 80, 81)]
+
+
+def normalize_grid_text(text: str) -> str:
+    """Like normalize_puzzle, for any number of cells."""
+    digits = "".join(text.translate(_NORMALIZE).split())
+    unexpected = digits.translate(_DROP_DIGITS)
+    if unexpected:
+        raise ValueError(f"Unexpected character {unexpected[0]!r} in puzzle.")
+    return digits
 
 
 def format_board_simple(board: Board) -> str:
@@ -22,76 +94,241 @@ def format_board_simple(board: Board) -> str:
 
 
 def board_to_string(board: Board) -> str:
-    """Converts a Board object back to an 81-character string."""
-    chars = []
-    for r in range(9):
-        for c in range(9):
-            val = board.get_value(r, c)
-            chars.append(str(val))
-    return "".join(chars)
+    """Converts a Board object back to an 81-character string ('0' = empty).
+
+    Larger grids use the symbols parse_puzzle accepts.
+    """
+    if board.size > 9:
+        return "".join(SYMBOLS[v - 1] if v else "0" for row in board.grid for v in row)
+    return board_to_bytes(board).decode("ascii")
+
 
+def board_to_bytes(board: Board) -> bytes:
+    """Converts a Board object to 81 ASCII digit bytes."""
+    return bytes(chain.from_iterable(board.grid)).translate(_VALUES_TO_BYTES)
 
-def solve_sudoku_backtracking(board: Board) -> bool:
+
+def solve_sudoku_backtracking(board: Board, budget: Optional[Budget] = None) -> bool:
     """
     Solves the board using backtracking with MRV heuristic.
     Modifies the board in-place. Returns True if solvable.
+    Each search node is charged to budget; if it runs out, BudgetExceeded
+    is raised and the grid is restored to its state before the search.
+    """
+    if budget is None:
+        solved = _MaskSearch(board, None).solve()
+    else:
+        grid = [row[:] for row in board.grid]
+        try:
+            solved = _MaskSearch(board, budget).solve()
+        except BudgetExceeded:
+            board.grid = grid
+            raise
+    if solved:
+        board.recount()  # the search writes the grid directly
+    return solved
+
+
+class _MaskSearch:
+    """MRV backtracking over per-unit digit masks (bit d - 1 for digit d).
+
+    Each row, column and box keeps the mask of digits it already holds, so
+    a cell's options are one OR of three ints instead of a scan of its
+    peers; Python ints keep this working up to 25 digits. Before branching
+    on a cell, digits with a single place left in some unit are placed as
+    forced moves, which keeps 16x16 and 25x25 searches small.
     """
-    empty = find_empty_mrv(board)
-    if not empty:
-        return True
-    row, col = empty
-
-    for num in range(1, 10):
-        if is_valid(board, row, col, num):
-            board.grid[row][col] = num
-            if solve_sudoku_backtracking(board):
+
+    def __init__(self, board: Board, budget: Optional[Budget]):
+        geo = board.geometry
+        self.grid = board.grid
+        self.budget = budget
+        self.full = geo.all_mask
+        self.box_of = geo.box_of
+        self.rows = [0] * geo.size
+        self.cols = [0] * geo.size
+        self.boxes = [0] * geo.size
+        # Options of every open cell, refreshed by each _pick
+        self.free = [[0] * geo.size for _ in range(geo.size)]
+        self.units = (
+            [(self.rows, i, cells) for i, cells in enumerate(geo.rows)]
+            + [(self.cols, i, cells) for i, cells in enumerate(geo.cols)]
+            + [(self.boxes, i, cells) for i, cells in enumerate(geo.boxes)]
+        )
+        self.empty = []
+        for r, row in enumerate(self.grid):
+            for c, v in enumerate(row):
+                if v:
+                    bit = 1 << (v - 1)
+                    self.rows[r] |= bit
+                    self.cols[c] |= bit
+                    self.boxes[self.box_of[r][c]] |= bit
+                else:
+                    self.empty.append((r, c))
+
+    def _pick(self):
+        """(row, col, options mask) to branch on next; None when solved.
+
+        An options mask of 0 means the position is dead.
+        """
+        grid, rows, cols, boxes, box_of, free_of = (
+            self.grid, self.rows, self.cols, self.boxes, self.box_of, self.free
+        )
+        full = self.full
+        best = None
+        best_count = full.bit_length() + 1
+        for r, c in self.empty:
+            if grid[r][c]:
+                continue
+            free = full & ~(rows[r] | cols[c] | boxes[box_of[r][c]])
+            if not free:
+                return r, c, 0  # Dead end, force backtrack
+            free_of[r][c] = free
+            if best_count > 1:
+                count = bin(free).count("1")
+                if count < best_count:
+                    best, best_count = (r, c, free), count
+        if best is None or best_count == 1:
+            return best
+
+        # Hidden singles: a digit with one place left in a unit is forced
+        for used, index, cells in self.units:
+            once = twice = 0
+            for r, c in cells:
+                if not grid[r][c]:
+                    f = free_of[r][c]
+                    twice |= once & f
+                    once |= f
+            if full & ~(once | used[index]):
+                return best[0], best[1], 0  # A digit has no place left
+            hidden = once & ~twice
+            if hidden:
+                bit = hidden & -hidden
+                for r, c in cells:
+                    if not grid[r][c] and free_of[r][c] & bit:
+                        return r, c, bit
+        return best
+
+    def solve(self) -> bool:
+        if self.budget is not None:
+            self.budget.charge()
+        pick = self._pick()
+        if pick is None:
+            return True
+        r, c, free = pick
+        b = self.box_of[r][c]
+        while free:
+            bit = free & -free
+            free ^= bit
+            self.grid[r][c] = bit.bit_length()
+            self.rows[r] |= bit
+            self.cols[c] |= bit
+            self.boxes[b] |= bit
+            if self.solve():
                 return True
-            board.grid[row][col] = 0
+            self.rows[r] ^= bit
+            self.cols[c] ^= bit
+            self.boxes[b] ^= bit
+        self.grid[r][c] = 0
+        return False
 
-    return False
+    def count(self, limit: int) -> int:
+        """Number of solutions, stopping at limit. Leaves the grid unchanged."""
+        if self.budget is not None:
+            self.budget.charge()
+        pick = self._pick()
+        if pick is None:
+            return 1
+        r, c, free = pick
+        b = self.box_of[r][c]
+        total = 0
+        while free and total < limit:
+            bit = free & -free
+            free ^= bit
+            self.grid[r][c] = bit.bit_length()
+            self.rows[r] |= bit
+            self.cols[c] |= bit
+            self.boxes[b] |= bit
+            total += self.count(limit - total)
+            self.rows[r] ^= bit
+            self.cols[c] ^= bit
+            self.boxes[b] ^= bit
+        self.grid[r][c] = 0
+        return total
 
 
 def find_empty_mrv(board: Board):
     """Finds the empty cell with the fewest valid options (MRV)."""
-    min_opts = 10
-    best_cell = None
+    pick = _MaskSearch(board, None)._pick()
+    return pick[:2] if pick else None
 
-    for r in range(9):
-        for c in range(9):
-            if board.grid[r][c] == 0:
-                opts = 0
-                for n in range(1, 10):
-                    if is_valid(board, r, c, n):
-                        opts += 1
 
-                if opts == 0:
-                    return (r, c)  # Dead end, force backtrack
+def is_valid(board: Board, row: int, col: int, num: int) -> bool:
+    """True if num appears nowhere in the cell's row, column or box."""
+    geo = board.geometry
+    grid = board.grid
+    if num in grid[row]:
+        return False
+    for r, c in geo.cols[col]:
+        if grid[r][c] == num:
+            return False
+    for r, c in geo.boxes[geo.box_of[row][col]]:
+        if grid[r][c] == num:
+            return False
+    return True
 
-                if opts < min_opts:
-                    min_opts = opts
-                    best_cell = (r, c)
-                    if min_opts == 1:
-                        return best_cell
 
-    return best_cell
+def candidate_mask(candidates) -> int:
+    """Packs a set of digits into a bitmask (bit d set for digit d).
 
+    This is the wire format of the web API and session messages. Board and
+    Geometry masks are internal and use bit d - 1 for digit d instead.
+    """
+    mask = 0
+    for d in candidates:
+        mask |= 1 << d
+    return mask
 
-def is_valid(board: Board, row: int, col: int, num: int) -> bool:
-    # Check row
-    for c in range(9):
-        if board.grid[row][c] == num:
-            return False
 
-    # Check col
-    for r in range(9):
-        if board.grid[r][col] == num:
-            return False
+def board_to_masks(board: Board) -> List[int]:
+    """Returns the candidate bitmasks of a board in row-major order."""
+    return [candidate_mask(cands) for row in board.candidates for cands in row]
 
-    # Check box
-    box_r, box_c = (row // 3) * 3, (col // 3) * 3
-    for r in range(box_r, box_r + 3):
-        for c in range(box_c, box_c + 3):
-            if board.grid[r][c] == num:
-                return False
 
-    return True
+def apply_masks(board: Board, masks: List[int]) -> None:
+    """Overwrites the candidates of empty cells from 81 bitmasks."""
+    geo = board.geometry
+    if len(masks) != geo.cell_count:
+        raise ValueError(f"Expected {geo.cell_count} candidate masks.")
+    for idx, mask in enumerate(masks):
+        r, c = divmod(idx, geo.size)
+        if board.grid[r][c] == 0:
+            board.candidates[r][c] = {d for d in geo.digits if mask >> d & 1}
+
+
+def pack_masks(masks: List[int]) -> str:
+    """Packs candidate_mask bitmasks as little-endian uint16, base64-encoded."""
+    return base64.b64encode(struct.pack(f"<{len(masks)}H", *masks)).decode("ascii")
+
+
+def unpack_masks(data: str) -> List[int]:
+    """Inverse of pack_masks."""
+    raw = base64.b64decode(data)
+    if len(raw) % 2:
+        raise ValueError("Packed candidates must be a whole number of uint16 values.")
+    return list(struct.unpack(f"<{len(raw) // 2}H", raw))
+
+
+def count_solutions(
+    board: Board, limit: int = 2, budget: Optional[Budget] = None
+) -> int:
+    """Counts solutions of the board's grid by backtracking, stopping at limit.
+
+    Raises BudgetExceeded if budget runs out first.
+    """
+    if not board.is_valid():
+        return 0
+    scratch = Board.__new__(Board)
+    scratch.geometry = board.geometry
+    scratch.grid = [row[:] for row in board.grid]
+    return _MaskSearch(scratch, budget).count(limit)
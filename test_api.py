@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import web.services
+from web.app import app, render_index_page
+from web.services import get_solution_str
+
+HARD = (
+    "000000010400000000020000000"
+    "000050407008000300001090000"
+    "300400200050100000000806000"
+)
+
+
+def relabelled(count):
+    """Distinct puzzles of the same difficulty, so none is cached."""
+    digits = "123456789"
+    return [
+        HARD.translate(str.maketrans(digits, digits[i:] + digits[:i]))
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def tight_budget(monkeypatch):
+    """Node limit that covers about one hard puzzle, with fresh caches."""
+    monkeypatch.setattr(web.services, "SOLVE_TIME_LIMIT", 30.0)
+    monkeypatch.setattr(web.services, "SOLVE_NODE_LIMIT", 20)
+    get_solution_str.cache_clear()
+    render_index_page.cache_clear()
+    yield
+    get_solution_str.cache_clear()
+    render_index_page.cache_clear()
+
+
+def test_batch_shares_one_budget(tight_budget):
+    puzzles = relabelled(6)
+    with TestClient(app) as client:
+        # Each puzzle fits the budget on its own
+        for puzzle in puzzles[:2]:
+            response = client.post("/api/v1/solve", json={"puzzles": [puzzle]})
+            assert response.json()["results"][0]["solved"]
+
+        results = client.post("/api/v1/solve", json={"puzzles": puzzles}).json()
+    results = results["results"]
+    # The first two come from the cache; the budget runs out on the rest
+    assert all(r["solved"] for r in results[:2])
+    stopped = [r for r in results[2:] if "error" in r]
+    assert stopped and all(r["error"].startswith("Solve stopped") for r in stopped)
+    assert "error" in results[-1]
+
+
+def test_startup_is_not_budget_gated(tight_budget, monkeypatch):
+    monkeypatch.setattr(web.services, "SOLVE_NODE_LIMIT", 3)
+    with TestClient(app) as client:
+        assert client.get("/").status_code == 200
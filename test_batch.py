@@ -0,0 +1,106 @@
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import sudoku_explainer.batch as batch
+from sudoku_explainer.batch import solve_many, solve_values
+from sudoku_explainer.utils import (
+    board_to_string,
+    parse_puzzle,
+    solve_sudoku_backtracking,
+)
+
+CORPUS = Path(__file__).parent / "benchmarks" / "corpus"
+PUZZLES = [
+    line
+    for tier in ("easy", "medium", "hard", "extreme")
+    for line in (CORPUS / f"{tier}.txt").read_text().split()
+]
+# One extra clue makes this corpus puzzle unsolvable, and propagation then
+# finds one cell to be the only place for two digits in different units
+CONFLICTING_SINGLES = (
+    "000940010000025000004000203"
+    "600002931047168720052039604"
+    "000804000006010070400000359"
+)
+
+
+def backtrack(puzzle):
+    board = parse_puzzle(puzzle)
+    if not board.is_valid() or not solve_sudoku_backtracking(board):
+        return None
+    return board_to_string(board)
+
+
+def is_completion(solution, puzzle):
+    return parse_puzzle(solution).is_solved() and all(
+        p in ("0", s) for p, s in zip(puzzle, solution)
+    )
+
+
+def test_corpus_matches_backtracking():
+    assert solve_many(PUZZLES) == [backtrack(p) for p in PUZZLES]
+
+
+def test_values_array_is_not_modified():
+    values = batch.parse_many(PUZZLES[:5])
+    before = values.copy()
+    assert solve_values(values) == solve_many(PUZZLES[:5])
+    assert np.array_equal(values, before)
+
+
+@pytest.mark.parametrize(
+    "puzzle",
+    [
+        "55" + "0" * 79,  # repeated clue in a row
+        "5" + "0" * 8 + "5" + "0" * 71,  # and in a column and box
+        "0" * 2 + "3456789" + "12" + "0" * 70,  # no candidates left for r0c0
+    ],
+)
+def test_invalid_puzzles_have_no_solution(puzzle):
+    assert backtrack(puzzle) is None
+    assert solve_many([puzzle]) == [None]
+    assert solve_many([puzzle], fallback=False) == [None]
+
+
+def test_empty_grid_is_completed():
+    (solution,) = solve_many(["0" * 81])
+    assert is_completion(solution, "0" * 81)
+
+
+def test_conflicting_hidden_singles(monkeypatch):
+    conflicts = []
+    place = batch.place_hidden_singles
+
+    def watched(values, masks):
+        # Cells that are the lone place of more than one digit this round
+        has = (masks[:, batch.UNITS, None] & batch.DIGIT_BITS) != 0
+        board_idx, unit_idx, digit_idx = np.nonzero(has.sum(axis=2) == 1)
+        slot = has[board_idx, unit_idx, :, digit_idx].argmax(axis=1)
+        targets = {}
+        for b, cell, d in zip(board_idx, batch.UNITS[unit_idx, slot], digit_idx):
+            targets.setdefault((b, cell), set()).add(d)
+        conflicts.extend(t for t in targets.values() if len(t) > 1)
+        return place(values, masks)
+
+    monkeypatch.setattr(batch, "place_hidden_singles", watched)
+    assert solve_many([CONFLICTING_SINGLES]) == [None]
+    assert conflicts
+    assert backtrack(CONFLICTING_SINGLES) is None
+
+
+def test_perturbed_puzzles_match_backtracking():
+    rng = random.Random(11)
+    puzzles = []
+    for _ in range(150):
+        cells = list(rng.choice(PUZZLES))
+        blank = rng.choice([i for i, ch in enumerate(cells) if ch == "0"])
+        cells[blank] = str(rng.randint(1, 9))
+        puzzles.append("".join(cells))
+    for puzzle, solution in zip(puzzles, solve_many(puzzles)):
+        if backtrack(puzzle) is None:
+            assert solution is None
+        else:
+            assert is_completion(solution, puzzle)
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from sudoku_explainer.board import Board
+from sudoku_explainer.geometry import get_geometry
+from sudoku_explainer.utils import parse_puzzle
+
+PUZZLE = (
+    "530070000600195000098000060"
+    "800060003400803001700020006"
+    "060000280000419005000080079"
+)
+
+
+def unit_state(board):
+    return board.held[:], set(board.conflicts), board.empty
+
+
+def recounted(board):
+    fresh = board.clone()
+    fresh.recount()
+    return unit_state(fresh)
+
+
+def brute_conflict_cells(board):
+    grid = board.grid
+    cells = set()
+    for _, _, unit in board.geometry.units:
+        for r, c in unit:
+            value = grid[r][c]
+            if value and sum(grid[rr][cc] == value for rr, cc in unit) > 1:
+                cells.add((r, c))
+    return cells
+
+
+@pytest.mark.parametrize("shape", [(3, 3), (2, 3), (2, 2)])
+def test_incremental_unit_state_matches_recount(shape):
+    geometry = get_geometry(*shape)
+    board = Board(geometry=geometry)
+    rng = random.Random(7)
+    n = geometry.size
+    for _ in range(2000):
+        r, c = rng.randrange(n), rng.randrange(n)
+        if board.grid[r][c] and rng.random() < 0.4:
+            board.clear_value(r, c)
+        else:
+            # Any digit, so cells overwrite each other and units repeat digits
+            board.set_value(r, c, rng.choice(geometry.digits))
+        assert unit_state(board) == recounted(board)
+        assert board.conflict_cells() == brute_conflict_cells(board)
+        assert board.is_valid() == (not brute_conflict_cells(board))
+
+
+def test_recount_after_direct_grid_writes():
+    board = parse_puzzle(PUZZLE)
+    board.grid[0][2] = 5  # repeats the 5 in row 0 and box 0
+    board.grid[8][8] = 0
+    board.recount()
+    assert board.conflicts == {(0, 5), (18, 5)}
+    assert board.empty == PUZZLE.count("0")
+    assert board.conflict_cells() == {(0, 0), (0, 2)}
+    assert not board.held[8] & 1 << 8  # column 8 no longer holds a 9
+
+
+def snapshot(board):
+    return (
+        [row[:] for row in board.grid],
+        [[set(cands) for cands in row] for row in board.candidates],
+        unit_state(board),
+    )
+
+
+def test_rollback_restores_snapshot():
+    board = parse_puzzle(PUZZLE)
+    rng = random.Random(3)
+    marks = []
+    for _ in range(5):
+        marks.append((board.mark(), snapshot(board)))
+        for _ in range(40):
+            r, c = rng.randrange(9), rng.randrange(9)
+            op = rng.random()
+            if op < 0.4:
+                board.set_value(r, c, rng.randint(1, 9))
+            elif op < 0.6:
+                board.clear_value(r, c)
+            elif op < 0.8:
+                board.remove_candidate(r, c, rng.randint(1, 9))
+            else:
+                board.add_candidate(r, c, rng.randint(1, 9))
+    for mark, expected in reversed(marks):
+        board.rollback(mark)
+        assert snapshot(board) == expected
+
+
+def test_rollback_rejects_foreign_mark():
+    board = parse_puzzle(PUZZLE)
+    mark = board.mark()
+    board.set_value(0, 2, 4)
+    board.rollback(mark)
+    with pytest.raises(ValueError):
+        board.rollback(mark + 1)
@@ -0,0 +1,78 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from benchmarks.board_codecs import legacy_format, legacy_parse
+from sudoku_explainer.utils import (
+    board_to_string,
+    load_puzzles,
+    normalize_grid_text,
+    normalize_puzzle,
+    parse_puzzle,
+)
+
+CORPUS = Path(__file__).parent / "benchmarks" / "corpus"
+PUZZLES = [
+    line
+    for tier in ("easy", "medium", "hard", "extreme")
+    for line in (CORPUS / f"{tier}.txt").read_text().split()
+]
+
+
+def pretty(puzzle):
+    """A puzzle as a bordered grid with '.' blanks."""
+    rows = []
+    for r in range(9):
+        if r % 3 == 0:
+            rows.append("+-------+-------+-------+")
+        cells = puzzle[r * 9 : r * 9 + 9].replace("0", ".")
+        rows.append("| " + " | ".join(" ".join(cells[i : i + 3]) for i in (0, 3, 6)))
+    rows.append("+-------+-------+-------+")
+    return "\n".join(rows) + "\n"
+
+
+def state(board):
+    return board.grid, board.candidates
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES)
+def test_parse_and_format_match_legacy_codecs(puzzle):
+    rng = random.Random(puzzle)
+    # Blanks in any notation, which both parsers read as empty
+    noisy = "".join(ch if ch != "0" else rng.choice("0.*_x?") for ch in puzzle)
+    for text in (puzzle, noisy):
+        assert state(parse_puzzle(text)) == state(legacy_parse(text))
+
+    board = parse_puzzle(puzzle)
+    assert board_to_string(board) == legacy_format(board) == puzzle
+    board.set_value(*divmod(puzzle.index("0"), 9), 5)
+    assert board_to_string(board) == legacy_format(board)
+
+
+def test_normalize_puzzle_notations():
+    puzzle = PUZZLES[0]
+    assert normalize_puzzle(pretty(puzzle)) == puzzle
+    assert normalize_puzzle(puzzle.replace("0", ".")) == puzzle
+    assert normalize_puzzle(" ".join(puzzle)) == puzzle
+    assert normalize_grid_text(pretty(puzzle) * 2) == puzzle * 2
+
+
+@pytest.mark.parametrize("text", ["4" * 80 + "a", "4" * 80 + "é", "4" * 80])
+def test_normalize_puzzle_rejects_other_input(text):
+    with pytest.raises(ValueError):
+        normalize_puzzle(text)
+
+
+def test_load_puzzles_dialects(tmp_path):
+    sdk = tmp_path / "one.sdk"
+    sdk.write_text("[Puzzle]\n# a comment\n" + pretty(PUZZLES[0]))
+    assert load_puzzles(str(sdk)) == PUZZLES[:1]
+
+    sdm = tmp_path / "many.sdm"
+    sdm.write_text("\n".join(p.replace("0", ".") for p in PUZZLES[:5]) + "\n")
+    assert load_puzzles(str(sdm)) == PUZZLES[:5]
+
+    grids = tmp_path / "grids.txt"
+    grids.write_text("\n".join(pretty(p) for p in PUZZLES[:3]))
+    assert load_puzzles(str(grids)) == PUZZLES[:3]
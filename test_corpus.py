@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_explainer.corpus import HEADER, PACKED_SIZE, Corpus, convert
+
+CORPUS = Path(__file__).parent / "benchmarks" / "corpus"
+PUZZLES = [
+    line
+    for tier in ("easy", "medium", "hard", "extreme")
+    for line in (CORPUS / f"{tier}.txt").read_text().split()
+]
+
+
+def write_text(path, puzzles, newline="\n", terminated=True):
+    text = newline.join(puzzles) + (newline if terminated else "")
+    path.write_bytes(text.encode("ascii"))
+    return str(path)
+
+
+def read_all(path):
+    with Corpus(path) as corpus:
+        return list(corpus), [corpus[i] for i in range(-len(corpus), 0)]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+@pytest.mark.parametrize("terminated", [True, False])
+def test_text_round_trip(tmp_path, newline, terminated):
+    path = write_text(tmp_path / "puzzles.txt", PUZZLES, newline, terminated)
+    iterated, indexed = read_all(path)
+    assert iterated == indexed == PUZZLES
+
+
+def test_text_blanks_read_as_zero(tmp_path):
+    path = write_text(tmp_path / "dots.txt", [p.replace("0", ".") for p in PUZZLES])
+    assert read_all(path)[0] == PUZZLES
+
+
+def test_binary_round_trip(tmp_path):
+    src = write_text(tmp_path / "puzzles.txt", PUZZLES, "\r\n")
+    dst = str(tmp_path / "puzzles.sdkc")
+    assert convert(src, dst) == len(PUZZLES)
+    with Corpus(dst) as corpus:
+        assert corpus.binary and corpus.stride == PACKED_SIZE
+    iterated, indexed = read_all(dst)
+    assert iterated == indexed == PUZZLES
+    with pytest.raises(ValueError):
+        convert(dst, str(tmp_path / "again.sdkc"))
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_shards_cover_every_record_once(tmp_path, binary):
+    path = write_text(tmp_path / "puzzles.txt", PUZZLES)
+    if binary:
+        convert(path, str(tmp_path / "puzzles.sdkc"))
+        path = str(tmp_path / "puzzles.sdkc")
+    with Corpus(path) as corpus:
+        for total in (1, 2, 3, 7, len(PUZZLES), len(PUZZLES) + 5):
+            ranges = [corpus.shard(i, total) for i in range(total)]
+            covered = [i for start, stop in ranges for i in range(start, stop)]
+            assert covered == list(range(len(corpus)))
+        with pytest.raises(ValueError):
+            corpus.shard(3, 3)
+
+
+def test_truncated_binary_is_rejected(tmp_path):
+    src = write_text(tmp_path / "puzzles.txt", PUZZLES)
+    dst = tmp_path / "puzzles.sdkc"
+    convert(src, str(dst))
+    data = dst.read_bytes()
+    dst.write_bytes(data[:-30])
+    with pytest.raises(ValueError, match="truncated"):
+        Corpus(str(dst))
+    dst.write_bytes(data[: HEADER.size - 1])
+    with pytest.raises(ValueError, match="truncated"):
+        Corpus(str(dst))
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_explainer.hints import find_hint, parse_region
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.strategies.base import Strategy
+from sudoku_explainer.strategies.basics import HiddenSingle, NakedSingle
+from sudoku_explainer.strategies.pairs import NakedPair
+from sudoku_explainer.strategies.triples import NakedTriple
+from sudoku_explainer.strategies.x_wing import XWing
+from sudoku_explainer.utils import parse_puzzle
+
+CORPUS = Path(__file__).parent / "benchmarks" / "corpus"
+PUZZLES = [
+    (CORPUS / f"{tier}.txt").read_text().split()[0]
+    for tier in ("easy", "medium", "hard", "extreme")
+]
+STRATEGIES = (NakedSingle, HiddenSingle, NakedPair, NakedTriple, XWing)
+
+
+def snapshot(board):
+    return (
+        [row[:] for row in board.grid],
+        [[set(cands) for cands in row] for row in board.candidates],
+        board.held[:],
+        set(board.conflicts),
+        board.empty,
+    )
+
+
+def regions(board):
+    for row in range(9):
+        for col in range(9):
+            yield parse_region(board, "cell", row, col)
+    for i in range(9):
+        for scope in ("row", "col", "box"):
+            yield parse_region(board, scope, i, i)
+
+
+def boards():
+    """Each puzzle as given and after a few logical steps."""
+    for puzzle in PUZZLES:
+        board = parse_puzzle(puzzle)
+        yield board
+        board = board.clone()
+        solver = SudokuSolver(board)
+        for _ in range(8):
+            solver.solve_step()
+        yield board
+
+
+@pytest.mark.parametrize("whole_board", [False, True])
+@pytest.mark.parametrize("policy", ["human", "fast"])
+def test_hints_leave_the_board_unchanged(monkeypatch, whole_board, policy):
+    if whole_board:
+        # The default apply_in changes the board before it filters the step
+        for cls in STRATEGIES:
+            monkeypatch.setattr(cls, "apply_in", Strategy.apply_in)
+    found = 0
+    for board in boards():
+        before = snapshot(board)
+        for region in regions(board):
+            step = find_hint(board, region, policy)
+            assert snapshot(board) == before
+            assert board.trail is None
+            if step is not None:
+                found += 1
+                assert region.touches(step)
+    assert found
+
+
+def test_hints_keep_an_existing_trail():
+    board = parse_puzzle(PUZZLES[1])
+    mark = board.mark()
+    board.set_value(*divmod(PUZZLES[1].index("0"), 9), 1)
+    trail = list(board.trail)
+    before = snapshot(board)
+    for region in regions(board):
+        find_hint(board, region)
+    assert board.trail == trail and snapshot(board) == before
+    board.rollback(mark)
+    assert board.grid == parse_puzzle(PUZZLES[1]).grid
+
+
+def test_next_step_is_found_in_every_region_it_touches():
+    for board in boards():
+        step = SudokuSolver(board.clone()).solve_step()
+        if step is None:
+            continue
+        for region in regions(board):
+            if region.touches(step):
+                assert find_hint(board, region) is not None
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import web.ocr_jobs
+from web.app import app
+from web.ocr_jobs import MAX_UPLOAD_BYTES, OCR_JOBS
+
+JOBS = "/api/v1/ocr/jobs"
+
+
+def images(count, size=16):
+    return [("files", (f"{i}.png", bytes(size), "image/png")) for i in range(count)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Keep the workers busy so queued jobs stay queued
+    release = threading.Event()
+
+    def blocked(image):
+        release.wait(10)
+        return None, "released"
+
+    monkeypatch.setattr(web.ocr_jobs, "process_sudoku_image", blocked)
+    monkeypatch.setattr(OCR_JOBS, "workers", 1)
+    monkeypatch.setattr(OCR_JOBS, "size", 2)
+    with TestClient(app) as client:
+        yield client
+        release.set()
+
+
+def test_full_queue_answers_429(client):
+    rejected = OCR_JOBS.metrics()["rejected"]
+    response = client.post(JOBS, files=images(3))
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "5"
+    assert OCR_JOBS.metrics()["rejected"] == rejected + 3
+
+    # All or none: the refused batch took no slots
+    response = client.post(JOBS, files=images(2))
+    assert response.status_code == 202
+    assert [job["status"] for job in response.json()["jobs"]] == ["queued"] * 2
+
+
+def test_oversized_upload_answers_413(client):
+    submitted = OCR_JOBS.metrics()["submitted"]
+    too_big = images(1, MAX_UPLOAD_BYTES + 1)
+    assert client.post(JOBS, files=too_big).status_code == 413
+
+    # Without Content-Length the body is cut off while it streams in
+    body = b"x" * (MAX_UPLOAD_BYTES + 1)
+    chunks = (body[i : i + 65536] for i in range(0, len(body), 65536))
+    response = client.post(
+        JOBS,
+        content=chunks,
+        headers={"content-type": "multipart/form-data; boundary=b"},
+    )
+    assert response.status_code == 413
+    assert OCR_JOBS.metrics()["submitted"] == submitted
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_explainer.policy import FastPolicy, OrderingPolicy, StrategyStats
+from sudoku_explainer.rating import rate_board, rate_steps
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import board_to_string, parse_puzzle
+
+CORPUS = Path(__file__).parent / "benchmarks" / "corpus"
+PUZZLES = [
+    line
+    for tier in ("easy", "medium", "hard", "extreme")
+    for line in (CORPUS / f"{tier}.txt").read_text().split()
+]
+
+
+def reversed_stats():
+    """Learned costs that rank the strategies hardest first."""
+    stats = StrategyStats()
+    names = ["NakedSingle", "HiddenSingle", "NakedPair", "NakedTriple", "XWing"]
+    for rank, name in enumerate(reversed(names)):
+        stats.seconds[name] = 1e-6 * (rank + 1)
+        stats.progress[name] = 100.0
+    return stats
+
+
+def outcome(puzzle, policy, sweep):
+    solver = SudokuSolver(parse_puzzle(puzzle), policy=policy, sweep=sweep)
+    for _ in solver.solve():
+        pass
+    board = solver.board
+    return board_to_string(board), rate_steps(solver.steps, board.is_solved())["score"]
+
+
+def fast(stats=None):
+    return lambda: FastPolicy(stats() if stats else StrategyStats())
+
+
+@pytest.mark.parametrize("sweep", [False, True])
+@pytest.mark.parametrize(
+    "make_policy",
+    [OrderingPolicy, fast(), fast(reversed_stats)],
+    ids=["human", "fast", "hardest-first"],
+)
+def test_same_grid_as_human_steps(make_policy, sweep):
+    for puzzle in PUZZLES:
+        grid, score = outcome(puzzle, OrderingPolicy(), sweep=False)
+        other_grid, other_score = outcome(puzzle, make_policy(), sweep)
+        assert other_grid == grid, puzzle
+        if make_policy is OrderingPolicy:
+            assert other_score == score, puzzle
+        else:
+            # Out of order steps can use a harder strategy than needed, never
+            # an easier one, so the rating always comes from a human solve
+            assert other_score >= score, puzzle
+            assert rate_board(parse_puzzle(puzzle))["score"] == score, puzzle
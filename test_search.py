@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from sudoku_explainer.board import Board
+from sudoku_explainer.budget import Budget, BudgetExceeded
+from sudoku_explainer.geometry import get_geometry
+from sudoku_explainer.search import BACKENDS, get_backend
+from sudoku_explainer.utils import board_to_string, parse_puzzle
+
+CORPUS = Path(__file__).parent / "benchmarks" / "corpus"
+PUZZLES = [
+    line.strip()
+    for tier in ("easy", "hard", "extreme")
+    for line in (CORPUS / f"{tier}.txt").read_text().splitlines()[:5]
+    if line.strip()
+]
+
+
+def solve_with(name, puzzle):
+    board = parse_puzzle(puzzle)
+    return get_backend(name).solve(board, None), board_to_string(board)
+
+
+@pytest.mark.parametrize("puzzle", PUZZLES)
+def test_backends_agree_on_corpus(puzzle):
+    dlx = solve_with("dlx", puzzle)
+    assert dlx == solve_with("backtracking", puzzle)
+    assert dlx[0] and parse_puzzle(dlx[1]).is_solved()
+
+
+def test_backends_agree_on_solution_counts():
+    puzzle = PUZZLES[0]
+    cleared = [i for i, ch in enumerate(puzzle) if ch != "0"][:12]
+    several = "".join("0" if i in cleared else ch for i, ch in enumerate(puzzle))
+    # No unit repeats a digit, but row 0 needs 1 and 2 where box 0 has them
+    unsolvable = "0" * 2 + "3456789" + "12" + "0" * 70
+    for puzzle_str, expected in ((puzzle, 1), (several, 2), (unsolvable, 0)):
+        counts = {
+            name: backend.count(parse_puzzle(puzzle_str), 2, None)
+            for name, backend in BACKENDS.items()
+        }
+        assert set(counts.values()) == {expected}, counts
+
+
+@pytest.mark.parametrize("shape", [(2, 2), (2, 3), (3, 4)])
+def test_backends_solve_other_sizes(shape):
+    geometry = get_geometry(*shape)
+    for name in BACKENDS:
+        board = Board(geometry=geometry)
+        board.set_value(0, 0, geometry.size)
+        assert get_backend(name).solve(board, None)
+        board.recount()  # backends write the grid directly
+        assert board.is_solved() and board.grid[0][0] == geometry.size
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_budget_exhaustion_leaves_grid_untouched(name):
+    board = parse_puzzle(PUZZLES[-1])
+    before = board_to_string(board)
+    with pytest.raises(BudgetExceeded):
+        get_backend(name).solve(board, Budget(node_limit=3))
+    assert board_to_string(board) == before
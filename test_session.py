@@ -0,0 +1,39 @@
+import web.session
+from sudoku_explainer.budget import BudgetExceeded
+from web.session import GameSession, handle_message
+
+PUZZLE = (
+    "000000010400000000020000000"
+    "000050407008000300001090000"
+    "300400200050100000000806000"
+)
+
+
+def test_move_still_diffs_when_the_solve_runs_out(monkeypatch):
+    calls = []
+
+    def out_of_budget(puzzle_str):
+        calls.append(puzzle_str)
+        raise BudgetExceeded("nodes")
+
+    monkeypatch.setattr(web.session, "get_solution_str", out_of_budget)
+    session = GameSession(PUZZLE)
+    assert "solution" not in session.state()
+
+    reply = handle_message(session, {"type": "move", "row": 0, "col": 0, "value": 4})
+    assert reply["type"] == "diff"
+    assert [0, 4, 0] in reply["cells"] and reply["mistakes"] == []
+    assert handle_message(session, {"type": "step"})["type"] == "diff"
+    assert len(calls) == 1  # the failure is not retried on every message
+
+    session.load(PUZZLE)
+    assert len(calls) == 2
+
+
+def test_mistakes_are_marked_against_the_solution():
+    session = GameSession(PUZZLE)
+    solution = session.state()["solution"]
+    wrong = next(d for d in range(1, 10) if str(d) != solution[0])
+    reply = session.move(0, 0, wrong)
+    assert reply["mistakes"] == [0]
+    assert session.move(0, 0, int(solution[0]))["mistakes"] == []
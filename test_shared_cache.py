@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+import web.shared_cache
+from web.shared_cache import SLOT, WAYS, SharedSlotCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SharedSlotCache(str(tmp_path / "results.cache"), slots=16, slot_size=256)
+    yield cache
+    cache.close()
+
+
+def corrupt(path, offset, bits=0xFF):
+    """Flips bits of a byte of the file, as a torn or stray write would."""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        (byte,) = os.pread(fd, 1, offset)
+        os.pwrite(fd, bytes([byte ^ bits]), offset)
+    finally:
+        os.close(fd)
+
+
+def test_values_are_shared_through_the_file(cache):
+    assert cache.put("solution", "p1", b"123")
+    other = SharedSlotCache(cache.path, slots=16, slot_size=256)
+    try:
+        assert other.get("solution", "p1") == b"123"
+        assert other.get("trace", "p1") is None
+    finally:
+        other.close()
+    assert not cache.put("solution", "big", bytes(256))
+
+
+def test_corrupt_payload_is_rejected(cache):
+    value = b"payload that will be damaged"
+    cache.put("solution", "p1", value)
+    cache.put("solution", "p2", b"untouched")
+    offset = cache._map.find(value)
+    corrupt(cache.path, offset + 5)
+
+    assert cache.get("solution", "p1") is None
+    assert cache.get("solution", "p2") == b"untouched"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    # A fresh put repairs the slot
+    cache.put("solution", "p1", value)
+    assert cache.get("solution", "p1") == value
+
+
+def test_corrupt_length_is_rejected(cache):
+    value = b"abc"
+    cache.put("solution", "p1", value)
+    length = cache._map.find(value) - SLOT.size + 16
+    # Still within the slot (so only the CRC catches it), then beyond it
+    corrupt(cache.path, length, 0x01)
+    assert cache.get("solution", "p1") is None
+    corrupt(cache.path, length, 0xF0)
+    assert cache.get("solution", "p1") is None
+
+
+class EvictingSlot:
+    """SLOT stand-in that lets another worker write around the first header
+    read: just before it, or just after it (before the payload is copied)."""
+
+    def __init__(self, write, after):
+        self.write = write
+        self.after = after
+
+    def __getattr__(self, name):
+        return getattr(SLOT, name)
+
+    def unpack_from(self, buffer, offset=0):
+        write, self.write = self.write, None
+        if write is not None and not self.after:
+            write()
+        header = SLOT.unpack_from(buffer, offset)
+        if write is not None and self.after:
+            write()
+        return header
+
+
+@pytest.mark.parametrize("after", [False, True])
+def test_slot_taken_over_during_a_read_is_a_miss(tmp_path, monkeypatch, after):
+    path = str(tmp_path / "results.cache")
+    cache = SharedSlotCache(path, slots=WAYS, slot_size=256)
+    other = SharedSlotCache(path, slots=WAYS, slot_size=256)
+    try:
+        # One set: K1 takes way 0, and the next new key evicts way 0
+        for i in range(1, WAYS + 1):
+            cache.put("solution", f"K{i}", b"answer-for-K%d" % i)
+        monkeypatch.setattr(web.shared_cache.random, "randrange", lambda n: 0)
+
+        def evict():
+            other.put("solution", "K9", b"answer-for-K9")
+
+        monkeypatch.setattr(web.shared_cache, "SLOT", EvictingSlot(evict, after))
+        assert cache.get("solution", "K1") is None
+        monkeypatch.setattr(web.shared_cache, "SLOT", SLOT)
+        assert cache.get("solution", "K9") == b"answer-for-K9"
+    finally:
+        other.close()
+        cache.close()
+
+
+def test_header_of_another_key_is_a_miss(cache):
+    # A torn write: K1's digest over K2's length, CRC and payload
+    cache.put("solution", "K1", b"answer-for-K1")
+    cache.put("solution", "K2", b"answer-for-K2")
+    k1 = cache._map.find(b"answer-for-K1") - SLOT.size
+    k2 = cache._map.find(b"answer-for-K2") - SLOT.size
+    cache._map[k2 : k2 + 16] = cache._map[k1 : k1 + 16]
+    cache._map[k1 : k1 + 16] = bytes(16)
+    assert cache.get("solution", "K1") is None
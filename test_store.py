@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from sudoku_explainer.solver import replay_steps
+from sudoku_explainer.store import UNCOUNTED, SolutionStore
+from sudoku_explainer.utils import parse_puzzle
+
+PUZZLE = (
+    "000000010400000000020000000"
+    "000050407008000300001090000"
+    "300400200050100000000806000"
+)
+
+
+def relabel(text, perm):
+    return text.translate(str.maketrans("123456789", perm))
+
+
+def step_fields(step, perm="123456789"):
+    m = {d: int(perm[d - 1]) for d in range(1, 10)}
+    return (
+        step.strategy,
+        step.cells,
+        tuple(m[d] for d in step.digits),
+        tuple((r, c, m[v]) for r, c, v in step.eliminations),
+        (step.placement[0], step.placement[1], m[step.placement[2]])
+        if step.placement
+        else None,
+        step.unit,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SolutionStore(str(tmp_path / "solved.sqlite3")) as store:
+        yield store
+
+
+def test_permuted_puzzle_round_trips(store):
+    entry = store.lookup_or_solve(PUZZLE)
+    assert entry.unique and entry.steps
+
+    perm = "".join(random.Random(5).sample("123456789", 9))
+    permuted = relabel(PUZZLE, perm)
+    hit = store.get(permuted.replace("0", "."))
+    assert hit is not None and len(store) == 1
+    assert hit.solution == relabel(entry.solution, perm)
+    assert (hit.solutions, hit.score, hit.level) == (
+        entry.solutions,
+        entry.score,
+        entry.level,
+    )
+    assert [step_fields(s) for s in hit.steps] == [
+        step_fields(s, perm) for s in entry.steps
+    ]
+
+    board = parse_puzzle(permuted)
+    replay_steps(board, hit.steps)
+    assert board.is_solved()
+
+
+def test_bulk_import_checks_rows_and_defers_counting(store):
+    solution = store.lookup_or_solve(PUZZLE).solution
+    other = relabel(PUZZLE, "234567891")
+    swapped = solution[:-2] + solution[-1] + solution[-2]
+    stored, rejected = store.bulk_import(
+        [
+            (other, relabel(solution, "234567891")),
+            (other, swapped),  # valid grid shape, wrong digits
+            ("1" * 81, solution),
+        ],
+        chunk=1,
+    )
+    # other canonicalizes to PUZZLE's row, which already exists
+    assert (stored, rejected) == (0, 2) and len(store) == 1
+
+    fresh = PUZZLE[::-1]  # rotated by 180 degrees
+    assert store.bulk_import([(fresh, solution[::-1])]) == (1, 0)
+    assert store.get(fresh).solutions == UNCOUNTED
+    assert store.lookup_or_solve(fresh, complete=False).steps is None
+    entry = store.lookup_or_solve(fresh)
+    assert entry.unique and entry.steps
+    assert store.get(fresh).solutions == 1
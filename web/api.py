@@ -0,0 +1,252 @@
+"""Versioned JSON API.
+
+Boards travel as 81-char strings; candidate state travels as 81 uint16
+bitmasks packed little-endian and base64-encoded (see utils.pack_masks).
+Every endpoint takes a list of puzzles so clients can batch work, and
+shares the solver caches in web.services with the HTML views.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from pydantic import BaseModel
+
+from sudoku_explainer.hints import find_hint, parse_region
+from sudoku_explainer.policy import DEFAULT_POLICY, POLICIES
+from sudoku_explainer.search import get_backend
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import (
+    apply_masks,
+    board_to_masks,
+    board_to_string,
+    pack_masks,
+    parse_puzzle,
+    unpack_masks,
+)
+from web.ocr_jobs import OCR_JOBS, Job, QueueFull
+from web.services import (
+    SEARCH_BACKEND,
+    cache_stats,
+    get_rating,
+    get_solution_str,
+    get_trace,
+    request_budget,
+    solve_budget,
+)
+
+MAX_BATCH = 256
+# Longest a job poll may hold the request open
+MAX_JOB_WAIT = 30.0
+
+router = APIRouter(prefix="/api/v1")
+
+
+class PuzzleBatch(BaseModel):
+    puzzles: List[str]
+
+
+class BoardState(BaseModel):
+    puzzle: str
+    candidates: Optional[str] = None  # packed bitmasks; derived from puzzle if omitted
+
+
+class StepBatch(BaseModel):
+    boards: List[BoardState]
+    policy: str = DEFAULT_POLICY  # strategy ordering: "human" or "fast"
+
+
+class HintRequest(BoardState):
+    row: int
+    col: int
+    scope: str = "cell"  # "cell", or the "row", "col" or "box" through (row, col)
+
+
+class HintBatch(BaseModel):
+    boards: List[HintRequest]
+    policy: str = DEFAULT_POLICY
+
+
+class TraceBatch(PuzzleBatch):
+    policy: str = DEFAULT_POLICY
+
+
+def _check_batch(items: list) -> None:
+    if not items:
+        raise HTTPException(status_code=422, detail="Empty batch.")
+    if len(items) > MAX_BATCH:
+        raise HTTPException(
+            status_code=413, detail=f"At most {MAX_BATCH} puzzles per request."
+        )
+
+
+def _check_policy(policy: str) -> None:
+    if policy not in POLICIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown policy {policy!r}; choose from {', '.join(POLICIES)}.",
+        )
+
+
+def _per_puzzle(puzzles: List[str], fn) -> List[Dict[str, Any]]:
+    """Runs fn on each puzzle, reporting parse errors per item."""
+    results = []
+    for puzzle in puzzles:
+        try:
+            parse_puzzle(puzzle)
+            results.append({"puzzle": puzzle, **fn(puzzle)})
+        except ValueError as e:
+            results.append({"puzzle": puzzle, "error": str(e)})
+    return results
+
+
+@router.post("/solve")
+async def solve(batch: PuzzleBatch):
+    """Solves the batch within one request budget; once it is spent, puzzles
+    not already cached are reported as stopped."""
+    _check_batch(batch.puzzles)
+
+    def _solve(puzzle: str) -> Dict[str, Any]:
+        solution = get_solution_str(puzzle)
+        return {"solution": solution, "solved": "0" not in solution}
+
+    with solve_budget():
+        return {"results": _per_puzzle(batch.puzzles, _solve)}
+
+
+@router.post("/step")
+async def step(batch: StepBatch):
+    _check_batch(batch.boards)
+    _check_policy(batch.policy)
+    results = []
+    for state in batch.boards:
+        try:
+            board = parse_puzzle(state.puzzle)
+            if state.candidates:
+                apply_masks(board, unpack_masks(state.candidates))
+            step = SudokuSolver(board, policy=batch.policy).solve_step()
+            results.append(
+                {
+                    "puzzle": board_to_string(board),
+                    "candidates": pack_masks(board_to_masks(board)),
+                    "step": step.to_dict() if step else None,
+                    "solved": board.is_solved(),
+                }
+            )
+        except ValueError as e:
+            results.append({"puzzle": state.puzzle, "error": str(e)})
+    return {"results": results}
+
+
+@router.post("/hint")
+async def hint(batch: HintBatch):
+    """The cheapest deduction touching each board's region, not applied."""
+    _check_batch(batch.boards)
+    _check_policy(batch.policy)
+    results = []
+    for state in batch.boards:
+        try:
+            board = parse_puzzle(state.puzzle)
+            if state.candidates:
+                apply_masks(board, unpack_masks(state.candidates))
+            region = parse_region(board, state.scope, state.row, state.col)
+            step = find_hint(board, region, batch.policy)
+            results.append(
+                {"puzzle": state.puzzle, "step": step.to_dict() if step else None}
+            )
+        except ValueError as e:
+            results.append({"puzzle": state.puzzle, "error": str(e)})
+    return {"results": results}
+
+
+@router.post("/trace")
+async def trace(batch: TraceBatch):
+    _check_batch(batch.puzzles)
+    _check_policy(batch.policy)
+
+    def _trace(puzzle: str) -> Dict[str, Any]:
+        steps, final, solved = get_trace(puzzle, batch.policy)
+        return {
+            "steps": [s.to_dict() for s in steps],
+            "final": final,
+            "solved": solved,
+        }
+
+    return {"results": _per_puzzle(batch.puzzles, _trace)}
+
+
+@router.post("/validate")
+async def validate(batch: PuzzleBatch):
+    """Counts solutions of the batch within one request budget, like solve."""
+    _check_batch(batch.puzzles)
+
+    def _validate(puzzle: str) -> Dict[str, Any]:
+        board = parse_puzzle(puzzle)
+        solutions = get_backend(SEARCH_BACKEND).count(board, 2, request_budget())
+        return {
+            "valid": board.is_valid(),
+            "solvable": solutions > 0,
+            "unique": solutions == 1,
+        }
+
+    with solve_budget():
+        return {"results": _per_puzzle(batch.puzzles, _validate)}
+
+
+@router.post("/rate")
+async def rate(batch: PuzzleBatch):
+    _check_batch(batch.puzzles)
+    return {"results": _per_puzzle(batch.puzzles, get_rating)}
+
+
+@router.get("/cache")
+async def cache():
+    """Hit rates of this worker's caches and of the cross-worker cache."""
+    return cache_stats()
+
+
+async def _submit_ocr(files: List[UploadFile]) -> List[Job]:
+    _check_batch(files)
+    uploads = [(await file.read(), file.filename) for file in files]
+    try:
+        return OCR_JOBS.submit(uploads)
+    except QueueFull as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "5"}
+        ) from None
+
+
+@router.post("/ocr")
+async def ocr(files: List[UploadFile] = File(...)):
+    """Recognizes the images through the OCR queue and waits for the results."""
+    jobs = await _submit_ocr(files)
+    results = []
+    for job in jobs:
+        await job.wait()
+        if job.error:
+            results.append({"filename": job.filename, "error": job.error})
+        else:
+            results.append({"filename": job.filename, "puzzle": job.puzzle})
+    return {"results": results}
+
+
+@router.post("/ocr/jobs", status_code=202)
+async def submit_ocr_jobs(files: List[UploadFile] = File(...)):
+    """Queues the images and returns a job id per image to poll."""
+    return {"jobs": [job.to_dict() for job in await _submit_ocr(files)]}
+
+
+@router.get("/ocr/jobs/{job_id}")
+async def ocr_job(job_id: str, wait: float = 0.0):
+    """A job's status and result; wait up to `wait` seconds (at most 30) for it."""
+    job = OCR_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    if wait > 0 and not job.done:
+        await job.wait(min(wait, MAX_JOB_WAIT))
+    return {**job.to_dict(), "position": OCR_JOBS.position(job)}
+
+
+@router.get("/ocr/metrics")
+async def ocr_metrics():
+    """Queue depth, throughput and recent wait and processing times."""
+    return OCR_JOBS.metrics()
@@ -1,55 +1,96 @@
+import asyncio
+import hashlib
 import json
-from fastapi import FastAPI, Request, Form, UploadFile, File
-from fastapi.responses import HTMLResponse
+import math
+from functools import lru_cache
+from typing import Tuple
+from fastapi import FastAPI, Request, Form, UploadFile, File, WebSocket
+from fastapi import WebSocketDisconnect
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
-from sudoku_explainer.board import Board
+from sudoku_explainer.budget import Budget
+from sudoku_explainer.hints import describe_region, find_hint, parse_region
+from sudoku_explainer.policy import DEFAULT_POLICY
 from sudoku_explainer.solver import SudokuSolver
-from sudoku_explainer.utils import (
-    parse_puzzle,
-    board_to_string,
-    solve_sudoku_backtracking,
-)
+from sudoku_explainer.utils import parse_puzzle, board_to_string, normalize_grid_text
 from sudoku_explainer.puzzles import get_puzzles
-from sudoku_explainer.ocr import process_sudoku_image
+from web.api import router as api_router
+from web.ocr_jobs import OCR_JOBS, QueueFull, UploadLimitMiddleware
+from web.render import render_board, render_cells_oob
+from web.services import get_solution_str, get_store, solve_budget
+from web.session import GameSession, handle_message
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="web/static"), name="static")
 templates = Jinja2Templates(directory="web/templates")
+templates.env.globals["render_board"] = render_board
+app.include_router(api_router)
+app.add_middleware(
+    UploadLimitMiddleware, paths=("/import", "/api/v1/ocr", "/api/v1/ocr/jobs")
+)
 
+# Default puzzle (Hard)
+DEFAULT_PUZZLE = "000000010400000000020000000000050407008000300001090000300400200050100000000806000"
+INDEX_CACHE_CONTROL = "public, max-age=300"
+# Shortest idle interval a client may ask for server-pushed hints
+MIN_HINT_INTERVAL = 5.0
 
-def get_solution_str(puzzle_str: str) -> str:
-    board = parse_puzzle(puzzle_str)
-    # Try to solve logically first to reduce search space
-    solver = SudokuSolver(board)
-    for _ in solver.solve():
-        pass  # Just run it until solved or stuck
-
-    # Then finish with backtracking
-    solve_sudoku_backtracking(board)
-    return board_to_string(board)
 
+@lru_cache(maxsize=1)
+def render_index_page() -> Tuple[str, str]:
+    """Renders the landing page once. Returns (html, etag).
 
-@app.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    # Default puzzle (Hard)
-    default_puzzle = "000000010400000000020000000000050407008000300001090000300400200050100000000806000"
-    board = parse_puzzle(default_puzzle)
-    solution_str = get_solution_str(default_puzzle)
-    return templates.TemplateResponse(
-        "index.html",
+    The default puzzle is solved without limits: it is fixed, and a tight
+    SUDOKU_SOLVE_* budget must not stop the app from starting.
+    """
+    with solve_budget(Budget()):
+        solution_str = get_solution_str(DEFAULT_PUZZLE)
+    html = templates.get_template("index.html").render(
         {
-            "request": request,
-            "board": board,
-            "puzzle_str": default_puzzle,
-            "original_puzzle_str": default_puzzle,
+            "board": parse_puzzle(DEFAULT_PUZZLE),
+            "puzzle_str": DEFAULT_PUZZLE,
+            "original_puzzle_str": DEFAULT_PUZZLE,
             "solution_str": solution_str,
             "history": "[]",
             "puzzles": get_puzzles(),
             "explanation": "Click 'Next Step' to start solving.",
-        },
+        }
     )
+    etag = '"' + hashlib.sha1(html.encode("utf-8")).hexdigest() + '"'
+    return html, etag
+
+
+@app.on_event("startup")
+async def warm_caches():
+    render_index_page()
+
+
+@app.on_event("startup")
+async def start_ocr_workers():
+    await OCR_JOBS.start()
+
+
+@app.on_event("shutdown")
+async def flush_store():
+    store = get_store()
+    if store is not None:
+        store.flush()
+
+
+@app.on_event("shutdown")
+async def stop_ocr_workers():
+    await OCR_JOBS.stop()
+
+
+@app.get("/", response_class=HTMLResponse)
+async def index(request: Request):
+    html, etag = render_index_page()
+    headers = {"ETag": etag, "Cache-Control": INDEX_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers)
 
 
 @app.post("/step", response_class=HTMLResponse)
@@ -58,16 +99,17 @@ async def step(
     puzzle_str: str = Form(...),
     original_puzzle_str: str = Form(...),
     history: str = Form("[]"),
+    policy: str = Form(DEFAULT_POLICY),  # strategy ordering: "human" or "fast"
 ):
     try:
         history_list = json.loads(history)
         board = parse_puzzle(puzzle_str)
-        solver = SudokuSolver(board)
+        solver = SudokuSolver(board, policy=policy)
         step = solver.solve_step()
 
         explanation = "No more steps found or puzzle solved."
         if step:
-            explanation = f"<strong>{step['type']}</strong>: {step['explanation']}"
+            explanation = f"<strong>{step.type}</strong>: {step.explanation}"
             # Only append to history if a step was actually taken
             history_list.append(puzzle_str)
         elif board.is_solved():
@@ -94,6 +136,32 @@ async def step(
         return f"Error: {str(e)}"
 
 
+@app.post("/hint", response_class=HTMLResponse)
+async def hint(
+    puzzle_str: str = Form(...),
+    row: int = Form(-1),
+    col: int = Form(-1),
+    scope: str = Form("cell"),  # 'cell', 'row', 'col' or 'box' around (row, col)
+    policy: str = Form(DEFAULT_POLICY),
+):
+    """Explains the cheapest deduction around the selected cell, without taking it."""
+    try:
+        board = parse_puzzle(puzzle_str)
+        if row < 0 or col < 0:
+            # Nothing selected: the next step anywhere
+            step = SudokuSolver(board, policy=policy).solve_step()
+            where = "the board"
+        else:
+            region = parse_region(board, scope, row, col)
+            step = find_hint(board, region, policy)
+            where = describe_region(region)
+        if step:
+            return f"<strong>Hint ({step.type})</strong>: {step.explanation}"
+        return f"<strong>No hint</strong>: no logical step found for {where}."
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
 @app.post("/update", response_class=HTMLResponse)
 async def update_board(
     request: Request,
@@ -104,10 +172,12 @@ async def update_board(
     col: int = Form(...),
     value: int = Form(...),
     mode: str = Form(...),  # 'value' or 'note'
+    partial: bool = Form(False),  # only send changed cells as OOB swaps
 ):
     try:
         history_list = json.loads(history)
         board = parse_puzzle(puzzle_str)
+        previous_board = board.clone()
 
         # Check if trying to modify a fixed cell
         idx = row * 9 + col
@@ -121,7 +191,7 @@ async def update_board(
 
             if mode == "value":
                 if value == 0:
-                    board.grid[row][col] = 0
+                    board.clear_value(row, col)
                 else:
                     board.set_value(row, col, value)
             elif mode == "note":
@@ -133,21 +203,31 @@ async def update_board(
 
         new_puzzle_str = board_to_string(board)
         solution_str = get_solution_str(original_puzzle_str)
+        explanation = "Manual update."
+        if mode == "value" and value and (row, col) in board.conflict_cells():
+            explanation = (
+                f"<strong>Conflict</strong>: {value} is already in this cell's "
+                "row, column or box."
+            )
+        context = {
+            "request": request,
+            "board": board,
+            "puzzle_str": new_puzzle_str,
+            "original_puzzle_str": original_puzzle_str,
+            "solution_str": solution_str,
+            "history": json.dumps(history_list),
+            "explanation": explanation,
+            "selected_row": row,
+            "selected_col": col,
+        }
 
-        return templates.TemplateResponse(
-            "partials/update_response.html",
-            {
-                "request": request,
-                "board": board,
-                "puzzle_str": new_puzzle_str,
-                "original_puzzle_str": original_puzzle_str,
-                "solution_str": solution_str,
-                "history": json.dumps(history_list),
-                "explanation": "Manual update.",
-                "selected_row": row,
-                "selected_col": col,
-            },
-        )
+        if partial:
+            context["cells"] = render_cells_oob(
+                previous_board, board, original_puzzle_str, row, col, solution_str
+            )
+            return templates.TemplateResponse("partials/cells_update.html", context)
+
+        return templates.TemplateResponse("partials/update_response.html", context)
     except Exception as e:
         return f"Error updating: {str(e)}"
 
@@ -184,8 +264,8 @@ async def undo(
 @app.post("/new", response_class=HTMLResponse)
 async def new_puzzle(request: Request, puzzle_input: str = Form(...)):
     try:
-        # Basic validation
-        clean_input = "".join(c for c in puzzle_input if c.isdigit())
+        # Basic validation; '.' and other blank markers count as empty cells
+        clean_input = normalize_grid_text(puzzle_input)
         if len(clean_input) < 81:
             clean_input = clean_input.ljust(81, "0")
         elif len(clean_input) > 81:
@@ -212,47 +292,112 @@ async def new_puzzle(request: Request, puzzle_input: str = Form(...)):
 
 @app.post("/import", response_class=HTMLResponse)
 async def import_puzzle(request: Request, file: UploadFile = File(...)):
+    """Queues the image for OCR; the returned status polls /import/{job_id}."""
     try:
-        contents = await file.read()
-        puzzle_str, error = process_sudoku_image(contents)
+        (job,) = OCR_JOBS.submit([(await file.read(), file.filename)])
+    except QueueFull:
+        return HTMLResponse(
+            "Too many images are being processed. Please try again shortly.",
+            status_code=429,
+            headers={"Retry-After": "5"},
+        )
+    return templates.TemplateResponse(
+        "partials/ocr_job.html",
+        {"request": request, "job": job, "position": OCR_JOBS.position(job)},
+    )
 
-        if error:
-            return f"Error processing image: {error}"
 
-        # Validate length
-        if len(puzzle_str) != 81:
-            return f"Error: Detected {len(puzzle_str)} digits, expected 81."
+@app.get("/import/{job_id}", response_class=HTMLResponse)
+async def import_result(request: Request, job_id: str):
+    job = OCR_JOBS.get(job_id)
+    if job is None:
+        return "This upload has expired. Please upload the image again."
+    # Hold the poll briefly so a finishing job answers without another round trip
+    if not await job.wait(timeout=1.0):
+        return templates.TemplateResponse(
+            "partials/ocr_job.html",
+            {"request": request, "job": job, "position": OCR_JOBS.position(job)},
+        )
+    if job.error:
+        return f"Error processing image: {job.error}"
+
+    puzzle_str = job.puzzle
+    # Validate length
+    if len(puzzle_str) != 81:
+        return f"Error: Detected {len(puzzle_str)} digits, expected 81."
 
+    try:
         board = parse_puzzle(puzzle_str)
         solution_str = get_solution_str(puzzle_str)
+    except ValueError as e:
+        return f"Error: {e}"
 
-        return templates.TemplateResponse(
-            "partials/update_response.html",
-            {
-                "request": request,
-                "board": board,
-                "puzzle_str": puzzle_str,
-                "original_puzzle_str": puzzle_str,
-                "solution_str": solution_str,
-                "history": "[]",
-                "explanation": "Imported from image.",
-            },
-        )
-    except Exception as e:
-        print(f"Upload error: {e}")
-        # Return a valid response even on error so the UI doesn't break
-        # We'll use a dummy board or the current one if we had access to it, but here we don't.
-        # Let's return an empty board with the error message.
-        empty_board = Board()
-        return templates.TemplateResponse(
-            "partials/update_response.html",
-            {
-                "request": request,
-                "board": empty_board,
-                "puzzle_str": "0" * 81,
-                "original_puzzle_str": "0" * 81,
-                "solution_str": "0" * 81,
-                "history": "[]",
-                "explanation": f"<strong>Error:</strong> {str(e)}",
-            },
-        )
+    # The form targets the status line; the imported board replaces the board
+    return templates.TemplateResponse(
+        "partials/update_response.html",
+        {
+            "request": request,
+            "board": board,
+            "puzzle_str": puzzle_str,
+            "original_puzzle_str": puzzle_str,
+            "solution_str": solution_str,
+            "history": "[]",
+            "explanation": "Imported from image.",
+            "clear_ocr_status": True,
+        },
+        headers={"HX-Retarget": "#board-container-wrapper", "HX-Reswap": "innerHTML"},
+    )
+
+
+@app.websocket("/ws")
+async def game_channel(websocket: WebSocket):
+    """Interactive session: small JSON messages in, cell diffs out.
+
+    Besides the GameSession messages, a client may send
+    {"type": "hints", "interval": seconds} to have a hint pushed whenever it
+    stays idle that long (0 or less turns it off).
+    """
+    await websocket.accept()
+    try:
+        session = GameSession(websocket.query_params.get("puzzle", DEFAULT_PUZZLE))
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1003)
+        return
+    await websocket.send_json(session.state())
+    hint_interval = None
+
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    websocket.receive_json(), timeout=hint_interval
+                )
+            except asyncio.TimeoutError:
+                await websocket.send_json(session.hint())
+                continue
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "message": "Bad JSON."})
+                continue
+
+            if message.get("type") == "hints":
+                try:
+                    interval = float(message.get("interval") or 0)
+                except (TypeError, ValueError):
+                    interval = math.inf
+                if not math.isfinite(interval):
+                    await websocket.send_json(
+                        {"type": "error", "message": "Bad hint interval."}
+                    )
+                    continue
+                # Zero or negative turns hints off
+                hint_interval = (
+                    max(interval, MIN_HINT_INTERVAL) if interval > 0 else None
+                )
+                continue
+
+            await websocket.send_json(handle_message(session, message))
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,260 @@
+"""Background OCR jobs: a bounded queue in front of a fixed pool of workers.
+
+Uploads are capped while they stream in (UploadLimitMiddleware), then
+queued as jobs. At most OCR_WORKERS images are processed at once, in a
+thread pool so the event loop stays free; at most OCR_QUEUE_SIZE wait
+behind them, and submissions beyond that are refused with QueueFull (the
+routes answer 429). Clients poll a job by id, or wait on it.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from sudoku_explainer.ocr import process_sudoku_image
+
+# Largest request body accepted on the upload routes
+MAX_UPLOAD_BYTES = int(os.environ.get("SUDOKU_MAX_UPLOAD_BYTES", str(8 << 20)))
+OCR_WORKERS = int(os.environ.get("SUDOKU_OCR_WORKERS", "2"))
+OCR_QUEUE_SIZE = int(os.environ.get("SUDOKU_OCR_QUEUE_SIZE", "16"))
+# Finished jobs kept for polling, oldest dropped first
+FINISHED_JOBS = 1024
+# Recent wait and processing times kept for the metrics
+SAMPLES = 1024
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised by OcrQueue.submit when no queue slot is free."""
+
+
+class Job:
+    def __init__(self, image: bytes, filename: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.image: Optional[bytes] = image  # dropped once processed
+        self.status = QUEUED
+        self.puzzle: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._done = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits up to timeout seconds for the job to finish. Returns done."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.done
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+        }
+        if self.status == DONE:
+            result["puzzle"] = self.puzzle
+        elif self.status == FAILED:
+            result["error"] = self.error
+        return result
+
+
+class OcrQueue:
+    def __init__(self, workers: int = OCR_WORKERS, size: int = OCR_QUEUE_SIZE):
+        self.workers = workers
+        self.size = size
+        self._queue: Optional["asyncio.Queue[Job]"] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._running = 0
+        self._counts = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._wait: Deque[float] = deque(maxlen=SAMPLES)
+        self._process: Deque[float] = deque(maxlen=SAMPLES)
+
+    async def start(self) -> None:
+        """Starts the workers on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(self.size)
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="ocr")
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def submit(self, uploads: Sequence[Tuple[bytes, Optional[str]]]) -> List[Job]:
+        """Queues one job per (image, filename), all or none.
+
+        Raises QueueFull if the queue cannot take them all.
+        """
+        if self._queue is None:
+            raise RuntimeError("OCR queue is not started.")
+        free = self.size - self._queue.qsize()
+        if free < len(uploads):
+            self._counts["rejected"] += len(uploads)
+            raise QueueFull(
+                f"OCR queue is full: {free} of {self.size} slots free "
+                f"for {len(uploads)} images."
+            )
+        jobs = []
+        for image, filename in uploads:
+            job = Job(image, filename)
+            self._jobs[job.id] = job
+            self._queue.put_nowait(job)
+            jobs.append(job)
+        self._counts["submitted"] += len(jobs)
+        return jobs
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def position(self, job: Job) -> int:
+        """Jobs queued ahead of job (0 once it is running or done)."""
+        if job.status != QUEUED or self._queue is None:
+            return 0
+        ahead = 0
+        for other in self._jobs.values():
+            if other is job:
+                break
+            ahead += other.status == QUEUED
+        return ahead
+
+    async def _work(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started = time.monotonic()
+            self._wait.append(job.started - job.submitted)
+            self._running += 1
+            try:
+                puzzle, error = await loop.run_in_executor(
+                    self._executor, process_sudoku_image, job.image
+                )
+            except Exception as e:  # process_sudoku_image reports its own errors
+                puzzle, error = None, str(e)
+            finally:
+                self._running -= 1
+            job.image = None
+            job.finished = time.monotonic()
+            self._process.append(job.finished - job.started)
+            if error:
+                job.status, job.error = FAILED, error
+                self._counts["failed"] += 1
+            else:
+                job.status, job.puzzle = DONE, puzzle
+                self._counts["completed"] += 1
+            job._done.set()
+            self._queue.task_done()
+            self._forget_old()
+
+    def _forget_old(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "capacity": self.size,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            **self._counts,
+            "wait_ms": _summary(self._wait),
+            "process_ms": _summary(self._process),
+        }
+
+
+def _summary(samples: Sequence[float]) -> Dict[str, float]:
+    """Count, mean, median, 95th percentile and max of recent samples, in ms."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "count": n,
+        "mean": round(sum(ordered) * 1000 / n, 3),
+        "p50": round(ordered[n // 2] * 1000, 3),
+        "p95": round(ordered[min(n - 1, n * 95 // 100)] * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class UploadLimitMiddleware:
+    """Refuses request bodies over max_bytes on the given paths with 413.
+
+    Checks Content-Length up front, then counts the body as it streams in,
+    so an oversized upload is cut off without being read or spooled.
+    """
+
+    def __init__(self, app, paths: Sequence[str], max_bytes: int = MAX_UPLOAD_BYTES):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        length = dict(scope["headers"]).get(b"content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_bytes:
+            await self._refuse(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _detail(self) -> str:
+        return f"Upload larger than {self.max_bytes // 1024} KiB."
+
+    async def _refuse(self, send) -> None:
+        body = self._detail().encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+OCR_JOBS = OcrQueue()
@@ -0,0 +1,210 @@
+"""Board rendering for the HTMX views.
+
+The board is reduced to a compact key (81-char values string plus one
+candidate bitmask per cell) and each cell's HTML fragment is memoized on
+its own key, so re-rendering a board only formats cells never seen before.
+"""
+
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+from markupsafe import Markup
+
+from sudoku_explainer.board import Board
+from sudoku_explainer.utils import board_to_string, candidate_mask
+
+BoardKey = Tuple[str, Tuple[int, ...]]
+
+
+def board_key(board: Board) -> BoardKey:
+    """Returns the compact (values, candidate masks) key for a board."""
+    values = "".join(str(v) for row in board.grid for v in row)
+    masks = tuple(candidate_mask(cands) for row in board.candidates for cands in row)
+    return values, masks
+
+
+def find_mistakes(
+    board: Board, original_puzzle_str: str, solution_str: str
+) -> FrozenSet[int]:
+    """Indices of entered digits (not clues) that differ from the solution.
+
+    Cells the solution leaves open (an unsolvable puzzle) are never mistakes.
+    """
+    if not solution_str:
+        return frozenset()
+    cells = zip(board_to_string(board), original_puzzle_str, solution_str)
+    return frozenset(
+        idx
+        for idx, (value, clue, answer) in enumerate(cells)
+        if value != "0" and clue == "0" and answer != "0" and value != answer
+    )
+
+
+def find_conflicts(board: Board) -> FrozenSet[int]:
+    """Indices of digits repeated in their row, column or box."""
+    if not board.conflicts:
+        return frozenset()
+    return frozenset(r * 9 + c for r, c in board.conflict_cells())
+
+
+@lru_cache(maxsize=8192)
+def render_cell(
+    row: int,
+    col: int,
+    value: int,
+    mask: int,
+    is_fixed: bool,
+    selected: bool,
+    oob: bool = False,
+    mistake: bool = False,
+    conflict: bool = False,
+) -> str:
+    """Renders one cell div. Memoized on the compact cell key.
+
+    Conflicts are always marked; mistakes only carry data-mistake, which the
+    page highlights when "Show Mistakes" is on.
+    """
+    classes = ["cell"]
+    if (col + 1) % 3 == 0 and col != 8:
+        classes.append("border-right")
+    if value != 0:
+        classes.append("filled")
+    if selected:
+        classes.append("selected")
+    if is_fixed:
+        classes.append("fixed")
+    if conflict:
+        classes.append("conflict")
+    fixed = "true" if is_fixed else "false"
+
+    if value != 0:
+        inner = f'<span class="value">{value}</span>'
+    else:
+        spots = "".join(
+            f'<span class="cand-spot">{i if mask >> i & 1 else ""}</span>'
+            for i in range(1, 10)
+        )
+        inner = f'<div class="candidates-grid">{spots}</div>'
+
+    swap = ' hx-swap-oob="outerHTML"' if oob else ""
+    flag = ' data-mistake="true"' if mistake else ""
+    return (
+        f'<div class="{" ".join(classes)}"{swap}'
+        f' onclick="selectCell(this, {row}, {col}, {fixed})"'
+        f' onmouseenter="handleMouseEnter({row}, {col})"'
+        f' onmouseleave="handleMouseLeave()"'
+        f' data-row="{row}" data-col="{col}" data-value="{value}"'
+        f' data-fixed="{fixed}"{flag} id="cell-{row}-{col}">{inner}</div>'
+    )
+
+
+def render_board_rows(
+    key: BoardKey,
+    original_puzzle_str: str,
+    selected_row: int,
+    selected_col: int,
+    mistakes: FrozenSet[int] = frozenset(),
+    conflicts: FrozenSet[int] = frozenset(),
+) -> str:
+    """Renders the nine board rows for a compact board key."""
+    values, masks = key
+    rows = []
+    for row in range(9):
+        row_class = "board-row"
+        if (row + 1) % 3 == 0 and row != 8:
+            row_class += " border-bottom"
+        cells = []
+        for col in range(9):
+            idx = row * 9 + col
+            cells.append(
+                render_cell(
+                    row,
+                    col,
+                    int(values[idx]),
+                    masks[idx],
+                    original_puzzle_str[idx] != "0",
+                    row == selected_row and col == selected_col,
+                    mistake=idx in mistakes,
+                    conflict=idx in conflicts,
+                )
+            )
+        rows.append(f'<div class="{row_class}">{"".join(cells)}</div>')
+    return "\n".join(rows)
+
+
+def render_board(
+    board: Board,
+    original_puzzle_str: str,
+    selected_row=-1,
+    selected_col=-1,
+    solution_str="",
+) -> Markup:
+    """Jinja helper: renders the full grid of a board, marking repeated
+    digits and, given the solution, wrong entries."""
+    return Markup(
+        render_board_rows(
+            board_key(board),
+            original_puzzle_str,
+            _as_index(selected_row),
+            _as_index(selected_col),
+            find_mistakes(board, original_puzzle_str, _as_str(solution_str)),
+            find_conflicts(board),
+        )
+    )
+
+
+def changed_cells(old: BoardKey, new: BoardKey) -> List[int]:
+    """Returns the indices of cells whose value or candidates differ."""
+    old_values, old_masks = old
+    new_values, new_masks = new
+    return [
+        idx
+        for idx in range(81)
+        if old_values[idx] != new_values[idx] or old_masks[idx] != new_masks[idx]
+    ]
+
+
+def render_cells_oob(
+    old_board: Board,
+    new_board: Board,
+    original_puzzle_str: str,
+    selected_row=-1,
+    selected_col=-1,
+    solution_str="",
+) -> Markup:
+    """Renders only the cells that changed, as out-of-band swaps, plus any
+    cell that started or stopped repeating a digit."""
+    values, masks = board_key(new_board)
+    selected_row = _as_index(selected_row)
+    selected_col = _as_index(selected_col)
+    mistakes = find_mistakes(new_board, original_puzzle_str, solution_str)
+    conflicts = find_conflicts(new_board)
+    changed = set(changed_cells(board_key(old_board), (values, masks)))
+    changed |= conflicts ^ find_conflicts(old_board)
+    fragments = []
+    for idx in sorted(changed):
+        row, col = divmod(idx, 9)
+        fragments.append(
+            render_cell(
+                row,
+                col,
+                int(values[idx]),
+                masks[idx],
+                original_puzzle_str[idx] != "0",
+                row == selected_row and col == selected_col,
+                oob=True,
+                mistake=idx in mistakes,
+                conflict=idx in conflicts,
+            )
+        )
+    return Markup("\n".join(fragments))
+
+
+def _as_index(value) -> int:
+    # Template callers may pass an undefined selection
+    return value if isinstance(value, int) else -1
+
+
+def _as_str(value) -> str:
+    # ... or an undefined solution
+    return value if isinstance(value, str) else ""
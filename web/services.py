@@ -0,0 +1,169 @@
+"""Solver calls shared by the HTML views and the JSON API.
+
+Results are memoized per puzzle string so both surfaces hit the same caches.
+With SUDOKU_SHARED_CACHE set, misses of the per-process caches go next to a
+cache file shared by every worker on the host (see web.shared_cache).
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from sudoku_explainer.budget import Budget, BudgetExceeded
+from sudoku_explainer.policy import DEFAULT_POLICY
+from sudoku_explainer.rating import rate_board
+from sudoku_explainer.search import DEFAULT_BACKEND
+from sudoku_explainer.solver import SudokuSolver, solve_board
+from sudoku_explainer.step import Step
+from sudoku_explainer.store import SolutionStore, decode_trace, encode_trace
+from sudoku_explainer.utils import board_to_string, parse_puzzle
+from web.shared_cache import SharedSlotCache
+
+# Path of the SQLite solved-puzzle store; unset disables it
+STORE_PATH = os.environ.get("SUDOKU_STORE")
+
+# Per-request solve budget, so a pathological puzzle cannot pin a worker
+SOLVE_TIME_LIMIT = float(os.environ.get("SUDOKU_SOLVE_TIME_LIMIT", "2.0"))
+SOLVE_NODE_LIMIT = int(os.environ.get("SUDOKU_SOLVE_NODE_LIMIT", "200000"))
+
+
+# Search backend (see sudoku_explainer.search.BACKENDS) behind the logic
+SEARCH_BACKEND = os.environ.get("SUDOKU_SEARCH_BACKEND", DEFAULT_BACKEND)
+
+
+# Path of the cross-worker result cache file; unset disables it
+SHARED_CACHE_PATH = os.environ.get("SUDOKU_SHARED_CACHE")
+SHARED_CACHE_SLOTS = int(os.environ.get("SUDOKU_SHARED_CACHE_SLOTS", "16384"))
+
+# Digit relabelling that leaves trace digits as they are
+_SAME_DIGITS = {d: d for d in "0123456789"}
+
+
+# Budget shared by every solve of the current request (see solve_budget)
+_current_budget: ContextVar[Optional[Budget]] = ContextVar(
+    "current_budget", default=None
+)
+
+
+def request_budget() -> Budget:
+    """The budget of the enclosing solve_budget block, else a fresh one."""
+    budget = _current_budget.get()
+    if budget is None:
+        budget = Budget(time_limit=SOLVE_TIME_LIMIT, node_limit=SOLVE_NODE_LIMIT)
+    return budget
+
+
+@contextmanager
+def solve_budget(budget: Optional[Budget] = None) -> Iterator[Budget]:
+    """Has every solve inside the block draw on one budget, by default a
+    fresh per-request one; e.g. all the puzzles of a batch request. Once it
+    is spent, solves that are not cached raise BudgetExceeded.
+    """
+    token = _current_budget.set(budget if budget is not None else request_budget())
+    try:
+        yield _current_budget.get()
+    finally:
+        _current_budget.reset(token)
+
+
+@lru_cache(maxsize=1)
+def get_store() -> Optional[SolutionStore]:
+    return SolutionStore(STORE_PATH) if STORE_PATH else None
+
+
+@lru_cache(maxsize=1)
+def get_shared_cache() -> Optional[SharedSlotCache]:
+    """The cross-worker cache, or None. Any object with the same get(namespace,
+    key) and put(namespace, key, value) over bytes can stand in for it."""
+    if not SHARED_CACHE_PATH:
+        return None
+    return SharedSlotCache(SHARED_CACHE_PATH, slots=SHARED_CACHE_SLOTS)
+
+
+@lru_cache(maxsize=1024)
+def get_solution_str(puzzle_str: str) -> str:
+    """Solution of a puzzle, within the request's budget (request_budget).
+
+    Raises BudgetExceeded (a ValueError) when the budget runs out; that is
+    not cached, but every retry is bounded by a fresh budget.
+    """
+    shared = get_shared_cache()
+    if shared is not None:
+        cached = shared.get("solution", puzzle_str)
+        if cached is not None:
+            return cached.decode("ascii")
+    solution = _solve(puzzle_str)
+    if shared is not None:
+        shared.put("solution", puzzle_str, solution.encode("ascii"))
+    return solution
+
+
+def _solve(puzzle_str: str) -> str:
+    budget = request_budget()
+    store = get_store()
+    if store is not None:
+        entry = store.lookup_or_solve(
+            puzzle_str, budget, SEARCH_BACKEND, complete=False
+        )
+        if entry.solution:
+            return entry.solution
+
+    # Logical steps first to reduce the search space, then backtracking
+    result = solve_board(
+        parse_puzzle(puzzle_str), budget, backend=SEARCH_BACKEND, sweep=True
+    )
+    if result.reason not in ("solved", "unsolvable"):
+        raise BudgetExceeded(result.reason)
+    return board_to_string(result.board)
+
+
+@lru_cache(maxsize=1024)
+def get_trace(
+    puzzle_str: str, policy: str = DEFAULT_POLICY
+) -> Tuple[Tuple[Step, ...], str, bool]:
+    """Returns (steps, final board string, solved) of the logical solve."""
+    shared = get_shared_cache()
+    key = f"{policy}:{puzzle_str}"
+    if shared is not None:
+        cached = shared.get("trace", key)
+        if cached is not None:
+            # Solved flag, final board, then the compressed steps
+            steps = decode_trace(cached[82:], _SAME_DIGITS)
+            return tuple(steps), cached[1:82].decode("ascii"), cached[:1] == b"1"
+
+    board = parse_puzzle(puzzle_str)
+    solver = SudokuSolver(board, policy=policy)
+    for _ in solver.solve():
+        pass
+    final, solved = board_to_string(board), board.is_solved()
+    if shared is not None:
+        flag = b"1" if solved else b"0"
+        blob = encode_trace(solver.steps, _SAME_DIGITS)
+        shared.put("trace", key, flag + final.encode("ascii") + blob)
+    return tuple(solver.steps), final, solved
+
+
+@lru_cache(maxsize=1024)
+def get_rating(puzzle_str: str) -> Dict[str, Any]:
+    shared = get_shared_cache()
+    if shared is not None:
+        cached = shared.get("rating", puzzle_str)
+        if cached is not None:
+            return json.loads(cached)
+    rating = rate_board(parse_puzzle(puzzle_str))
+    if shared is not None:
+        shared.put("rating", puzzle_str, json.dumps(rating).encode("ascii"))
+    return rating
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit counts of this worker's caches and of the shared cache (None if off)."""
+    local = {
+        fn.__name__: fn.cache_info()._asdict()
+        for fn in (get_solution_str, get_trace, get_rating)
+    }
+    shared = get_shared_cache()
+    return {"local": local, "shared": shared.stats() if shared is not None else None}
@@ -0,0 +1,185 @@
+"""Live game state behind the WebSocket channel.
+
+A GameSession keeps the board and solver for one connection, so messages
+only carry the move itself and replies only carry the cells that changed.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sudoku_explainer.budget import BudgetExceeded
+from sudoku_explainer.geometry import Region
+from sudoku_explainer.hints import describe_region, find_hint, parse_region
+from sudoku_explainer.solver import SudokuSolver
+from sudoku_explainer.utils import (
+    board_to_masks,
+    board_to_string,
+    pack_masks,
+    parse_puzzle,
+)
+from web.render import board_key, changed_cells, find_conflicts, find_mistakes
+from web.services import get_solution_str
+
+
+class GameSession:
+    def __init__(self, puzzle_str: str):
+        self.load(puzzle_str)
+
+    def load(self, puzzle_str: str) -> Dict[str, Any]:
+        self.board = parse_puzzle(puzzle_str)
+        self.original_puzzle_str = puzzle_str
+        self.solver = SudokuSolver(self.board)
+        self.history: List[str] = []
+        self._solution: Optional[str] = None
+        self._solution_failed = False
+        return self.state()
+
+    def state(self) -> Dict[str, Any]:
+        """Full snapshot, sent once after connect or load. The solution is
+        left out if it could not be found within the solve budget."""
+        state = {
+            "type": "state",
+            "puzzle": board_to_string(self.board),
+            "original": self.original_puzzle_str,
+            "candidates": pack_masks(board_to_masks(self.board)),
+        }
+        solution = self.solution()
+        if solution is not None:
+            state["solution"] = solution
+        return {**state, **self._marks()}
+
+    def solution(self) -> Optional[str]:
+        """Solution of the loaded puzzle, or None if the solve ran out of
+        budget. A failure is remembered, so it costs one budget per session."""
+        if self._solution is None and not self._solution_failed:
+            try:
+                self._solution = get_solution_str(self.original_puzzle_str)
+            except BudgetExceeded:
+                self._solution_failed = True
+        return self._solution
+
+    def _marks(self) -> Dict[str, List[int]]:
+        """Indices of entries that differ from the solution (none if it is
+        unknown), and of digits repeated in their row, column or box."""
+        solution = self.solution()
+        mistakes = (
+            find_mistakes(self.board, self.original_puzzle_str, solution)
+            if solution is not None
+            else ()
+        )
+        return {
+            "mistakes": sorted(mistakes),
+            "conflicts": sorted(find_conflicts(self.board)),
+        }
+
+    def move(
+        self, row: int, col: int, value: int, mode: str = "value"
+    ) -> Dict[str, Any]:
+        idx = row * 9 + col
+        if not (0 <= row < 9 and 0 <= col < 9 and 0 <= value <= 9):
+            return _error("Move out of range.")
+        if mode == "value" and self.original_puzzle_str[idx] != "0":
+            return self._diff(board_key(self.board), "Fixed cell.")
+
+        before = board_key(self.board)
+        if mode == "value":
+            self.history.append(board_to_string(self.board))
+            if value == 0:
+                self.board.clear_value(row, col)
+            else:
+                self.board.set_value(row, col, value)
+        elif mode == "note" and value != 0:
+            if value in self.board.candidates[row][col]:
+                self.board.remove_candidate(row, col, value)
+            else:
+                self.board.add_candidate(row, col, value)
+        return self._diff(before, "Manual update.")
+
+    def step(self) -> Dict[str, Any]:
+        before = board_key(self.board)
+        snapshot = board_to_string(self.board)
+        step = self.solver.solve_step()
+        if step:
+            self.history.append(snapshot)
+            explanation = f"<strong>{step.type}</strong>: {step.explanation}"
+        elif self.board.is_solved():
+            explanation = "<strong>Solved!</strong> The puzzle is complete."
+        else:
+            explanation = "<strong>Stuck!</strong> No logical step found."
+        return self._diff(before, explanation)
+
+    def undo(self) -> Dict[str, Any]:
+        if not self.history:
+            return _error("No history to undo.")
+        before = board_key(self.board)
+        self.board = parse_puzzle(self.history.pop())
+        self.solver = SudokuSolver(self.board)
+        return self._diff(before, "Undid last step.")
+
+    def hint(self, region: Optional[Region] = None) -> Dict[str, Any]:
+        """Finds the next logical step, or the cheapest one touching region,
+        without applying it."""
+        if region is None:
+            step = SudokuSolver(self.board.clone()).solve_step()
+            where = "the board"
+        else:
+            step = find_hint(self.board, region)
+            where = describe_region(region)
+        if not step:
+            explanation = f"No logical step found for {where}."
+            return {"type": "hint", "explanation": explanation}
+        return {
+            "type": "hint",
+            "strategy": step.type,
+            "explanation": step.explanation,
+        }
+
+    def _diff(self, before, explanation: str) -> Dict[str, Any]:
+        values, masks = after = board_key(self.board)
+        return {
+            "type": "diff",
+            "cells": [
+                [idx, int(values[idx]), masks[idx]]
+                for idx in changed_cells(before, after)
+            ],
+            "explanation": explanation,
+            "solved": self.board.is_solved(),
+            "can_undo": bool(self.history),
+            **self._marks(),
+        }
+
+
+def handle_message(session: GameSession, message: Dict[str, Any]) -> Dict[str, Any]:
+    """Dispatches one client message and returns the reply."""
+    kind = message.get("type")
+    try:
+        if kind == "move":
+            return session.move(
+                int(message["row"]),
+                int(message["col"]),
+                int(message["value"]),
+                message.get("mode", "value"),
+            )
+        if kind == "step":
+            return session.step()
+        if kind == "undo":
+            return session.undo()
+        if kind == "hint":
+            if "row" not in message and "col" not in message:
+                return session.hint()
+            return session.hint(
+                parse_region(
+                    session.board,
+                    message.get("scope", "cell"),
+                    int(message.get("row", 0)),
+                    int(message.get("col", 0)),
+                )
+            )
+        if kind == "load":
+            return session.load(str(message["puzzle"]))
+    except (KeyError, ValueError) as e:
+        return _error(f"Bad message: {e}")
+    return _error(f"Unknown message type: {kind}")
+
+
+def _error(message: str) -> Dict[str, Any]:
+    return {"type": "error", "message": message}
@@ -0,0 +1,265 @@
+"""Result cache shared by the worker processes of one host.
+
+A memory-mapped file of fixed-size slots, keyed by a 16-byte BLAKE2b hash
+of (namespace, key). Slots are grouped in sets of WAYS; a key lives in one
+set and evicts a random slot of it when the set is full. Readers take no
+lock: every slot carries the payload length and a CRC32 of key digest and
+payload, and a reader copies the payload, then checks the CRC and that the
+slot still holds its key, so a slot torn or taken over by a concurrent
+write reads as a miss. Writers serialize on an advisory file lock (and,
+within a process, a thread lock).
+
+The first page holds the layout, slot occupancy and one statistics row per
+worker process (pid, hits, misses, stores, evictions, oversize values), so
+stats() reports hit rate and memory across all workers. Rows of exited
+workers are reused by new ones and keep their counts.
+"""
+
+import mmap
+import os
+import random
+import struct
+import threading
+import zlib
+from hashlib import blake2b
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers may race, readers still verify
+    fcntl = None
+
+MAGIC = b"SDSC"
+VERSION = 2
+HEADER = struct.Struct("<4sIIII")  # magic, version, slots, slot size, ways
+USAGE = struct.Struct("<QQ")  # used slots, payload bytes held (after HEADER)
+WORKER = struct.Struct("<IQQQQQ")  # pid, hits, misses, stores, evictions, oversize
+SLOT = struct.Struct("<16sII")  # key digest, payload length, crc32 of both
+PAGE = 4096
+WORKERS_OFFSET = 64
+MAX_WORKERS = (PAGE - WORKERS_OFFSET) // WORKER.size
+WAYS = 4
+_EMPTY = bytes(16)
+# Counter fields of a worker row, after the pid
+_HITS, _MISSES, _STORES, _EVICTIONS, _OVERSIZE = range(5)
+
+
+class SharedSlotCache:
+    """Fixed-size, cross-process map from (namespace, key) to bytes."""
+
+    def __init__(self, path: str, slots: int = 16384, slot_size: int = 1024):
+        if slots < WAYS or slots % WAYS:
+            raise ValueError(f"Slots must be a positive multiple of {WAYS}.")
+        if slot_size <= SLOT.size:
+            raise ValueError(f"Slots must be larger than {SLOT.size} bytes.")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.capacity = slot_size - SLOT.size  # largest payload
+        self.size = PAGE + slots * slot_size
+        self._sets = slots // WAYS
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+        # Threads share the descriptor, and with it the file lock
+        self._write_lock = threading.Lock()
+        self._count_lock = threading.Lock()
+        self._lock()
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(
+                    self._fd, HEADER.pack(MAGIC, VERSION, slots, slot_size, WAYS), 0
+                )
+            self._map = mmap.mmap(self._fd, 0)
+            if hasattr(mmap, "MADV_RANDOM"):
+                # Lookups touch one set each; don't map neighbouring pages in
+                self._map.madvise(mmap.MADV_RANDOM)
+            magic, version, file_slots, file_slot_size, ways = HEADER.unpack_from(
+                self._map, 0
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a shared cache file.")
+            if version != VERSION:
+                raise ValueError(
+                    f"{path} is a version {version} shared cache; remove it."
+                )
+            if (file_slots, file_slot_size, ways) != (slots, slot_size, WAYS):
+                raise ValueError(
+                    f"{path} holds {file_slots} slots of {file_slot_size} bytes; "
+                    "remove it to change the layout."
+                )
+            self._claim_row()
+        finally:
+            self._unlock()
+
+    def _lock(self) -> None:
+        self._write_lock.acquire()
+        if os.getpid() != self._pid:
+            self._after_fork()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._write_lock.release()
+
+    def _claim_row(self) -> None:
+        """Takes this process's statistics row (called with the lock held)."""
+        self._pid = pid = os.getpid()
+        self._row: Optional[int] = None
+        free = None
+        for row in range(MAX_WORKERS):
+            owner = WORKER.unpack_from(self._map, _row_offset(row))[0]
+            if owner == pid:
+                self._row = row
+                return
+            if free is None and (owner == 0 or not _alive(owner)):
+                free = row
+        if free is not None:
+            self._row = free
+            struct.pack_into("<I", self._map, _row_offset(free), pid)
+
+    def _after_fork(self) -> None:
+        """Reopens the file in a forked child, whose inherited descriptor
+        would share the parent's lock, and takes a statistics row.
+
+        Called with the thread lock held.
+        """
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._count_lock = threading.Lock()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            self._claim_row()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _count(self, field: int) -> None:
+        if os.getpid() != self._pid:
+            self._lock()
+            self._unlock()
+        if self._row is None:
+            return
+        offset = _row_offset(self._row) + 4 + 8 * field
+        with self._count_lock:
+            (value,) = struct.unpack_from("<Q", self._map, offset)
+            struct.pack_into("<Q", self._map, offset, value + 1)
+
+    def _digest(self, namespace: str, key: str) -> bytes:
+        return blake2b(
+            f"{namespace}\0{key}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def _set_offset(self, digest: bytes) -> int:
+        index = int.from_bytes(digest[:8], "little") % self._sets
+        return PAGE + index * WAYS * self.slot_size
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        digest = self._digest(namespace, key)
+        offset = self._set_offset(digest)
+        for _ in range(WAYS):
+            held, length, crc = SLOT.unpack_from(self._map, offset)
+            if held == digest and length <= self.capacity:
+                # A writer may take the slot over at any point: the CRC
+                # binds the payload to the key, and the key must still be
+                # there once the payload is copied
+                start = offset + SLOT.size
+                value = self._map[start : start + length]
+                if (
+                    _checksum(digest, value) == crc
+                    and self._map[offset : offset + 16] == digest
+                ):
+                    self._count(_HITS)
+                    return value
+            offset += self.slot_size
+        self._count(_MISSES)
+        return None
+
+    def put(self, namespace: str, key: str, value: bytes) -> bool:
+        """Stores value, replacing any older one. False if it does not fit a slot."""
+        if len(value) > self.capacity:
+            self._count(_OVERSIZE)
+            return False
+        digest = self._digest(namespace, key)
+        first = self._set_offset(digest)
+        self._lock()
+        try:
+            target = None
+            for way in range(WAYS):
+                offset = first + way * self.slot_size
+                held = self._map[offset : offset + 16]
+                if held == digest or held == _EMPTY:
+                    target = offset
+                    break
+            if target is None:
+                target = first + random.randrange(WAYS) * self.slot_size
+                self._count(_EVICTIONS)
+            held, old_length, _ = SLOT.unpack_from(self._map, target)
+            used, used_bytes = USAGE.unpack_from(self._map, HEADER.size)
+            if held == _EMPTY:
+                used += 1
+            else:
+                used_bytes -= old_length
+            USAGE.pack_into(self._map, HEADER.size, used, used_bytes + len(value))
+            # Invalidate, write the payload, then publish the key last
+            self._map[target : target + 16] = _EMPTY
+            start = target + SLOT.size
+            self._map[start : start + len(value)] = value
+            SLOT.pack_into(
+                self._map, target, digest, len(value), _checksum(digest, value)
+            )
+        finally:
+            self._unlock()
+        self._count(_STORES)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts summed over every worker (exited ones included), the number
+        of live workers, and slot occupancy."""
+        totals = [0] * 5
+        workers = 0
+        for row in range(MAX_WORKERS):
+            pid, *counts = WORKER.unpack_from(self._map, _row_offset(row))
+            if pid:
+                workers += _alive(pid)
+                totals = [t + c for t, c in zip(totals, counts)]
+        hits, misses, stores, evictions, oversize = totals
+        used, used_bytes = USAGE.unpack_from(self._map, HEADER.size)
+        lookups = hits + misses
+        return {
+            "workers": workers,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stores": stores,
+            "evictions": evictions,
+            "oversize": oversize,
+            "slots": self.slots,
+            "used_slots": used,
+            "used_bytes": used_bytes,
+            "mapped_bytes": self.size,
+        }
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+def _checksum(digest: bytes, value: bytes) -> int:
+    return zlib.crc32(value, zlib.crc32(digest))
+
+
+def _row_offset(row: int) -> int:
+    return WORKERS_OFFSET + row * WORKER.size
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True